@@ -0,0 +1 @@
+"""Benchmarks for the trees, run the modules with `python -m benchmark.<module>`."""
@@ -0,0 +1,111 @@
+"""Throughput of the tree hot paths against `bisect` and `dict` baselines.
+
+    python -m benchmark --sizes 1000 100000 --streams random sorted
+
+Every structure is filled with the stream (insert), queried with a random sample
+of its keys and finally emptied again (remove). Peak memory is measured with
+tracemalloc on a separate build, so that tracing does not skew the timings.
+"""
+import argparse
+import gc
+import random
+import time
+import tracemalloc
+from typing import Iterator, Optional
+
+from .streams import STREAMS
+from .subjects import SUBJECTS, Subject
+
+OPERATIONS = ('insert', 'search', 'successor', 'predecessor', 'inorder', 'preorder',
+              'postorder', 'rank', 'select', 'remove')
+TRAVERSALS = ('inorder', 'preorder', 'postorder')
+
+
+def peak_memory(subject_class: type[Subject], keys: list[int]) -> int:
+    """Peak bytes allocated while building the structure out of `keys`."""
+    tracemalloc.start()
+    try:
+        subject = subject_class()
+        subject.op_insert(keys)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def timed(subject: Subject, operation: str, args: list) -> float:
+    method = getattr(subject, f'op_{operation}')
+    gc.disable()
+    try:
+        started = time.perf_counter()
+        method(args)
+        return time.perf_counter() - started
+    finally:
+        gc.enable()
+
+
+def run(
+        subject_class: type[Subject],
+        keys: list[int],
+        operations: tuple[str, ...],
+        queries: int,
+        seed: int,
+) -> Iterator[tuple[str, float, Optional[int]]]:
+    """Yields (operation, ops/sec, height of the structure) for each operation."""
+    subject = subject_class()
+    supported = set(subject.operations())
+    sample = random.Random(seed).sample(keys, min(queries, len(keys)))
+
+    elapsed = timed(subject, 'insert', keys)
+    height = subject.height()
+    if 'insert' in operations:
+        yield 'insert', len(keys) / elapsed, height
+
+    for operation in operations:
+        if operation in ('insert', 'remove') or operation not in supported:
+            continue
+        args = keys if operation in TRAVERSALS else subject.prepare(operation, sample)
+        yield operation, len(args) / max(timed(subject, operation, args), 1e-9), height
+
+    if 'remove' in operations and 'remove' in supported:
+        order = random.Random(seed).sample(keys, len(keys))
+        args = subject.prepare('remove', order)
+        yield 'remove', len(args) / max(timed(subject, 'remove', args), 1e-9), height
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        prog='python -m benchmark', description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10 ** 3, 10 ** 4, 10 ** 5],
+                        help='stream lengths, up to 10**7')
+    parser.add_argument('--streams', nargs='+', choices=sorted(STREAMS), default=list(STREAMS))
+    parser.add_argument('--subjects', nargs='+', choices=sorted(SUBJECTS), default=list(SUBJECTS))
+    parser.add_argument('--operations', nargs='+', choices=OPERATIONS, default=list(OPERATIONS))
+    parser.add_argument('--queries', type=int, default=100_000,
+                        help='number of keys sampled for the point queries')
+    parser.add_argument('--no-memory', action='store_true', help='skip the tracemalloc pass')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    print(f'{"subject":>8} {"stream":>12} {"N":>9} {"operation":>12} '
+          f'{"ops/sec":>12} {"height":>7} {"peak KiB":>10}')
+    for size in args.sizes:
+        for stream in args.streams:
+            keys = STREAMS[stream](size, args.seed)
+            for name in args.subjects:
+                subject_class = SUBJECTS[name]
+                limit = subject_class.degenerate_limit
+                if stream != 'random' and limit is not None and size > limit:
+                    print(f'{name:>8} {stream:>12} {size:>9} {"skipped, degenerate":>31}')
+                    continue
+
+                memory = '' if args.no_memory else f'{peak_memory(subject_class, keys) / 1024:.0f}'
+                for operation, ops, height in run(
+                        subject_class, keys, tuple(args.operations), args.queries, args.seed):
+                    height = '' if height is None else height
+                    print(f'{name:>8} {stream:>12} {size:>9} {operation:>12} '
+                          f'{ops:>12.0f} {height:>7} {memory:>10}')
+                    memory = ''
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,99 @@
+"""Rotations per update, height and throughput of the balanced trees.
+
+    python -m benchmark.balancing --sizes 100000 --operations 200000
+
+Each tree is filled one insert at a time from a random or a sorted stream, then
+runs a write-heavy mix (half inserts, half removes) and a read-heavy one (90%
+searches). Throughput is measured on a plain tree, the rotations on a second,
+instrumented run with the same seed.
+"""
+import argparse
+import random
+import time
+from typing import Optional
+
+from tree import AVLTree, BSTNode, RedBlackTree, Treap
+
+TREES = {'avl': AVLTree, 'rb': RedBlackTree, 'treap': Treap}
+WORKLOADS = {'fill': None, 'write': 0.0, 'read': 0.9}
+
+
+def height(node: Optional[BSTNode]) -> int:
+    level, depth = ([] if node is None else [node]), -1
+    while level:
+        level = [child for node in level for child in (node.left, node.right) if child is not None]
+        depth += 1
+    return depth
+
+
+def fill(tree_class: type, keys: list[int], instrument: bool) -> tuple:
+    tree = tree_class()
+    stats = tree.instrument() if instrument else None
+    node_class = tree_class.node_class
+    started = time.perf_counter()
+    for key in keys:
+        tree.insert(node=node_class(value=key))
+    return tree, stats, len(keys), len(keys), time.perf_counter() - started
+
+
+def mix(tree, read_share: float, operations: int, key_range: int, seed: int, instrument: bool) -> tuple:
+    rng = random.Random(seed)
+    ops = [(rng.random() < read_share, rng.randrange(key_range)) for _ in range(operations)]
+    node_class = tree.node_class
+    stats = tree.instrument() if instrument else None
+    updates = 0
+    started = time.perf_counter()
+    for read, key in ops:
+        node = tree.get(key)
+        if read:
+            continue
+        updates += 1
+        if node is None:
+            tree.insert(node=node_class(value=key))
+        else:
+            tree.remove(node=node)
+    return tree, stats, operations, updates, time.perf_counter() - started
+
+
+def run(tree_class: type, keys: list[int], workload: str, operations: int, seed: int,
+        instrument: bool) -> tuple:
+    tree, stats, done, updates, elapsed = fill(tree_class, keys, instrument and workload == 'fill')
+    if workload != 'fill':
+        tree, stats, done, updates, elapsed = mix(
+            tree, WORKLOADS[workload], operations, 2 * len(keys), seed, instrument)
+    return tree, stats, done, updates, elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10 ** 5])
+    parser.add_argument('--operations', type=int, default=2 * 10 ** 5)
+    parser.add_argument('--trees', nargs='+', choices=list(TREES), default=list(TREES))
+    parser.add_argument('--streams', nargs='+', choices=['random', 'sorted'], default=['random', 'sorted'])
+    parser.add_argument('--workloads', nargs='+', choices=list(WORKLOADS), default=list(WORKLOADS))
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    print(f'{"N":>8} {"stream":>7} {"workload":>8} {"tree":>6} {"ops/s":>10} '
+          f'{"rotations/update":>16} {"height":>6}')
+    for size in args.sizes:
+        for stream in args.streams:
+            keys = random.Random(args.seed).sample(range(2 * size), size)
+            if stream == 'sorted':
+                keys.sort()
+            for workload in args.workloads:
+                for name in args.trees:
+                    tree_class = TREES[name]
+                    random.seed(args.seed)
+                    tree, _, done, _, elapsed = run(
+                        tree_class, keys, workload, args.operations, args.seed, instrument=False)
+                    random.seed(args.seed)
+                    _, stats, _, updates, _ = run(
+                        tree_class, keys, workload, args.operations, args.seed, instrument=True)
+                    rotations = stats.rotations['rotate_left'] + stats.rotations['rotate_right']
+                    print(f'{size:>8} {stream:>7} {workload:>8} {name:>6} {done / elapsed:>10,.0f} '
+                          f'{rotations / max(updates, 1):>16.3f} {height(tree.root):>6}')
+
+
+if __name__ == '__main__':
+    main()
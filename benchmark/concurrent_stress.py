@@ -0,0 +1,86 @@
+"""Throughput of ConcurrentAVLTree with one writer and a growing pool of readers.
+
+    python -m benchmark.concurrent_stress --readers 0 1 2 4 8 --seconds 2
+
+Readers run point queries (search, ceiling, rank) and, with --scans, full
+snapshot scans. The writer alternates inserting and removing random keys. Each
+row reports the operations per second summed over the threads of that role,
+then the tree is checked against its invariants.
+"""
+import argparse
+import random
+import threading
+import time
+
+from tree import AVLNode, AVLTree, ConcurrentAVLTree
+
+
+def reader(tree: ConcurrentAVLTree, key_range: int, scans: bool, stop: threading.Event,
+           counts: list[int], slot: int, seed: int) -> None:
+    rng = random.Random(seed)
+    done = rounds = 0
+    while not stop.is_set():
+        key = rng.randrange(key_range)
+        tree.search(node=AVLNode(value=key))
+        tree.ceiling(key)
+        tree.rank(node=AVLNode(value=key))
+        done += 3
+        rounds += 1
+        if scans and rounds % 1000 == 0:
+            for _ in tree.iter_inorder():
+                pass
+            done += 1
+    counts[slot] = done
+
+
+def writer(tree: ConcurrentAVLTree, key_range: int, stop: threading.Event,
+           counts: list[int], slot: int, seed: int) -> None:
+    rng = random.Random(seed)
+    done = 0
+    while not stop.is_set():
+        key = rng.randrange(key_range)
+        if key in tree:
+            tree.remove(node=AVLNode(value=key))
+        else:
+            tree.insert(node=AVLNode(value=key))
+        done += 1
+    counts[slot] = done
+
+
+def run(size: int, readers: int, seconds: float, scans: bool, seed: int) -> tuple[float, float, int]:
+    key_range = size * 2
+    keys = random.Random(seed).sample(range(key_range), size)
+    tree = ConcurrentAVLTree(AVLTree.create(keys))
+    stop = threading.Event()
+    counts = [0] * (readers + 1)
+    threads = [threading.Thread(target=writer, args=(tree, key_range, stop, counts, 0, seed))]
+    threads += [threading.Thread(target=reader, args=(tree, key_range, scans, stop, counts, i + 1, seed + i + 1))
+                for i in range(readers)]
+    for thread in threads:
+        thread.start()
+    time.sleep(seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+
+    tree.check_invariants()
+    return sum(counts[1:]) / seconds, counts[0] / seconds, len(tree)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--size', type=int, default=10 ** 5)
+    parser.add_argument('--readers', type=int, nargs='+', default=[0, 1, 2, 4, 8])
+    parser.add_argument('--seconds', type=float, default=2.0)
+    parser.add_argument('--scans', action='store_true')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    print(f'{"readers":>7} {"reads/s":>10} {"writes/s":>10} {"N":>9}')
+    for readers in args.readers:
+        reads, writes, size = run(args.size, readers, args.seconds, args.scans, args.seed)
+        print(f'{readers:>7} {reads:>10.0f} {writes:>10.0f} {size:>9}')
+
+
+if __name__ == '__main__':
+    main()
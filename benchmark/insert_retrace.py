@@ -0,0 +1,85 @@
+"""Node refreshes per insert of the AVL Tree, before and after the early-stopping
+retrace.
+
+    python -m benchmark.insert_retrace --sizes 100000 1000000
+"""
+import argparse
+import random
+import time
+
+from tree import AVLNode, AVLTree
+
+
+class CountingAVLTree(AVLTree):
+    """Sums up the nodes refreshed while retracing after each insert."""
+
+    def __init__(self, root=None):
+        super().__init__(root=root)
+        self.refreshed = 0
+
+    def _retrace_insert(self, node: AVLNode) -> int:
+        refreshed = super()._retrace_insert(node)
+        self.refreshed += refreshed
+        return refreshed
+
+
+class LegacyAVLTree(CountingAVLTree):
+    """The former insertion path: linking a child refreshed every ancestor, then the
+    rebalance loop climbed from the new leaf to the root a second time.
+
+    Both climbs are replicated here rather than borrowed from `AVLTree`, whose
+    `_retrace` has since become the early-stopping removal retrace.
+    """
+
+    def _retrace_insert(self, node: AVLNode) -> int:
+        refreshed = 0
+        current = node
+        while current is not None:
+            current.update()
+            refreshed += 2
+            current = current.parent
+        current = node
+        while current is not None:
+            # A rotation below may have shrunk the subtree, refresh before checking.
+            current.update()
+            if current.balance_factor == 2 and current.left.balance_factor >= 0:
+                self.rotate_right(node=current)
+            elif current.balance_factor == 2 and current.left.balance_factor == -1:
+                self.rotate_left(node=current.left)
+                self.rotate_right(node=current)
+            elif current.balance_factor == -2 and current.right.balance_factor <= 0:
+                self.rotate_left(node=current)
+            elif current.balance_factor == -2 and current.right.balance_factor == 1:
+                self.rotate_right(node=current.right)
+                self.rotate_left(node=current)
+            current = current.parent
+        self.refreshed += refreshed
+        return refreshed
+
+
+def run(tree_class: type, keys: list[int]) -> tuple[float, float, int]:
+    tree = tree_class()
+    started = time.perf_counter()
+    for key in keys:
+        tree.insert(node=AVLNode(value=key))
+    elapsed = time.perf_counter() - started
+    tree.check_invariants()
+    return len(keys) / elapsed, tree.refreshed / len(keys), tree.height
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10 ** 5, 10 ** 6])
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    print(f'{"N":>9} {"tree":>8} {"inserts/s":>10} {"refreshed/insert":>17} {"height":>6}')
+    for size in args.sizes:
+        keys = random.Random(args.seed).sample(range(size * 10), size)
+        for name, tree_class in (('legacy', LegacyAVLTree), ('current', CountingAVLTree)):
+            ops, refreshed, height = run(tree_class, keys)
+            print(f'{size:>9} {name:>8} {ops:>10.0f} {refreshed:>17.2f} {height:>6}')
+
+
+if __name__ == '__main__':
+    main()
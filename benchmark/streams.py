@@ -0,0 +1,39 @@
+"""Key streams the benchmarks are run on."""
+import random
+from typing import Callable
+
+
+def random_keys(size: int, seed: int = 0) -> list[int]:
+    """Distinct keys in a random order."""
+    return random.Random(seed).sample(range(size * 4), size)
+
+
+def sorted_keys(size: int, seed: int = 0) -> list[int]:
+    """Ascending keys, the worst case of the plain BST and a rotation at almost every
+    AVL insert.
+    """
+    return list(range(size))
+
+
+def adversarial_keys(size: int, seed: int = 0) -> list[int]:
+    """Keys alternating between both ends of the range, 0, N-1, 1, N-2, ...
+
+    The plain BST degenerates into a zig-zag path and the AVL Tree has to fix a
+    left-right or right-left imbalance over and over again.
+    """
+    keys = []
+    lo, hi = 0, size - 1
+    while lo <= hi:
+        keys.append(lo)
+        if lo != hi:
+            keys.append(hi)
+        lo += 1
+        hi -= 1
+    return keys
+
+
+STREAMS: dict[str, Callable[[int, int], list[int]]] = {
+    'random': random_keys,
+    'sorted': sorted_keys,
+    'adversarial': adversarial_keys,
+}
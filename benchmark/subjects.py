@@ -0,0 +1,262 @@
+"""The structures under benchmark, each wrapped in a common set of operations.
+
+Every `op_*` method runs one operation for each of the given arguments, so that
+the runner can turn the elapsed time into ops/sec. `prepare` turns the keys into
+those arguments outside of the timed section. An operation a structure does not
+support is simply not defined on its subject.
+"""
+from bisect import bisect_left, bisect_right, insort
+from typing import Any, Optional
+
+from tree import ArrayAVLTree, AVLTree, BinarySearchTree, SortedBlockTree
+
+
+class Subject:
+    name = ''
+    # Streams that degenerate the structure into O(N) per operation are skipped
+    # above this size, None for no limit.
+    degenerate_limit: Optional[int] = None
+
+    def operations(self) -> list[str]:
+        return [name[3:] for name in dir(self) if name.startswith('op_')]
+
+    def prepare(self, operation: str, keys: list[Any]) -> list[Any]:
+        return keys
+
+    def height(self) -> Optional[int]:
+        return None
+
+
+class TreeSubject(Subject):
+    tree_class = BinarySearchTree
+
+    def __init__(self) -> None:
+        self.tree = self.tree_class()
+
+    def height(self) -> Optional[int]:
+        # Iterative, a degenerate BST is deeper than the recursion limit.
+        height = -1
+        stack = [(self.tree.root, 0)] if self.tree.root else []
+        while stack:
+            node, depth = stack.pop()
+            height = max(height, depth)
+            if node.left:
+                stack.append((node.left, depth + 1))
+            if node.right:
+                stack.append((node.right, depth + 1))
+        return height
+
+    def prepare(self, operation: str, keys: list[Any]) -> list[Any]:
+        if operation in ('successor', 'predecessor', 'rank', 'remove'):
+            get = self.tree.get
+            return [get(key) for key in keys]
+        return keys
+
+    def op_insert(self, keys: list[Any]) -> None:
+        node_class = self.tree.node_class
+        insert = self.tree.insert
+        for key in keys:
+            insert(node=node_class(value=key))
+
+    def op_search(self, keys: list[Any]) -> None:
+        get = self.tree.get
+        for key in keys:
+            get(key)
+
+    def op_successor(self, nodes: list[Any]) -> None:
+        successor = self.tree.successor
+        for node in nodes:
+            successor(node=node)
+
+    def op_predecessor(self, nodes: list[Any]) -> None:
+        predecessor = self.tree.predecessor
+        for node in nodes:
+            predecessor(node=node)
+
+    def op_inorder(self, keys: list[Any]) -> None:
+        for _ in self.tree.iter_inorder():
+            pass
+
+    def op_preorder(self, keys: list[Any]) -> None:
+        for _ in self.tree.iter_preorder():
+            pass
+
+    def op_postorder(self, keys: list[Any]) -> None:
+        for _ in self.tree.iter_postorder():
+            pass
+
+    def op_rank(self, nodes: list[Any]) -> None:
+        rank = self.tree.rank
+        for node in nodes:
+            rank(node=node)
+
+    def op_select(self, keys: list[Any]) -> None:
+        select = self.tree.select
+        for rank in range(1, len(keys) + 1):
+            select(rank=rank)
+
+    def op_remove(self, nodes: list[Any]) -> None:
+        remove = self.tree.remove
+        for node in nodes:
+            remove(node=node)
+
+
+class BSTSubject(TreeSubject):
+    name = 'bst'
+    tree_class = BinarySearchTree
+    degenerate_limit = 5_000
+
+
+class AVLSubject(TreeSubject):
+    name = 'avl'
+    tree_class = AVLTree
+
+    def height(self) -> Optional[int]:
+        return self.tree.height
+
+
+class KeyTreeSubject(Subject):
+    """A tree queried by key instead of by node."""
+
+    def __init__(self) -> None:
+        self.tree = self.tree_class()
+
+    def height(self) -> Optional[int]:
+        return self.tree.height
+
+    def op_insert(self, keys: list[Any]) -> None:
+        insert = self.tree.insert
+        for key in keys:
+            insert(key)
+
+    def op_search(self, keys: list[Any]) -> None:
+        search = self.tree.search
+        for key in keys:
+            search(key)
+
+    def op_successor(self, keys: list[Any]) -> None:
+        successor = self.tree.successor
+        for key in keys:
+            successor(key)
+
+    def op_predecessor(self, keys: list[Any]) -> None:
+        predecessor = self.tree.predecessor
+        for key in keys:
+            predecessor(key)
+
+    def op_inorder(self, keys: list[Any]) -> None:
+        for _ in self.tree.iter_inorder():
+            pass
+
+    def op_rank(self, keys: list[Any]) -> None:
+        rank = self.tree.rank
+        for key in keys:
+            rank(key)
+
+    def op_select(self, keys: list[Any]) -> None:
+        select = self.tree.select
+        for rank in range(1, len(keys) + 1):
+            select(rank)
+
+    def op_remove(self, keys: list[Any]) -> None:
+        remove = self.tree.remove
+        for key in keys:
+            remove(key)
+
+
+class ArrayAVLSubject(KeyTreeSubject):
+    """The struct-of-arrays AVL Tree."""
+    name = 'array_avl'
+    tree_class = ArrayAVLTree
+
+    def op_preorder(self, keys: list[Any]) -> None:
+        for _ in self.tree.iter_preorder():
+            pass
+
+    def op_postorder(self, keys: list[Any]) -> None:
+        for _ in self.tree.iter_postorder():
+            pass
+
+
+class SortedBlockSubject(KeyTreeSubject):
+    """The two-level B+-tree of sorted blocks, no preorder or postorder to time."""
+    name = 'blocks'
+    tree_class = SortedBlockTree
+
+
+class BisectSubject(Subject):
+    """A sorted Python list maintained with `bisect`."""
+    name = 'bisect'
+
+    def __init__(self) -> None:
+        self.keys = []
+
+    def op_insert(self, keys: list[Any]) -> None:
+        for key in keys:
+            insort(self.keys, key)
+
+    def op_search(self, keys: list[Any]) -> None:
+        items = self.keys
+        for key in keys:
+            i = bisect_left(items, key)
+            i < len(items) and items[i] == key
+
+    def op_successor(self, keys: list[Any]) -> None:
+        items = self.keys
+        for key in keys:
+            i = bisect_right(items, key)
+            i < len(items) and items[i]
+
+    def op_predecessor(self, keys: list[Any]) -> None:
+        items = self.keys
+        for key in keys:
+            i = bisect_left(items, key)
+            i and items[i - 1]
+
+    def op_inorder(self, keys: list[Any]) -> None:
+        for _ in self.keys:
+            pass
+
+    def op_rank(self, keys: list[Any]) -> None:
+        items = self.keys
+        for key in keys:
+            bisect_left(items, key) + 1
+
+    def op_select(self, keys: list[Any]) -> None:
+        items = self.keys
+        for rank in range(1, len(keys) + 1):
+            items[rank - 1]
+
+    def op_remove(self, keys: list[Any]) -> None:
+        items = self.keys
+        for key in keys:
+            del items[bisect_left(items, key)]
+
+
+class DictSubject(Subject):
+    """Unordered baseline, hashing only answers point queries."""
+    name = 'dict'
+
+    def __init__(self) -> None:
+        self.keys = {}
+
+    def op_insert(self, keys: list[Any]) -> None:
+        items = self.keys
+        for key in keys:
+            items[key] = None
+
+    def op_search(self, keys: list[Any]) -> None:
+        items = self.keys
+        for key in keys:
+            key in items
+
+    def op_remove(self, keys: list[Any]) -> None:
+        items = self.keys
+        for key in keys:
+            del items[key]
+
+
+SUBJECTS: dict[str, type[Subject]] = {
+    subject.name: subject for subject in (
+        AVLSubject, BSTSubject, ArrayAVLSubject, SortedBlockSubject, BisectSubject, DictSubject)
+}
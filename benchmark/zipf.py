@@ -0,0 +1,69 @@
+"""Nodes visited per lookup under Zipf-distributed access, splay against balanced.
+
+    python -m benchmark.zipf --sizes 100000 --lookups 200000 --exponents 0 0.8 1.0 1.2
+
+The keys are ranked in a random order and the k-th ranked key is looked up with
+probability proportional to 1 / k^s, s = 0 being uniform. Nodes visited per lookup
+come from an instrumented run, throughput from a plain run over the same lookups.
+"""
+import argparse
+import random
+import time
+from itertools import accumulate
+
+from tree import AVLTree, RedBlackTree, SplayTree
+
+TREES = {'avl': AVLTree, 'rb': RedBlackTree, 'splay': SplayTree}
+
+
+def zipf_lookups(keys: list[int], exponent: float, count: int, seed: int) -> list[int]:
+    rng = random.Random(seed)
+    ranked = rng.sample(keys, len(keys))
+    weights = accumulate(1 / rank ** exponent for rank in range(1, len(ranked) + 1))
+    return rng.choices(ranked, cum_weights=list(weights), k=count)
+
+
+def build(tree_class: type, keys: list[int]):
+    tree = tree_class()
+    node_class = tree_class.node_class
+    for key in keys:
+        tree.insert(node=node_class(value=key))
+    return tree
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10 ** 5])
+    parser.add_argument('--lookups', type=int, default=2 * 10 ** 5)
+    parser.add_argument('--exponents', type=float, nargs='+', default=[0.0, 0.8, 1.0, 1.2])
+    parser.add_argument('--trees', nargs='+', choices=list(TREES), default=list(TREES))
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    print(f'{"N":>8} {"s":>4} {"tree":>6} {"visited/lookup":>14} {"rotations/lookup":>16} '
+          f'{"lookups/s":>10}')
+    for size in args.sizes:
+        keys = random.Random(args.seed).sample(range(2 * size), size)
+        for exponent in args.exponents:
+            lookups = zipf_lookups(keys, exponent, args.lookups, args.seed)
+            for name in args.trees:
+                tree = build(TREES[name], keys)
+                get = tree.get
+                started = time.perf_counter()
+                for key in lookups:
+                    get(key)
+                elapsed = time.perf_counter() - started
+
+                tree = build(TREES[name], keys)
+                stats = tree.instrument()
+                for key in lookups:
+                    tree.get(key)
+                get_stats = stats.operations['get']
+                print(f'{size:>8} {exponent:>4} {name:>6} '
+                      f'{get_stats.nodes_visited / get_stats.calls:>14.2f} '
+                      f'{get_stats.rotations / get_stats.calls:>16.2f} '
+                      f'{len(lookups) / elapsed:>10,.0f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,164 @@
+import unittest
+
+from tree import ArrayAVLTree
+
+
+class TestArrayAVLTree(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tree = self._get_tree()
+
+    def test_find_min(self) -> None:
+        self.assertEqual(self.tree.find_min(), 11)
+
+    def test_find_max(self) -> None:
+        self.assertEqual(self.tree.find_max(), 99)
+
+    def test_search(self) -> None:
+        self.assertEqual(self.tree.search(41), 41)
+        self.assertEqual(self.tree.search(13), None)
+        self.assertIn(99, self.tree)
+        self.assertNotIn(13, self.tree)
+
+    def test_get(self) -> None:
+        self.assertEqual(self.tree.get(41), 41)
+        self.assertEqual(self.tree.get(13), None)
+        self.assertEqual(self.tree.get(13, default=-1), -1)
+
+    def test_neighbours(self) -> None:
+        self.assertEqual(self.tree.successor(41), 50)
+        self.assertEqual(self.tree.predecessor(41), 32)
+        self.assertEqual(self.tree.floor(13), 11)
+        self.assertEqual(self.tree.ceiling(13), 20)
+        self.assertEqual(self.tree.lower(11), None)
+        self.assertEqual(self.tree.higher(99), None)
+
+    def test_traversals(self) -> None:
+        self.assertListEqual(self.tree.inorder_traversal(), [11, 20, 29, 32, 41, 50, 65, 72, 91, 99])
+        self.assertListEqual(list(reversed(self.tree)), [99, 91, 72, 65, 50, 41, 32, 29, 20, 11])
+        self.assertListEqual(self.tree.preorder_traversal(), [41, 20, 11, 29, 32, 65, 50, 91, 72, 99])
+        self.assertListEqual(self.tree.postorder_traversal(), [11, 32, 29, 20, 50, 72, 99, 91, 65, 41])
+
+    def test_rank_and_select(self) -> None:
+        self.assertEqual(self.tree.rank(41), 5)
+        self.assertEqual(self.tree.rank(13), None)
+        self.assertEqual(self.tree.select(10), 99)
+        self.assertEqual(self.tree.select(11), None)
+        self.assertEqual(self.tree.count_range(20, 65), 6)
+        self.assertEqual(self.tree.median(), 41)
+
+    def test_count_range_bounds(self) -> None:
+        self.assertEqual(self.tree.count_range(20, 65, inclusive=(False, False)), 4)
+        self.assertEqual(self.tree.count_range(20, 65, inclusive=(False, True)), 5)
+        self.assertEqual(self.tree.count_range(20, 65, inclusive=(True, False)), 5)
+        self.assertEqual(self.tree.count_range(21, 64, inclusive=(False, False)), 4)
+        self.assertEqual(self.tree.count_range(41, 41, inclusive=(False, True)), 0)
+        self.assertEqual(self.tree.count_range(41, 41), 1)
+        self.assertEqual(self.tree.count_range(65, 20), 0)
+
+    def test_range(self) -> None:
+        self.assertListEqual(list(self.tree.range(20, 65)), [20, 29, 32, 41, 50, 65])
+        self.assertListEqual(list(self.tree.range(20, 65, inclusive=(False, False))), [29, 32, 41, 50])
+        self.assertListEqual(list(self.tree.range(21, 64, inclusive=(False, True))), [29, 32, 41, 50])
+        self.assertListEqual(list(self.tree.range(0, 11, inclusive=(True, False))), [])
+        self.assertListEqual(list(self.tree.range(65, 20)), [])
+        self.assertListEqual(list(ArrayAVLTree().range(0, 10)), [])
+
+    def test_delete_range(self) -> None:
+        self.assertEqual(self.tree.delete_range(29, 32), 2)
+        self.assertListEqual(self.tree.inorder_traversal(), [11, 20, 41, 50, 65, 72, 91, 99])
+        self.tree.check_invariants()
+
+        self.assertEqual(self.tree.delete_range(20, 91, inclusive=(False, False)), 4)
+        self.assertListEqual(self.tree.inorder_traversal(), [11, 20, 91, 99])
+        self.tree.check_invariants()
+
+        self.assertEqual(self.tree.delete_range(100, 200), 0)
+        self.tree.insert(50)
+        self.assertListEqual(self.tree.inorder_traversal(), [11, 20, 50, 91, 99])
+
+    def test_delete_range_large(self) -> None:
+        tree = ArrayAVLTree.create(range(1000))
+        self.assertEqual(tree.delete_range(100, 900), 801)
+        self.assertListEqual(tree.inorder_traversal(), list(range(100)) + list(range(901, 1000)))
+        self.assertEqual(tree.height, 7)
+        tree.check_invariants()
+
+    def test_insert(self) -> None:
+        for key in (1, 2, 3, 101):
+            self.tree.insert(key)
+
+        self.assertListEqual(self.tree.inorder_traversal(), [1, 2, 3, 11, 20, 29, 32, 41, 50, 65, 72, 91, 99, 101])
+        self.assertEqual(self.tree.is_balanced, True)
+        self.tree.check_invariants()
+
+        with self.assertRaises(ValueError):
+            self.tree.insert(41)
+
+    def test_remove(self) -> None:
+        self.tree.remove(11)
+        self.tree.remove(41)
+        self.assertListEqual(self.tree.inorder_traversal(), [20, 29, 32, 50, 65, 72, 91, 99])
+        self.tree.check_invariants()
+
+        with self.assertRaises(ValueError):
+            self.tree.remove(41)
+
+    def test_free_slots_are_reused(self) -> None:
+        self.tree.remove(11)
+        self.tree.remove(99)
+        self.tree.insert(12)
+        self.tree.insert(98)
+
+        self.assertEqual(len(self.tree._keys), 10)
+        self.tree.check_invariants()
+
+    def test_check_invariants_leaves_columns(self) -> None:
+        i = self.tree._root
+        self.tree._size[i] += 1
+        with self.assertRaises(AssertionError):
+            self.tree.check_invariants()
+        self.assertEqual(self.tree._size[i], 11)
+
+    def test_pop_min(self) -> None:
+        self.assertListEqual([self.tree.pop_min() for _ in range(11)],
+                             [11, 20, 29, 32, 41, 50, 65, 72, 91, 99, None])
+        self.assertEqual(self.tree.height, -1)
+
+    def test_batches(self) -> None:
+        self.assertListEqual(self.tree.insert_many([12, 11, 12]), [True, False, False])
+        self.assertListEqual(self.tree.remove_many([12, 13]), [True, False])
+        self.tree.check_invariants()
+
+    def test_from_sorted(self) -> None:
+        tree = ArrayAVLTree.from_sorted(range(1000))
+
+        self.assertEqual(len(tree), 1000)
+        self.assertEqual(tree.height, 9)
+        self.assertEqual(tree.select(500), 499)
+        tree.check_invariants()
+
+        with self.assertRaises(ValueError):
+            ArrayAVLTree.from_sorted([2, 1])
+
+    def test_float_keys(self) -> None:
+        tree = ArrayAVLTree.create([0.5, 2.5, 1.5], typecode='d')
+        self.assertListEqual(tree.inorder_traversal(), [0.5, 1.5, 2.5])
+
+    @staticmethod
+    def _get_tree() -> ArrayAVLTree:
+        r"""    41
+              / \
+            20   65
+           / \   / \
+         11  29 50  91
+              \     / \
+              32  72  99
+        """
+        tree = ArrayAVLTree()
+        for key in (41, 20, 65, 11, 29, 50, 91, 32, 72, 99):
+            tree.insert(key)
+        return tree
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+import asyncio
+import unittest
+
+from tree import AsyncAVLTree, AVLTree
+
+
+class TestAsyncAVLTree(unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self.tree = AsyncAVLTree(AVLTree.create([41, 20, 65, 11, 29, 50, 91, 32, 72, 99]), slice_size=4)
+
+    async def test_queries(self) -> None:
+        self.assertEqual((await self.tree.search(29)).value, 29)
+        self.assertEqual(await self.tree.search(30), None)
+        self.assertTrue(await self.tree.contains(41))
+        self.assertEqual((await self.tree.floor(30)).value, 29)
+        self.assertEqual((await self.tree.ceiling(30)).value, 32)
+        self.assertEqual(await self.tree.rank(65), 7)
+        self.assertEqual(await self.tree.count_range(20, 65), 6)
+
+    async def test_insert_and_remove(self) -> None:
+        self.assertTrue(await self.tree.insert(30))
+        self.assertFalse(await self.tree.insert(30))
+        self.assertTrue(await self.tree.remove(41))
+        self.assertFalse(await self.tree.remove(41))
+
+        self.assertEqual(len(self.tree), 10)
+        self.assertTrue(await self.tree.contains(30))
+        self.tree.tree.check_invariants()
+
+    async def test_writes_are_coalesced(self) -> None:
+        batches = []
+        insert_many = self.tree.tree.insert_many
+        self.tree.tree.insert_many = lambda values: batches.append(list(values)) or insert_many(values)
+
+        results = await asyncio.gather(*(self.tree.insert(value) for value in (1, 2, 3, 4, 5, 6, 41)))
+
+        self.assertListEqual(results, [True] * 6 + [False])
+        self.assertListEqual(batches, [[1, 2, 3, 4], [5, 6, 41]])
+
+    async def test_writes_keep_their_order(self) -> None:
+        results = await asyncio.gather(
+            self.tree.insert(1), self.tree.remove(1), self.tree.insert(1), self.tree.remove(2))
+
+        self.assertListEqual(results, [True, True, True, False])
+        self.assertTrue(await self.tree.contains(1))
+
+    async def test_range(self) -> None:
+        self.assertListEqual([value async for value in self.tree.range(20, 91)],
+                             [20, 29, 32, 41, 50, 65, 72, 91])
+        self.assertListEqual([value async for value in self.tree.range(20, 91, inclusive=(False, False))],
+                             [29, 32, 41, 50, 65, 72])
+        self.assertListEqual([value async for value in self.tree],
+                             [11, 20, 29, 32, 41, 50, 65, 72, 91, 99])
+        self.assertListEqual([value async for value in AsyncAVLTree()], [])
+
+    async def test_range_sees_concurrent_writes(self) -> None:
+        seen = []
+        async for value in self.tree:
+            seen.append(value)
+            if value == 20:
+                await asyncio.gather(self.tree.insert(100), self.tree.remove(72), self.tree.insert(25))
+
+        self.assertListEqual(seen, [11, 20, 29, 32, 41, 50, 65, 91, 99, 100])
+
+    async def test_flush(self) -> None:
+        for value in range(100):
+            asyncio.ensure_future(self.tree.insert(value))
+        await asyncio.sleep(0)
+        await self.tree.flush()
+
+        self.assertEqual(len(self.tree), 100)
+        self.tree.tree.check_invariants()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,100 @@
+import pickle
+import unittest
+
+from tree import AVLMap, AVLMapNode
+
+
+class TestAVLMap(unittest.TestCase):
+    def setUp(self) -> None:
+        self.avl_map = AVLMap({41: 'a', 20: 'b', 65: 'c', 11: 'd', 29: 'e', 50: 'f'})
+
+    def test_getitem(self) -> None:
+        self.assertEqual(self.avl_map[41], 'a')
+        self.assertEqual(self.avl_map[11], 'd')
+        self.assertEqual(self.avl_map.get(13), None)
+        with self.assertRaises(KeyError):
+            _ = self.avl_map[13]
+
+    def test_contains(self) -> None:
+        self.assertIn(29, self.avl_map)
+        self.assertNotIn(30, self.avl_map)
+
+    def test_setitem(self) -> None:
+        self.avl_map[32] = 'g'
+        self.avl_map[41] = 'h'
+
+        self.assertEqual(len(self.avl_map), 7)
+        self.assertEqual(self.avl_map[32], 'g')
+        self.assertEqual(self.avl_map[41], 'h')
+        self.avl_map.check_invariants()
+
+    def test_delitem(self) -> None:
+        del self.avl_map[41]
+        del self.avl_map[11]
+
+        self.assertListEqual(list(self.avl_map), [20, 29, 50, 65])
+        self.avl_map.check_invariants()
+        with self.assertRaises(KeyError):
+            del self.avl_map[41]
+
+    def test_iterators(self) -> None:
+        self.assertListEqual(list(self.avl_map.keys()), [11, 20, 29, 41, 50, 65])
+        self.assertListEqual(list(self.avl_map.values()), ['d', 'b', 'e', 'a', 'f', 'c'])
+        self.assertListEqual(list(self.avl_map.items())[:2], [(11, 'd'), (20, 'b')])
+        self.assertListEqual(list(reversed(self.avl_map)), [65, 50, 41, 29, 20, 11])
+        self.assertIn((29, 'e'), self.avl_map.items())
+        self.assertIn('f', self.avl_map.values())
+
+    def test_mapping_api(self) -> None:
+        self.assertEqual(self.avl_map.pop(20), 'b')
+        self.assertEqual(self.avl_map.popitem(), (11, 'd'))
+        self.assertEqual(self.avl_map.setdefault(99, 'z'), 'z')
+        self.assertEqual(self.avl_map, {29: 'e', 41: 'a', 50: 'f', 65: 'c', 99: 'z'})
+
+        self.avl_map.clear()
+        self.assertEqual(len(self.avl_map), 0)
+        with self.assertRaises(KeyError):
+            self.avl_map.popitem()
+
+    def test_key_function(self) -> None:
+        avl_map = AVLMap(key=str.lower)
+        avl_map['Banana'] = 2
+        avl_map['apple'] = 1
+        avl_map['Cherry'] = 3
+
+        self.assertListEqual(list(avl_map), ['apple', 'Banana', 'Cherry'])
+        self.assertEqual(avl_map['BANANA'], 2)
+        self.assertEqual(avl_map.tree.root.value, 'banana')
+
+        avl_map['APPLE'] = 4
+        self.assertListEqual(list(avl_map.items())[0:1], [('APPLE', 4)])
+        self.assertEqual(len(avl_map), 3)
+
+    def test_nodes(self) -> None:
+        node = self.avl_map.tree.find_min()
+
+        self.assertIsInstance(node, AVLMapNode)
+        self.assertEqual(node.key, 11)
+        self.assertEqual(node.payload, 'd')
+
+    def test_many_entries(self) -> None:
+        avl_map = AVLMap((i, -i) for i in range(1000, 0, -1))
+
+        self.assertEqual(len(avl_map), 1000)
+        self.assertEqual(avl_map[500], -500)
+        self.assertEqual(avl_map.tree.height, 9)
+        avl_map.check_invariants()
+
+    def test_pickle(self) -> None:
+        avl_map = pickle.loads(pickle.dumps(self.avl_map))
+
+        self.assertEqual(avl_map, self.avl_map)
+        self.assertListEqual(list(avl_map.items()), list(self.avl_map.items()))
+        avl_map.check_invariants()
+
+        avl_map = pickle.loads(pickle.dumps(AVLMap({'B': 1, 'a': 2}, key=str.lower)))
+        self.assertEqual(avl_map['b'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,8 +1,22 @@
+import pickle
 import unittest
 
 from tree import AVLNode, AVLTree
 
 
+class RetraceRecordingAVLTree(AVLTree):
+    """Records the node each insert retrace starts at and the nodes it refreshed."""
+
+    def __init__(self, root=None):
+        super().__init__(root=root)
+        self.retraces = []
+
+    def _retrace_insert(self, node: AVLNode) -> int:
+        refreshed = super()._retrace_insert(node)
+        self.retraces.append((node.value, refreshed))
+        return refreshed
+
+
 class TestBinarySearchTree(unittest.TestCase):
     def setUp(self) -> None:
         self.avl_tree = self._get_avl_tree()
@@ -35,6 +49,35 @@ class TestBinarySearchTree(unittest.TestCase):
         self.assertEqual(self.avl_tree.search(node=AVLNode(value=50)).value, 50)
         self.assertEqual(self.avl_tree.search(node=AVLNode(value=13)), None)
 
+    def test_key_lookups(self) -> None:
+        self.assertIn(72, self.avl_tree)
+        self.assertNotIn(13, self.avl_tree)
+        self.assertEqual(self.avl_tree.get(91).value, 91)
+        self.assertEqual(self.avl_tree.floor(13).value, 11)
+        self.assertEqual(self.avl_tree.ceiling(13).value, 20)
+        self.assertEqual(self.avl_tree.lower(41).value, 32)
+        self.assertEqual(self.avl_tree.higher(41).value, 50)
+
+    def test_search_many(self) -> None:
+        self.assertListEqual(list(self.avl_tree.search_many([11, 13, 99, 100])), [True, False, True, False])
+        self.assertListEqual(list(self.avl_tree.rank_many([11, 13, 99])), [1, 0, 10])
+        self.assertListEqual(list(self.avl_tree.count_range_many([20, 30, 50], [65, 90, 40])), [6, 5, 0])
+
+    def test_snapshot_is_rebuilt_after_updates(self) -> None:
+        snapshot = self.avl_tree.snapshot()
+        self.assertIs(self.avl_tree.snapshot(), snapshot)
+
+        self.avl_tree.insert(node=AVLNode(value=13))
+        self.assertListEqual(list(self.avl_tree.search_many([13])), [True])
+
+        with self.assertRaises(ValueError):
+            self.avl_tree.insert(node=AVLNode(value=13))
+        snapshot = self.avl_tree.snapshot()
+        self.assertIs(self.avl_tree.snapshot(), snapshot)
+
+        self.avl_tree.remove(node=AVLNode(value=13))
+        self.assertListEqual(list(self.avl_tree.rank_many([13, 99])), [0, 10])
+
     def test_inorder_traversal(self) -> None:
         self.assertListEqual(self.avl_tree.inorder_traversal(), [11, 20, 29, 32, 41, 50, 65, 72, 91, 99])
 
@@ -44,6 +87,56 @@ class TestBinarySearchTree(unittest.TestCase):
     def test_postorder_traversal(self) -> None:
         self.assertListEqual(self.avl_tree.postorder_traversal(), [11, 32, 29, 20, 50, 72, 99, 91, 65, 41])
 
+    def test_rank(self) -> None:
+        self.assertEqual(self.avl_tree.rank(node=AVLNode(value=11)), 1)
+        self.assertEqual(self.avl_tree.rank(node=AVLNode(value=41)), 5)
+        self.assertEqual(self.avl_tree.rank(node=AVLNode(value=99)), 10)
+        self.assertEqual(self.avl_tree.rank(node=AVLNode(value=13)), None)
+
+    def test_select(self) -> None:
+        self.assertEqual(self.avl_tree.select(rank=1).value, 11)
+        self.assertEqual(self.avl_tree.select(rank=5).value, 41)
+        self.assertEqual(self.avl_tree.select(rank=10).value, 99)
+        self.assertEqual(self.avl_tree.select(rank=11), None)
+
+    def test_count_range(self) -> None:
+        self.assertEqual(self.avl_tree.count_range(lo=20, hi=65), 6)
+        self.assertEqual(self.avl_tree.count_range(lo=30, hi=90), 5)
+        self.assertEqual(self.avl_tree.count_range(lo=20, hi=65, inclusive=(False, False)), 4)
+
+    def test_range(self) -> None:
+        self.assertListEqual(list(self.avl_tree.range(lo=20, hi=65)), [20, 29, 32, 41, 50, 65])
+        self.assertListEqual(list(self.avl_tree.range(lo=20, hi=65, inclusive=(False, True))),
+                             [29, 32, 41, 50, 65])
+
+    def test_delete_range(self) -> None:
+        self.assertEqual(self.avl_tree.delete_range(lo=20, hi=65), 6)
+        self.assertListEqual(self.avl_tree.inorder_traversal(), [11, 72, 91, 99])
+        self.assertEqual(len(self.avl_tree), 4)
+        self.avl_tree.check_invariants()
+
+        self.assertEqual(self.avl_tree.delete_range(lo=11, hi=99, inclusive=(False, False)), 2)
+        self.assertListEqual(self.avl_tree.inorder_traversal(), [11, 99])
+        self.avl_tree.check_invariants()
+
+    def test_delete_range_large(self) -> None:
+        avl_tree = AVLTree.create(range(1000))
+        self.assertEqual(avl_tree.delete_range(lo=100, hi=899), 800)
+        self.assertListEqual(avl_tree.inorder_traversal(), list(range(100)) + list(range(900, 1000)))
+        self.assertEqual(avl_tree.root.parent, None)
+        avl_tree.check_invariants()
+
+    def test_median(self) -> None:
+        self.assertEqual(self.avl_tree.median().value, 41)
+
+    def test_size_after_rotation(self) -> None:
+        self.small_avl_tree.rotate_right(node=self.small_avl_tree.root)
+
+        self.assertEqual(self.small_avl_tree.root.size, 5)
+        self.assertEqual(self.small_avl_tree.root.left.size, 1)
+        self.assertEqual(self.small_avl_tree.root.right.size, 3)
+        self.assertEqual(self.small_avl_tree.select(rank=3).value, 3)
+
     def test_left_rotation(self) -> None:
         self.small_avl_tree.rotate_right(node=self.small_avl_tree.root)
 
@@ -80,6 +173,202 @@ class TestBinarySearchTree(unittest.TestCase):
         self.assertListEqual(self.avl_tree.inorder_traversal(), [1, 2, 3, 11, 20, 29, 32, 41, 50, 65, 72, 91, 99, 101])
         self.assertEqual(self.avl_tree.is_balanced, True)
 
+        self.assertEqual(len(self.avl_tree), 14)
+        self.assertListEqual([self.avl_tree.select(rank=i).value for i in range(1, 15)],
+                             self.avl_tree.inorder_traversal())
+
+    def test_retrace_insert_stops_early(self) -> None:
+        avl_tree = RetraceRecordingAVLTree()
+        for value in range(1, 9):
+            avl_tree.insert(node=AVLNode(value=value))
+        # A rotation ends the retrace one level above the node it started at.
+        self.assertListEqual(avl_tree.retraces, [(1, 1), (2, 2), (3, 2), (4, 2), (5, 3), (6, 2), (7, 3)])
+        self.assertListEqual(avl_tree.preorder_traversal(), [4, 2, 1, 3, 6, 5, 7, 8])
+
+        # 1 and 2 grow, the root keeps its height: the retrace stops there.
+        avl_tree.retraces.clear()
+        avl_tree.insert(node=AVLNode(value=0))
+        self.assertListEqual(avl_tree.retraces, [(1, 3)])
+        self.assertEqual(avl_tree.height, 3)
+
+        # 1 keeps its height, only the sizes above it grow.
+        avl_tree.retraces.clear()
+        avl_tree.insert(node=AVLNode(value=1.5))
+        self.assertListEqual(avl_tree.retraces, [(1, 1)])
+        self.assertEqual(avl_tree.search(node=AVLNode(value=2)).height, 2)
+        self.assertEqual(len(avl_tree), 10)
+        avl_tree.check_invariants()
+
+    def test_from_sorted(self) -> None:
+        avl_tree = AVLTree.from_sorted(range(1000))
+
+        self.assertListEqual(avl_tree.inorder_traversal(), list(range(1000)))
+        self.assertEqual(len(avl_tree), 1000)
+        self.assertEqual(avl_tree.height, 9)
+        self.assertEqual(avl_tree.root.value, 500)
+        self.assertEqual(avl_tree.is_balanced, True)
+        self.assertEqual(avl_tree.find_min().height, 0)
+
+        with self.assertRaises(ValueError):
+            AVLTree.from_sorted([1, 3, 2])
+
+    def test_create(self) -> None:
+        avl_tree = AVLTree.create([5, 3, 9, 3, 1, 7])
+        self.assertListEqual(avl_tree.inorder_traversal(), [1, 3, 5, 7, 9])
+        self.assertEqual(avl_tree.height, 2)
+
+        avl_tree = AVLTree.create(range(100), random=True, balanced=False)
+        self.assertListEqual(avl_tree.inorder_traversal(), list(range(100)))
+        self.assertEqual(avl_tree.is_balanced, True)
+
+        avl_tree = AVLTree.create([1, 2], empty=True)
+        self.assertEqual(avl_tree.root, None)
+        self.assertEqual(avl_tree.height, -1)
+        self.assertEqual(len(avl_tree), 0)
+        self.assertListEqual(avl_tree.inorder_traversal(), [])
+
+    def test_insert_into_empty_tree(self) -> None:
+        avl_tree = AVLTree()
+        avl_tree.insert(node=AVLNode(value=1))
+        avl_tree.insert(node=AVLNode(value=2))
+        avl_tree.insert(node=AVLNode(value=3))
+
+        self.assertEqual(avl_tree.root.value, 2)
+        self.assertListEqual(avl_tree.inorder_traversal(), [1, 2, 3])
+
+    def test_remove(self) -> None:
+        self.avl_tree.remove(node=AVLNode(value=11))
+        self.assertListEqual(self.avl_tree.inorder_traversal(), [20, 29, 32, 41, 50, 65, 72, 91, 99])
+        self.assertEqual(self.avl_tree.root.left.value, 29)
+        self.assertEqual(self.avl_tree.is_balanced, True)
+
+        self.avl_tree.remove(node=AVLNode(value=41))
+        self.assertListEqual(self.avl_tree.inorder_traversal(), [20, 29, 32, 50, 65, 72, 91, 99])
+        self.assertEqual(self.avl_tree.root.value, 50)
+        self.assertEqual(self.avl_tree.is_balanced, True)
+
+        self.avl_tree.remove(node=AVLNode(value=50))
+        self.assertListEqual(self.avl_tree.inorder_traversal(), [20, 29, 32, 65, 72, 91, 99])
+        self.assertEqual(self.avl_tree.root.value, 65)
+        self.assertEqual(self.avl_tree.root.right.value, 91)
+        self.assertEqual(self.avl_tree.height, 2)
+
+        with self.assertRaises(ValueError):
+            self.avl_tree.remove(node=AVLNode(value=50))
+
+    def test_pop_min(self) -> None:
+        popped = [self.avl_tree.pop_min().value for _ in range(10)]
+
+        self.assertListEqual(popped, [11, 20, 29, 32, 41, 50, 65, 72, 91, 99])
+        self.assertEqual(self.avl_tree.pop_min(), None)
+        self.assertEqual(self.avl_tree.root, None)
+
+    def test_check_invariants(self) -> None:
+        self.avl_tree.check_invariants()
+
+        self.avl_tree.insert_many(range(100))
+        self.avl_tree.remove_many(range(0, 100, 3))
+        self.avl_tree.check_invariants()
+
+        self.avl_tree.root.left._height += 1
+        with self.assertRaises(AssertionError):
+            self.avl_tree.check_invariants()
+
+    def test_insert_many(self) -> None:
+        self.assertListEqual(self.avl_tree.insert_many([30, 11, 12, 30]), [True, False, True, False])
+        self.assertListEqual(self.avl_tree.inorder_traversal(),
+                             [11, 12, 20, 29, 30, 32, 41, 50, 65, 72, 91, 99])
+        self.assertEqual(len(self.avl_tree), 12)
+        self.assertEqual(self.avl_tree.is_balanced, True)
+
+    def test_insert_many_rebuild(self) -> None:
+        inserted = self.avl_tree.insert_many(range(100, 0, -1))
+
+        self.assertEqual(inserted.count(True), 90)
+        self.assertEqual(inserted[100 - 41], False)
+        self.assertListEqual(self.avl_tree.inorder_traversal(), list(range(1, 101)))
+        self.assertEqual(self.avl_tree.height, 6)
+
+    def test_remove_many(self) -> None:
+        self.assertListEqual(self.avl_tree.remove_many([41, 13, 99, 41]), [True, False, True, False])
+        self.assertListEqual(self.avl_tree.inorder_traversal(), [11, 20, 29, 32, 50, 65, 72, 91])
+        self.assertEqual(len(self.avl_tree), 8)
+        self.assertEqual(self.avl_tree.is_balanced, True)
+
+        self.avl_tree.remove_many(self.avl_tree.inorder_traversal())
+        self.assertEqual(self.avl_tree.root, None)
+
+    def test_split(self) -> None:
+        left, found, right = self.avl_tree.split(value=50)
+
+        self.assertEqual(found.value, 50)
+        self.assertEqual(found.size, 1)
+        self.assertListEqual(left.inorder_traversal(), [11, 20, 29, 32, 41])
+        self.assertListEqual(right.inorder_traversal(), [65, 72, 91, 99])
+        self.assertEqual(self.avl_tree.root, None)
+        left.check_invariants()
+        right.check_invariants()
+
+        left, found, right = right.split(value=13)
+        self.assertEqual(found, None)
+        self.assertEqual(left.root, None)
+        self.assertEqual(len(right), 4)
+
+    def test_join(self) -> None:
+        left = AVLTree.create(range(100))
+        right = AVLTree.create([101, 102])
+        avl_tree = AVLTree.join(left, AVLNode(value=100), right)
+
+        self.assertListEqual(avl_tree.inorder_traversal(), list(range(103)))
+        self.assertEqual(avl_tree.root.parent, None)
+        self.assertEqual(left.root, None)
+        avl_tree.check_invariants()
+
+        avl_tree = AVLTree.join(AVLTree(), AVLNode(value=0), AVLTree())
+        self.assertListEqual(avl_tree.inorder_traversal(), [0])
+
+    def test_union(self) -> None:
+        avl_tree = self.avl_tree.union(self.small_avl_tree)
+
+        self.assertListEqual(avl_tree.inorder_traversal(),
+                             [1, 2, 3, 4, 5, 11, 20, 29, 32, 41, 50, 65, 72, 91, 99])
+        self.assertEqual(self.avl_tree.root, None)
+        self.assertEqual(self.small_avl_tree.root, None)
+        avl_tree.check_invariants()
+
+        avl_tree = AVLTree.create(range(0, 100, 2)).union(AVLTree.create(range(0, 100, 3)))
+        self.assertListEqual(avl_tree.inorder_traversal(), [v for v in range(100) if v % 2 == 0 or v % 3 == 0])
+        avl_tree.check_invariants()
+
+    def test_intersection(self) -> None:
+        avl_tree = AVLTree.create(range(0, 100, 2)).intersection(AVLTree.create(range(0, 100, 3)))
+
+        self.assertListEqual(avl_tree.inorder_traversal(), list(range(0, 100, 6)))
+        avl_tree.check_invariants()
+        self.assertEqual(self.avl_tree.intersection(self.small_avl_tree).root, None)
+
+    def test_difference(self) -> None:
+        avl_tree = AVLTree.create(range(0, 100, 2)).difference(AVLTree.create(range(0, 100, 3)))
+
+        self.assertListEqual(avl_tree.inorder_traversal(), [v for v in range(0, 100, 2) if v % 3])
+        avl_tree.check_invariants()
+        self.assertEqual(len(self.avl_tree.difference(self.small_avl_tree)), 10)
+
+    def test_dump_and_load(self) -> None:
+        avl_tree = AVLTree.loads(self.avl_tree.dumps())
+
+        self.assertListEqual(avl_tree.preorder_traversal(), self.avl_tree.preorder_traversal())
+        self.assertEqual(avl_tree.height, self.avl_tree.height)
+        self.assertEqual(avl_tree.root.left.height, self.avl_tree.root.left.height)
+        avl_tree.check_invariants()
+
+    def test_pickle(self) -> None:
+        avl_tree = pickle.loads(pickle.dumps(AVLTree.create(['b', 'a', 'c'])))
+
+        self.assertIsInstance(avl_tree, AVLTree)
+        self.assertListEqual(avl_tree.inorder_traversal(), ['a', 'b', 'c'])
+        self.assertEqual(pickle.loads(pickle.dumps(AVLTree())).root, None)
+
     @staticmethod
     def _get_small_avl_tree() -> AVLTree:
         """    4
@@ -0,0 +1,34 @@
+import random
+import unittest
+
+from benchmark.insert_retrace import CountingAVLTree, LegacyAVLTree
+from tree import AVLNode
+
+
+class TestInsertRetrace(unittest.TestCase):
+    def test_trees_stay_valid(self) -> None:
+        """Both trees under comparison are complete AVL Trees after the run."""
+        keys = random.Random(0).sample(range(50000), 5000)
+        for tree_class in (LegacyAVLTree, CountingAVLTree):
+            tree = tree_class()
+            for key in keys:
+                tree.insert(node=AVLNode(value=key))
+            self.assertEqual(len(tree), 5000)
+            self.assertEqual(tree.height, 14)
+            tree.check_invariants()
+
+    def test_legacy_refreshes_every_ancestor_twice(self) -> None:
+        tree = LegacyAVLTree()
+        refreshed = []
+        for key in range(1, 8):
+            before = tree.refreshed
+            tree.insert(node=AVLNode(value=key))
+            refreshed.append(tree.refreshed - before)
+        # Twice the depth the new leaf was linked at, rotations and all.
+        self.assertListEqual(refreshed, [0, 2, 4, 4, 6, 6, 6])
+        self.assertListEqual(tree.preorder_traversal(), [4, 2, 1, 3, 6, 5, 7])
+        tree.check_invariants()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,125 @@
+import pickle
+import unittest
+
+from tree import ArrayAVLTree, SortedBlockTree
+
+
+class TestSortedBlockTree(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tree = SortedBlockTree(load=4)
+        for key in (41, 20, 65, 11, 29, 50, 91, 32, 72, 99):
+            self.tree.insert(key)
+
+    def test_blocks(self) -> None:
+        self.assertListEqual(self.tree._blocks, [[11, 20, 29, 32], [41, 50, 65, 72, 91, 99]])
+        self.assertListEqual(self.tree._maxes, [32, 99])
+        self.assertEqual(self.tree.height, 1)
+        self.tree.check_invariants()
+
+    def test_find_min_and_max(self) -> None:
+        self.assertEqual(self.tree.find_min(), 11)
+        self.assertEqual(self.tree.find_max(), 99)
+        self.assertEqual(SortedBlockTree().find_min(), None)
+
+    def test_search(self) -> None:
+        self.assertEqual(self.tree.search(41), 41)
+        self.assertEqual(self.tree.search(13), None)
+        self.assertEqual(self.tree.search(100), None)
+        self.assertIn(99, self.tree)
+        self.assertNotIn(13, self.tree)
+        self.assertEqual(self.tree.get(41), 41)
+        self.assertEqual(self.tree.get(13, default=-1), -1)
+
+    def test_neighbours(self) -> None:
+        self.assertEqual(self.tree.successor(32), 41)
+        self.assertEqual(self.tree.predecessor(41), 32)
+        self.assertEqual(self.tree.floor(40), 32)
+        self.assertEqual(self.tree.floor(10), None)
+        self.assertEqual(self.tree.ceiling(33), 41)
+        self.assertEqual(self.tree.ceiling(100), None)
+        self.assertEqual(self.tree.lower(11), None)
+        self.assertEqual(self.tree.lower(100), 99)
+        self.assertEqual(self.tree.higher(99), None)
+
+    def test_traversals(self) -> None:
+        self.assertListEqual(self.tree.inorder_traversal(), [11, 20, 29, 32, 41, 50, 65, 72, 91, 99])
+        self.assertListEqual(list(reversed(self.tree)), [99, 91, 72, 65, 50, 41, 32, 29, 20, 11])
+
+    def test_rank_and_select(self) -> None:
+        self.assertEqual(self.tree.rank(41), 5)
+        self.assertEqual(self.tree.rank(13), None)
+        self.assertEqual(self.tree.select(10), 99)
+        self.assertEqual(self.tree.select(11), None)
+        self.assertEqual(self.tree.median(), 41)
+
+    def test_range(self) -> None:
+        self.assertListEqual(list(self.tree.range(20, 65)), [20, 29, 32, 41, 50, 65])
+        self.assertListEqual(list(self.tree.range(20, 65, inclusive=(False, False))), [29, 32, 41, 50])
+        self.assertEqual(self.tree.count_range(20, 65), 6)
+        self.assertEqual(self.tree.count_range(21, 64), 4)
+        self.assertEqual(self.tree.count_range(65, 20), 0)
+
+    def test_insert_splits_blocks(self) -> None:
+        for key in (92, 93, 94):
+            self.tree.insert(key)
+
+        self.assertListEqual(self.tree._maxes, [32, 72, 99])
+        self.assertEqual(self.tree.rank(93), 11)
+        self.tree.check_invariants()
+        with self.assertRaises(ValueError):
+            self.tree.insert(41)
+
+    def test_remove_merges_blocks(self) -> None:
+        for key in (11, 20, 29):
+            self.tree.remove(key)
+
+        self.assertListEqual(self.tree._blocks, [[32, 41, 50, 65, 72, 91, 99]])
+        self.tree.check_invariants()
+        with self.assertRaises(ValueError):
+            self.tree.remove(11)
+
+    def test_pop_min_and_max(self) -> None:
+        self.assertEqual(self.tree.pop_max(), 99)
+        self.assertListEqual([self.tree.pop_min() for _ in range(10)],
+                             [11, 20, 29, 32, 41, 50, 65, 72, 91, None])
+        self.assertEqual(self.tree.height, -1)
+
+    def test_delete_range(self) -> None:
+        tree = SortedBlockTree.from_sorted(range(100), load=4)
+
+        self.assertEqual(tree.delete_range(10, 89), 80)
+        self.assertEqual(tree.delete_range(5, 5, inclusive=(False, False)), 0)
+        self.assertListEqual(tree.inorder_traversal(), list(range(10)) + list(range(90, 100)))
+        tree.check_invariants()
+
+    def test_batches(self) -> None:
+        self.assertListEqual(self.tree.insert_many([12, 11, 12]), [True, False, False])
+        self.assertListEqual(self.tree.remove_many([12, 13]), [True, False])
+        self.assertEqual(self.tree.insert_many(range(100)).count(True), 90)
+        self.assertEqual(len(self.tree), 100)
+        self.tree.check_invariants()
+
+    def test_from_sorted(self) -> None:
+        tree = SortedBlockTree.from_sorted(range(1000), load=64)
+
+        self.assertEqual(len(tree), 1000)
+        self.assertEqual(len(tree._blocks), 16)
+        self.assertEqual(tree.select(500), 499)
+        tree.check_invariants()
+
+        with self.assertRaises(ValueError):
+            SortedBlockTree.from_sorted([2, 1])
+
+    def test_matches_array_avl_tree_api(self) -> None:
+        """Everything ArrayAVLTree offers except what depends on a binary shape or
+        on typed array columns.
+        """
+        left_out = {'is_balanced', 'iter_preorder', 'iter_postorder', 'preorder_traversal',
+                    'postorder_traversal', 'memory_usage', 'typecode'}
+        public = {name for name in dir(ArrayAVLTree) if not name.startswith('_')}
+        self.assertSetEqual(public - left_out - set(dir(SortedBlockTree)), set())
+
+    def test_pickle(self) -> None:
+        tree = pickle.loads(pickle.dumps(self.tree))
+        self.assertListEqual(tree.inorder_traversal(), self.tree.inorder_traversal())
+        tree.check_invariants()
@@ -1,3 +1,6 @@
+import io
+import pickle
+import sys
 import unittest
 
 from tree import BinarySearchTree, BSTNode
@@ -43,6 +46,114 @@ class TestBinarySearchTree(unittest.TestCase):
     def test_postorder_traversal(self) -> None:
         self.assertListEqual(self.balanced_bst.postorder_traversal(), [5, 4, 9, 7, 6, 50, 71, 23, 15])
 
+    def test_contains(self) -> None:
+        self.assertIn(15, self.balanced_bst)
+        self.assertIn(50, self.balanced_bst)
+        self.assertNotIn(16, self.balanced_bst)
+
+    def test_get(self) -> None:
+        self.assertIs(self.balanced_bst.get(23), self.balanced_bst.root.right)
+        self.assertEqual(self.balanced_bst.get(666), None)
+        self.assertEqual(self.balanced_bst.get(666, self.balanced_bst.root).value, 15)
+
+    def test_floor_and_ceiling(self) -> None:
+        self.assertEqual(self.balanced_bst.floor(9).value, 9)
+        self.assertEqual(self.balanced_bst.floor(14).value, 9)
+        self.assertEqual(self.balanced_bst.floor(3), None)
+        self.assertEqual(self.balanced_bst.ceiling(9).value, 9)
+        self.assertEqual(self.balanced_bst.ceiling(24).value, 50)
+        self.assertEqual(self.balanced_bst.ceiling(72), None)
+
+    def test_lower_and_higher(self) -> None:
+        self.assertEqual(self.balanced_bst.lower(9).value, 7)
+        self.assertEqual(self.balanced_bst.lower(16).value, 15)
+        self.assertEqual(self.balanced_bst.lower(4), None)
+        self.assertEqual(self.balanced_bst.higher(9).value, 15)
+        self.assertEqual(self.balanced_bst.higher(50).value, 71)
+        self.assertEqual(self.balanced_bst.higher(71), None)
+
+    def test_iterators(self) -> None:
+        self.assertListEqual(list(self.balanced_bst), [4, 5, 6, 7, 9, 15, 23, 50, 71])
+        self.assertListEqual(list(reversed(self.balanced_bst)), [71, 50, 23, 15, 9, 7, 6, 5, 4])
+        self.assertListEqual(list(self.balanced_bst.iter_preorder()), [15, 6, 4, 5, 7, 9, 23, 71, 50])
+        self.assertListEqual(list(self.balanced_bst.iter_postorder()), [5, 4, 9, 7, 6, 50, 71, 23, 15])
+        self.assertListEqual(list(self.balanced_bst.iter_inorder(start=self.balanced_bst.root.right)),
+                             [23, 50, 71])
+
+    def test_iterators_stop_early(self) -> None:
+        iterator = iter(self.balanced_bst)
+        self.assertEqual(next(iterator), 4)
+        self.assertEqual(next(iterator), 5)
+
+    def test_traversal_of_degenerate_tree(self) -> None:
+        size = sys.getrecursionlimit() + 100
+        bst = BinarySearchTree(root=BSTNode(value=0))
+        node = bst.root
+        for value in range(1, size):
+            node = BSTNode(value=value, parent=node)
+
+        self.assertListEqual(bst.inorder_traversal(), list(range(size)))
+        self.assertListEqual(bst.preorder_traversal(), list(range(size)))
+        self.assertListEqual(bst.postorder_traversal(), list(range(size))[::-1])
+
+    def test_rank(self) -> None:
+        self.assertEqual(self.balanced_bst.rank(node=BSTNode(value=4)), 1)
+        self.assertEqual(self.balanced_bst.rank(node=BSTNode(value=15)), 6)
+        self.assertEqual(self.balanced_bst.rank(node=BSTNode(value=50)), 8)
+        self.assertEqual(self.balanced_bst.rank(node=BSTNode(value=71)), 9)
+        self.assertEqual(self.balanced_bst.rank(node=BSTNode(value=666)), None)
+
+    def test_select(self) -> None:
+        self.assertEqual(self.balanced_bst.select(rank=1).value, 4)
+        self.assertEqual(self.balanced_bst.select(rank=6).value, 15)
+        self.assertEqual(self.balanced_bst.select(rank=9).value, 71)
+        self.assertEqual(self.balanced_bst.select(rank=0), None)
+        self.assertEqual(self.balanced_bst.select(rank=10), None)
+
+    def test_count_range(self) -> None:
+        self.assertEqual(self.balanced_bst.count_range(lo=5, hi=23), 6)
+        self.assertEqual(self.balanced_bst.count_range(lo=8, hi=49), 3)
+        self.assertEqual(self.balanced_bst.count_range(lo=0, hi=100), 9)
+        self.assertEqual(self.balanced_bst.count_range(lo=23, hi=5), 0)
+        self.assertEqual(self.balanced_bst.count_range(lo=5, hi=23, inclusive=(False, False)), 4)
+        self.assertEqual(self.balanced_bst.count_range(lo=9, hi=9, inclusive=(True, False)), 0)
+
+    def test_range(self) -> None:
+        self.assertListEqual(list(self.balanced_bst.range(lo=5, hi=23)), [5, 6, 7, 9, 15, 23])
+        self.assertListEqual(list(self.balanced_bst.range(lo=5, hi=23, inclusive=(False, False))),
+                             [6, 7, 9, 15])
+        self.assertListEqual(list(self.balanced_bst.range(lo=8, hi=60)), [9, 15, 23, 50])
+        self.assertListEqual(list(self.balanced_bst.range(lo=23, hi=5)), [])
+        self.assertListEqual(list(BinarySearchTree().range(lo=0, hi=100)), [])
+
+    def test_delete_range(self) -> None:
+        self.assertEqual(self.balanced_bst.delete_range(lo=6, hi=23, inclusive=(True, False)), 4)
+        self.assertListEqual(self.balanced_bst.inorder_traversal(), [4, 5, 23, 50, 71])
+        self.assertEqual(len(self.balanced_bst), 5)
+        self.balanced_bst.check_invariants()
+
+        self.assertEqual(self.balanced_bst.delete_range(lo=0, hi=100), 5)
+        self.assertEqual(self.balanced_bst.root, None)
+
+    def test_median(self) -> None:
+        self.assertEqual(self.balanced_bst.median().value, 9)
+
+    def test_size(self) -> None:
+        self.assertEqual(len(self.balanced_bst), 9)
+        self.assertEqual(self.balanced_bst.root.left.size, 5)
+
+        self.balanced_bst.insert(node=BSTNode(value=37))
+        self.assertEqual(len(self.balanced_bst), 10)
+        self.assertEqual(self.balanced_bst.root.right.size, 4)
+
+        self.balanced_bst.remove(node=BSTNode(value=5))
+        self.assertEqual(len(self.balanced_bst), 9)
+        self.assertEqual(self.balanced_bst.root.left.size, 4)
+
+        self.balanced_bst.remove(node=BSTNode(value=7))
+        self.assertEqual(len(self.balanced_bst), 8)
+        self.assertEqual(self.balanced_bst.root.left.size, 3)
+
     def test_insert(self) -> None:
         self.balanced_bst.insert(node=BSTNode(value=37))
         self.assertListEqual(self.balanced_bst.inorder_traversal(), [4, 5, 6, 7, 9, 15, 23, 37, 50, 71])
@@ -53,6 +164,33 @@ class TestBinarySearchTree(unittest.TestCase):
         with self.assertRaises(ValueError):
             self.balanced_bst.insert(node=BSTNode(value=3))
 
+    def test_create(self) -> None:
+        bst = BinarySearchTree.create([15, 6, 23, 4, 7, 71, 5, 9, 50, 6])
+        self.assertListEqual(bst.preorder_traversal(), [15, 6, 4, 5, 7, 9, 23, 71, 50])
+
+        bst = BinarySearchTree.create([15, 6, 23, 4, 7], balanced=True)
+        self.assertListEqual(bst.preorder_traversal(), [7, 6, 4, 23, 15])
+
+        self.assertEqual(BinarySearchTree.create([1], empty=True).root, None)
+
+    def test_from_sorted(self) -> None:
+        bst = BinarySearchTree.from_sorted([4, 5, 6, 7, 9, 15, 23, 50, 71])
+        self.assertListEqual(bst.preorder_traversal(), [9, 6, 5, 4, 7, 50, 23, 15, 71])
+        self.assertEqual(bst.root.size, 9)
+
+        with self.assertRaises(ValueError):
+            BinarySearchTree.from_sorted([4, 4])
+
+    def test_insert_many(self) -> None:
+        self.assertListEqual(self.balanced_bst.insert_many([9, 8]), [False, True])
+        self.assertListEqual(self.balanced_bst.inorder_traversal(), [4, 5, 6, 7, 8, 9, 15, 23, 50, 71])
+        self.assertEqual(self.balanced_bst.root.value, 15)
+
+        # Large enough compared to the tree to be merged and relinked.
+        self.assertListEqual(self.balanced_bst.insert_many([3, 1, 2]), [True, True, True])
+        self.assertListEqual(self.balanced_bst.inorder_traversal(), [1, 2, 3, 4, 5, 6, 7, 8, 9, 15, 23, 50, 71])
+        self.assertEqual(self.balanced_bst.root.value, 7)
+
     def test_remove_leaf(self) -> None:
         self.balanced_bst.remove(node=BSTNode(value=5))
         self.assertListEqual(self.balanced_bst.inorder_traversal(), [4, 6, 7, 9, 15, 23, 50, 71])
@@ -70,10 +208,62 @@ class TestBinarySearchTree(unittest.TestCase):
         self.balanced_bst.remove(node=BSTNode(value=7))
         self.assertListEqual(self.balanced_bst.inorder_traversal(), [5, 6, 15, 23, 50, 71])
 
-    # def test_remove_has_two_children(self) -> None:
-    # # FIXME
-    #     self.balanced_bst.remove(node=BSTNode(value=6))
-    #     self.assertListEqual(self.balanced_bst.inorder_traversal(), [4, 5, 7, 9, 15, 23, 50, 71])
+    def test_remove_has_two_children(self) -> None:
+        self.balanced_bst.remove(node=BSTNode(value=6))
+        self.assertListEqual(self.balanced_bst.inorder_traversal(), [4, 5, 7, 9, 15, 23, 50, 71])
+
+        self.balanced_bst.remove(node=BSTNode(value=15))
+        self.assertListEqual(self.balanced_bst.inorder_traversal(), [4, 5, 7, 9, 23, 50, 71])
+        self.assertEqual(self.balanced_bst.root.value, 23)
+        self.assertEqual(self.balanced_bst.root.size, 7)
+
+    def test_check_invariants(self) -> None:
+        self.balanced_bst.check_invariants()
+
+        self.balanced_bst.remove(node=BSTNode(value=6))
+        self.balanced_bst.check_invariants()
+
+        self.balanced_bst.root.right._size = 1
+        with self.assertRaises(AssertionError):
+            self.balanced_bst.check_invariants()
+
+    def test_remove_root(self) -> None:
+        bst = BinarySearchTree(root=BSTNode(value=1))
+        BSTNode(value=2, parent=bst.root)
+        bst.remove(node=BSTNode(value=1))
+        self.assertEqual(bst.root.value, 2)
+        self.assertEqual(bst.root.parent, None)
+
+        bst.remove(node=BSTNode(value=2))
+        self.assertEqual(bst.root, None)
+
+    def test_remove_missing(self) -> None:
+        with self.assertRaises(ValueError):
+            self.balanced_bst.remove(node=BSTNode(value=666))
+
+    def test_pop_min_and_max(self) -> None:
+        self.assertEqual(self.balanced_bst.pop_min().value, 4)
+        self.assertEqual(self.balanced_bst.pop_max().value, 71)
+        self.assertEqual(self.balanced_bst.pop_max().value, 50)
+        self.assertListEqual(self.balanced_bst.inorder_traversal(), [5, 6, 7, 9, 15, 23])
+
+    def test_dump_and_load(self) -> None:
+        buffer = io.BytesIO()
+        self.balanced_bst.dump(buffer)
+        buffer.seek(0)
+        bst = BinarySearchTree.load(buffer)
+
+        self.assertListEqual(bst.preorder_traversal(), self.balanced_bst.preorder_traversal())
+        self.assertEqual(bst.root.left.size, 5)
+        bst.check_invariants()
+
+    def test_pickle_degenerate_tree(self) -> None:
+        bst = BinarySearchTree.create(range(sys.getrecursionlimit() * 2))
+        bst = pickle.loads(pickle.dumps(bst))
+
+        self.assertEqual(len(bst), sys.getrecursionlimit() * 2)
+        self.assertEqual(bst.root.left, None)
+        bst.check_invariants()
 
     @staticmethod
     def _get_balanced_bst() -> BinarySearchTree:
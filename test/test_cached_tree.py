@@ -0,0 +1,74 @@
+import unittest
+
+from tree import AVLNode, AVLTree, CachedAVLTree
+
+
+class TestCachedAVLTree(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tree = AVLTree.create([41, 20, 65, 11, 29, 50, 91, 32, 72, 99])
+        self.cached = CachedAVLTree(self.tree, maxsize=4)
+
+    def test_hits_and_misses(self) -> None:
+        node = self.cached.get(41)
+
+        self.assertIs(self.cached.get(41), node)
+        self.assertIs(self.cached.search(node=AVLNode(value=41)), node)
+        self.assertIn(41, self.cached)
+        self.assertNotIn(42, self.cached)
+        self.assertNotIn(42, self.cached)
+        self.assertEqual(self.cached.cache_info(), (4, 2, 4, 2))
+
+    def test_least_recently_used_is_evicted(self) -> None:
+        for value in (11, 20, 29, 32):
+            self.cached.get(value)
+        self.cached.get(11)
+        self.cached.get(41)
+
+        self.assertListEqual(list(self.cached._found), [29, 32, 11, 41])
+
+    def test_neighbours(self) -> None:
+        node = self.tree.get(41)
+
+        self.assertEqual(self.cached.successor(node).value, 50)
+        self.assertEqual(self.cached.predecessor(node).value, 32)
+        self.assertEqual(self.cached.successor(node).value, 50)
+        self.assertEqual(self.cached.hits, 1)
+
+    def test_insert_invalidates(self) -> None:
+        below, above = self.tree.get(41), self.tree.get(50)
+        self.assertEqual(self.cached.get(45), None)
+        self.assertEqual(self.cached.successor(below).value, 50)
+        self.assertEqual(self.cached.predecessor(above).value, 41)
+        kept = self.cached.predecessor(below)
+
+        self.cached.insert(node=AVLNode(value=45))
+
+        self.assertEqual(self.cached.get(45).value, 45)
+        self.assertEqual(self.cached.successor(below).value, 45)
+        self.assertEqual(self.cached.predecessor(above).value, 45)
+        self.assertIs(self.cached.predecessor(below), kept)
+        self.cached.check_invariants()
+
+    def test_remove_invalidates(self) -> None:
+        for value in (11, 20, 29, 32, 41, 50):
+            self.assertEqual(self.cached.get(value).value, value)
+        root = self.tree.root
+
+        self.cached.remove(node=AVLNode(value=root.value))
+
+        self.assertEqual(self.cached.get(root.value), None)
+        for value in self.tree:
+            self.assertIs(self.cached.get(value), self.tree.get(value))
+        self.assertEqual(self.cached.pop_min().value, 11)
+        self.assertEqual(self.cached.get(11), None)
+        with self.assertRaises(ValueError):
+            self.cached.remove(node=AVLNode(value=11))
+
+    def test_direct_updates_clear(self) -> None:
+        self.assertEqual(self.cached.get(45), None)
+
+        self.tree.insert(node=AVLNode(value=45))
+        self.assertEqual(self.cached.get(45).value, 45)
+        self.cached.insert_many([46, 47])
+        self.assertEqual(self.cached.cache_info().currsize, 0)
+        self.assertEqual(self.cached.get(46).value, 46)
@@ -0,0 +1,134 @@
+import random
+import threading
+import time
+import unittest
+
+from tree import AVLNode, AVLTree, BinarySearchTree, BSTNode, ConcurrentAVLTree, RWLock, SplayTree
+
+
+class TestRWLock(unittest.TestCase):
+    def test_readers_share(self) -> None:
+        lock = RWLock()
+        inside = threading.Barrier(3, timeout=5)
+
+        def read() -> None:
+            with lock.read():
+                inside.wait()
+
+        threads = [threading.Thread(target=read) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertFalse(inside.broken)
+
+    def test_writer_excludes(self) -> None:
+        lock = RWLock()
+        events = []
+
+        lock.acquire_read()
+        writer = threading.Thread(target=lambda: (lock.acquire_write(), events.append('write'), lock.release_write()))
+        writer.start()
+        time.sleep(0.05)
+        events.append('read')
+        lock.release_read()
+        writer.join()
+        self.assertListEqual(events, ['read', 'write'])
+
+
+class TestConcurrentAVLTree(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tree = ConcurrentAVLTree(AVLTree.create([41, 20, 65, 11, 29, 50, 91, 32, 72, 99]))
+
+    def test_queries(self) -> None:
+        self.assertEqual(len(self.tree), 10)
+        self.assertIn(41, self.tree)
+        self.assertEqual(self.tree.search(node=AVLNode(value=29)).value, 29)
+        self.assertEqual(self.tree.ceiling(30).value, 32)
+        self.assertEqual(self.tree.rank(node=AVLNode(value=65)), 7)
+        self.assertEqual(self.tree.count_range(lo=20, hi=65), 6)
+
+    def test_updates(self) -> None:
+        self.tree.insert(node=AVLNode(value=13))
+        self.tree.remove(node=AVLNode(value=41))
+        self.assertListEqual(self.tree.remove_many([11, 12]), [True, False])
+        self.assertEqual(self.tree.pop_max().value, 99)
+
+        self.assertListEqual(self.tree.inorder_traversal(), [13, 20, 29, 32, 50, 65, 72, 91])
+        self.tree.check_invariants()
+
+    def test_scans(self) -> None:
+        self.assertListEqual(list(self.tree), [11, 20, 29, 32, 41, 50, 65, 72, 91, 99])
+        self.assertListEqual(list(self.tree.iter_reversed())[:2], [99, 91])
+        self.assertListEqual(list(self.tree.range(20, 41, inclusive=(False, True))), [29, 32, 41])
+
+    def test_scan_does_not_see_later_updates(self) -> None:
+        scan = self.tree.iter_inorder()
+        self.assertEqual(next(scan), 11)
+        self.tree.remove(node=AVLNode(value=20))
+        self.tree.insert(node=AVLNode(value=12))
+
+        self.assertEqual(next(scan), 20)
+        self.assertListEqual(list(self.tree)[:3], [11, 12, 29])
+
+    def test_binary_search_tree(self) -> None:
+        tree = ConcurrentAVLTree(BinarySearchTree.create([2, 1, 3]))
+        tree.insert(node=BSTNode(value=4))
+        self.assertListEqual(list(tree), [1, 2, 3, 4])
+
+    def test_queries_exclusive_when_they_write(self) -> None:
+        """A query on a splay or an instrumented tree waits for the readers."""
+        instrumented = AVLTree.create([1, 2, 3])
+        instrumented.instrument()
+        for tree in (ConcurrentAVLTree(SplayTree.create([1, 2, 3])), ConcurrentAVLTree(instrumented)):
+            found = []
+            tree.lock.acquire_read()
+            query = threading.Thread(target=lambda: found.append(tree.get(3)))
+            query.start()
+            query.join(0.05)
+            self.assertTrue(query.is_alive())
+            tree.lock.release_read()
+            query.join()
+            self.assertEqual(found[0].value, 3)
+
+    def test_stress(self) -> None:
+        """Readers look up keys that are never removed while a writer churns the
+        others, with and without scans running alongside.
+        """
+        stable = list(range(0, 2000, 2))
+        tree = ConcurrentAVLTree(AVLTree.create(stable))
+        stop = threading.Event()
+        errors = []
+
+        def read(seed: int) -> None:
+            rng = random.Random(seed)
+            while not stop.is_set():
+                key = rng.choice(stable)
+                if key not in tree or tree.rank(node=AVLNode(value=key)) is None:
+                    errors.append(key)
+                if rng.random() < 0.01 and not set(stable) <= set(tree.iter_inorder()):
+                    errors.append('scan')
+
+        def write() -> None:
+            rng = random.Random(0)
+            while not stop.is_set():
+                key = rng.randrange(1, 2000, 2)
+                if key in tree:
+                    tree.remove(node=AVLNode(value=key))
+                else:
+                    tree.insert(node=AVLNode(value=key))
+
+        threads = [threading.Thread(target=write)] + [threading.Thread(target=read, args=(i,)) for i in range(4)]
+        for thread in threads:
+            thread.start()
+        time.sleep(0.3)
+        stop.set()
+        for thread in threads:
+            thread.join()
+
+        self.assertListEqual(errors, [])
+        tree.check_invariants()
+
+
+if __name__ == '__main__':
+    unittest.main()
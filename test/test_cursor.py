@@ -0,0 +1,71 @@
+import unittest
+
+from tree import AVLNode, AVLTree, BinarySearchTree
+
+
+class TestTreeCursor(unittest.TestCase):
+    def setUp(self) -> None:
+        self.avl_tree = AVLTree.create([41, 20, 65, 11, 29, 50, 91, 32, 72, 99])
+
+    def test_walk_forward(self) -> None:
+        cursor = self.avl_tree.cursor()
+        values = []
+        while cursor.next() is not None:
+            values.append(cursor.value)
+
+        self.assertListEqual(values, self.avl_tree.inorder_traversal())
+        self.assertEqual(cursor.node, None)
+        self.assertEqual(cursor.prev().value, 99)
+
+    def test_walk_backward(self) -> None:
+        cursor = self.avl_tree.cursor()
+        cursor.last()
+        values = [cursor.value]
+        while cursor.prev() is not None:
+            values.append(cursor.value)
+
+        self.assertListEqual(values, self.avl_tree.inorder_traversal()[::-1])
+        self.assertEqual(cursor.next().value, 11)
+
+    def test_seek(self) -> None:
+        cursor = self.avl_tree.cursor(value=30)
+        self.assertEqual(cursor.value, 32)
+
+        self.assertEqual(cursor.seek(33).value, 41)
+        self.assertEqual(cursor.seek(29).value, 29)
+        self.assertEqual(cursor.seek(12).value, 20)
+        self.assertEqual(cursor.seek(92).value, 99)
+        self.assertEqual(cursor.seek(65).value, 65)
+        self.assertEqual(cursor.seek(100), None)
+        self.assertEqual(cursor.seek(0).value, 11)
+
+    def test_seek_every_pair(self) -> None:
+        values = self.avl_tree.inorder_traversal()
+        for start in values:
+            for target in range(10, 101):
+                with self.subTest(start=start, target=target):
+                    cursor = self.avl_tree.cursor(value=start)
+                    node = cursor.seek(target)
+                    expected = self.avl_tree.ceiling(target)
+                    self.assertIs(node, expected)
+
+    def test_survives_updates(self) -> None:
+        cursor = self.avl_tree.cursor(value=41)
+        self.avl_tree.remove(node=AVLNode(value=41))
+        self.avl_tree.insert(node=AVLNode(value=45))
+
+        self.assertEqual(cursor.next().value, 45)
+        self.avl_tree.remove(node=AVLNode(value=45))
+        self.assertEqual(cursor.prev().value, 32)
+        self.assertEqual(cursor.seek(46).value, 50)
+
+    def test_empty_tree(self) -> None:
+        cursor = BinarySearchTree().cursor()
+        self.assertEqual(cursor.next(), None)
+        self.assertEqual(cursor.prev(), None)
+        self.assertEqual(cursor.seek(1), None)
+        self.assertEqual(cursor.value, None)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,215 @@
+import pickle
+import unittest
+from functools import total_ordering
+
+from tree import AVLNode, AVLTree, BinarySearchTree, BSTNode
+
+
+@total_ordering
+class Key:
+    """Compares by reading an attribute of the other operand."""
+
+    def __init__(self, v: int):
+        self.v = v
+
+    def __eq__(self, other: 'Key') -> bool:
+        return self.v == other.v
+
+    def __lt__(self, other: 'Key') -> bool:
+        return self.v < other.v
+
+
+class TestInstrumentation(unittest.TestCase):
+    def setUp(self) -> None:
+        self.avl_tree = AVLTree.create([41, 20, 65, 11, 29, 50, 91, 32, 72, 99])
+
+    def test_counts_a_search(self) -> None:
+        stats = self.avl_tree.instrument()
+        node = self.avl_tree.search(node=AVLNode(value=32))
+        depth = 0
+        while node.parent is not None:
+            node, depth = node.parent, depth + 1
+
+        search = stats.as_dict()['operations']['search']
+        self.assertEqual(search['calls'], 1)
+        self.assertEqual(search['nodes_visited'], depth + 1)
+        self.assertEqual(search['comparisons'], 2 * depth + 1)
+        self.assertEqual(sum(search['latency_histogram'].values()), 1)
+        self.assertDictEqual(search['depth_histogram'], {depth + 1: 1})
+
+    def _counts(self, operation: str) -> tuple[int, int]:
+        stats = self.avl_tree.stats.operations[operation]
+        return stats.nodes_visited, stats.comparisons
+
+    def test_counts_neighbour_queries(self) -> None:
+        r"""The tree is
+                  50
+                /    \
+              29      91
+             /  \    /  \
+           20   41  72  99
+          /    /   /
+        11   32  65
+        """
+        self.assertListEqual(self.avl_tree.preorder_traversal(), [50, 29, 20, 11, 41, 32, 91, 72, 65, 99])
+        self.avl_tree.instrument()
+
+        self.assertEqual(self.avl_tree.floor(30).value, 29)
+        self.assertTupleEqual(self._counts('floor'), (4, 8))
+        self.assertEqual(self.avl_tree.floor(41).value, 41)
+        self.assertTupleEqual(self._counts('floor'), (4 + 3, 8 + 5))
+        self.assertEqual(self.avl_tree.lower(41).value, 32)
+        self.assertTupleEqual(self._counts('lower'), (4, 4))
+        # Passing the root on the way down, the walk still goes to the bottom.
+        self.assertEqual(self.avl_tree.higher(50).value, 65)
+        self.assertTupleEqual(self._counts('higher'), (4, 4))
+        self.assertEqual(self.avl_tree.ceiling(50).value, 50)
+        self.assertTupleEqual(self._counts('ceiling'), (1, 1))
+
+    def test_counts_position_queries(self) -> None:
+        self.avl_tree.instrument()
+        self.assertEqual(self.avl_tree.select(4).value, 32)
+        self.assertTupleEqual(self._counts('select'), (4, 0))
+        self.assertEqual(self.avl_tree.rank(node=AVLNode(value=41)), 5)
+        self.assertTupleEqual(self._counts('rank'), (3, 5))
+
+        node = self.avl_tree.get(41)
+        self.assertEqual(self.avl_tree.successor(node=node).value, 50)
+        self.assertTupleEqual(self._counts('successor'), (2, 0))
+        self.assertEqual(self.avl_tree.predecessor(node=self.avl_tree.get(29)).value, 20)
+        self.assertTupleEqual(self._counts('predecessor'), (1, 0))
+
+    def test_counts_a_range(self) -> None:
+        stats = self.avl_tree.instrument()
+        values = self.avl_tree.range(29, 50)
+        self.assertEqual(next(values), 29)
+        self.assertNotIn('range', stats.operations)
+
+        self.assertListEqual(list(values), [32, 41, 50])
+        # Down to 29 over 50 and 20, then 41, 32 and 91, 72, 65 pushed on the way.
+        self.assertTupleEqual(self._counts('range'), (8, 10))
+        self.assertEqual(stats.operations['range'].calls, 1)
+
+        self.assertListEqual(list(self.avl_tree), self.avl_tree.inorder_traversal())
+        self.assertTupleEqual(self._counts('iter_inorder'), (10, 0))
+        self.assertTupleEqual(self._counts('inorder_traversal'), (10, 0))
+
+    def test_counts_updates(self) -> None:
+        self.avl_tree.instrument()
+        self.avl_tree.insert(node=AVLNode(value=30))
+        self.assertTupleEqual(self._counts('insert'), (4, 5))
+        self.assertListEqual(self.avl_tree.preorder_traversal(), [50, 29, 20, 11, 32, 30, 41, 91, 72, 65, 99])
+
+        self.assertEqual(self.avl_tree.pop_min().value, 11)
+        self.assertTupleEqual(self._counts('pop_min'), (4, 0))
+        self.assertEqual(self.avl_tree.pop_min().value, 20)
+        self.assertTupleEqual(self._counts('pop_min'), (4 + 3, 0))
+        self.assertListEqual(self.avl_tree.preorder_traversal(), [50, 32, 29, 30, 41, 91, 72, 65, 99])
+
+        self.avl_tree.remove(node=AVLNode(value=29))
+        self.assertTupleEqual(self._counts('remove'), (3, 5))
+        # Found at the root, then the walk down to its successor.
+        self.avl_tree.remove(node=AVLNode(value=50))
+        self.assertTupleEqual(self._counts('remove'), (3 + 1 + 3, 5 + 1))
+        self.assertListEqual(self.avl_tree.preorder_traversal(), [65, 32, 30, 41, 91, 72, 99])
+
+        self.assertListEqual(self.avl_tree.remove_many([99]), [True])
+        self.assertTupleEqual(self._counts('remove_many'), (3, 5))
+        self.avl_tree.check_invariants()
+
+    def test_counts_batches(self) -> None:
+        stats = self.avl_tree.instrument()
+        self.avl_tree.insert_many(range(100))
+        self.avl_tree.delete_range(20, 80)
+        self.avl_tree.remove_many(range(0, 100, 2))
+
+        for name in ('insert_many', 'delete_range', 'remove_many'):
+            self.assertGreater(stats.operations[name].nodes_visited, 0, name)
+            self.assertGreater(stats.operations[name].comparisons, 0, name)
+        self.avl_tree.check_invariants()
+
+    def test_counts_rotations(self) -> None:
+        avl_tree = AVLTree()
+        stats = avl_tree.instrument()
+        for value in (1, 3, 2, 10, 8, 0, -1):
+            avl_tree.insert(node=AVLNode(value=value))
+
+        self.assertDictEqual(stats.rotations, {'rotate_left': 2, 'rotate_right': 3,
+                                               'rotate_left_right': 0, 'rotate_right_left': 2})
+        self.assertEqual(stats.operations['insert'].rotations, 5)
+        avl_tree.check_invariants()
+
+    def test_nested_operations_count_once(self) -> None:
+        stats = self.avl_tree.instrument()
+        self.avl_tree.insert_many([1, 2, 3])
+        self.avl_tree.remove(node=AVLNode(value=41))
+
+        self.assertEqual(set(stats.operations), {'insert_many', 'remove'})
+        self.assertEqual(self.avl_tree.inorder_traversal()[:4], [1, 2, 3, 11])
+
+    def test_keys_reading_the_other_operand(self) -> None:
+        avl_tree = AVLTree.create(map(Key, range(10)))
+        stats = avl_tree.instrument()
+        node = AVLNode(value=Key(10))
+        avl_tree.insert(node=node)
+
+        self.assertIs(type(node.value), Key)
+        self.assertEqual(avl_tree.search(node=AVLNode(value=Key(3))).value.v, 3)
+        self.assertIn(Key(10), avl_tree)
+        self.assertEqual(avl_tree.floor(Key(11)).value.v, 10)
+        self.assertEqual(stats.operations['insert'].nodes_visited, 3)
+        avl_tree.check_invariants()
+
+    def test_pickle_instrumented(self) -> None:
+        avl_tree = AVLTree.create(range(10))
+        avl_tree.instrument()
+        copy = pickle.loads(pickle.dumps(avl_tree))
+        self.assertIs(type(copy), AVLTree)
+        self.assertIsNone(copy.stats)
+        self.assertEqual(copy.inorder_traversal(), list(range(10)))
+        copy.check_invariants()
+
+    def test_values_are_untouched(self) -> None:
+        self.avl_tree.instrument()
+        node = AVLNode(value=30)
+        self.avl_tree.insert(node=node)
+        with self.assertRaises(ValueError):
+            self.avl_tree.insert(node=AVLNode(value=30))
+
+        self.assertEqual(node.value, 30)
+        self.assertIsInstance(self.avl_tree.search(node=AVLNode(value=30)).value, int)
+        self.assertIn(30, self.avl_tree)
+        self.avl_tree.check_invariants()
+
+    def test_callback(self) -> None:
+        records = []
+        self.avl_tree.instrument(callback=lambda operation, record: records.append((operation, record)))
+        self.avl_tree.floor(30)
+        self.avl_tree.pop_min()
+
+        self.assertListEqual([operation for operation, _ in records], ['floor', 'pop_min'])
+        self.assertEqual(records[0][1]['nodes_visited'], 4)
+        self.assertGreater(records[1][1]['elapsed_ns'], 0)
+
+    def test_uninstrument(self) -> None:
+        stats = self.avl_tree.instrument()
+        self.avl_tree.search(node=AVLNode(value=41))
+
+        self.assertIs(self.avl_tree.uninstrument(), stats)
+        self.assertIs(type(self.avl_tree), AVLTree)
+        self.assertEqual(self.avl_tree.stats, None)
+        self.avl_tree.search(node=AVLNode(value=41))
+        self.assertEqual(stats.operations['search'].calls, 1)
+
+    def test_binary_search_tree(self) -> None:
+        bst = BinarySearchTree.create([2, 1, 3])
+        stats = bst.instrument(sample_every=2)
+        for value in (4, 5, 6):
+            bst.insert(node=BSTNode(value=value))
+
+        self.assertEqual(stats.operations['insert'].nodes_visited, 2 + 3 + 4)
+        self.assertDictEqual(stats.operations['insert'].depth_histogram, {3: 1})
+
+
+if __name__ == '__main__':
+    unittest.main()
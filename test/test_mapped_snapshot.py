@@ -0,0 +1,84 @@
+import os
+import tempfile
+import unittest
+
+from tree import ArrayAVLTree, AVLTree, MappedSnapshot
+
+
+class TestMappedSnapshot(unittest.TestCase):
+    def setUp(self) -> None:
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, 'keys.eytz')
+        self.other_path = os.path.join(directory.name, 'other.eytz')
+
+        AVLTree.create([41, 20, 65, 11, 29, 50, 91, 32, 72, 99]).export_snapshot(self.path)
+        self.snapshot = MappedSnapshot(self.path)
+        self.addCleanup(self.snapshot.close)
+
+    def test_iter(self) -> None:
+        self.assertListEqual(list(self.snapshot), [11, 20, 29, 32, 41, 50, 65, 72, 91, 99])
+        self.assertEqual(len(self.snapshot), 10)
+
+    def test_search(self) -> None:
+        self.assertEqual(self.snapshot.search(29), 29)
+        self.assertEqual(self.snapshot.search(30), None)
+        self.assertIn(99, self.snapshot)
+        self.assertNotIn(100, self.snapshot)
+
+    def test_find_min_and_max(self) -> None:
+        self.assertEqual(self.snapshot.find_min(), 11)
+        self.assertEqual(self.snapshot.find_max(), 99)
+
+    def test_floor_and_ceiling(self) -> None:
+        self.assertEqual(self.snapshot.floor(30), 29)
+        self.assertEqual(self.snapshot.floor(29), 29)
+        self.assertEqual(self.snapshot.floor(10), None)
+        self.assertEqual(self.snapshot.ceiling(30), 32)
+        self.assertEqual(self.snapshot.ceiling(100), None)
+
+    def test_successor_and_predecessor(self) -> None:
+        self.assertEqual(self.snapshot.successor(41), 50)
+        self.assertEqual(self.snapshot.successor(99), None)
+        self.assertEqual(self.snapshot.predecessor(41), 32)
+        self.assertEqual(self.snapshot.predecessor(11), None)
+
+    def test_rank(self) -> None:
+        self.assertEqual(self.snapshot.rank(11), 1)
+        self.assertEqual(self.snapshot.rank(65), 7)
+        self.assertEqual(self.snapshot.rank(13), None)
+        self.assertEqual(self.snapshot.count_range(20, 65), 6)
+
+    def test_empty(self) -> None:
+        AVLTree().export_snapshot(self.other_path)
+        with MappedSnapshot(self.other_path) as snapshot:
+            self.assertEqual(len(snapshot), 0)
+            self.assertEqual(snapshot.find_min(), None)
+            self.assertEqual(snapshot.ceiling(1), None)
+
+    def test_array_avl_tree(self) -> None:
+        ArrayAVLTree.create(range(0, 2000, 2)).export_snapshot(self.other_path)
+        with MappedSnapshot(self.other_path) as snapshot:
+            self.assertEqual(snapshot.rank(1000), 501)
+            self.assertEqual(snapshot.floor(1001), 1000)
+            self.assertListEqual(list(snapshot), list(range(0, 2000, 2)))
+
+    def test_floats(self) -> None:
+        MappedSnapshot.write(self.other_path, [0.5, 1.5, 2.5], typecode='d')
+        with MappedSnapshot(self.other_path) as snapshot:
+            self.assertEqual(snapshot.typecode, 'd')
+            self.assertEqual(snapshot.ceiling(1.0), 1.5)
+
+    def test_unsorted(self) -> None:
+        with self.assertRaises(ValueError):
+            MappedSnapshot.write(self.other_path, [2, 1])
+
+    def test_bad_file(self) -> None:
+        with open(self.other_path, 'wb') as file:
+            file.write(b'\0' * 64)
+        with self.assertRaises(ValueError):
+            MappedSnapshot(self.other_path)
+
+
+if __name__ == '__main__':
+    unittest.main()
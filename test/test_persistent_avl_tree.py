@@ -0,0 +1,69 @@
+import unittest
+
+from tree import PersistentAVLTree
+
+
+class TestPersistentAVLTree(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tree = PersistentAVLTree.create([41, 20, 65, 11, 29, 50, 91, 32, 72, 99])
+
+    def test_queries(self) -> None:
+        self.assertEqual(len(self.tree), 10)
+        self.assertIn(41, self.tree)
+        self.assertEqual(self.tree.search(30), None)
+        self.assertEqual(self.tree.find_min(), 11)
+        self.assertEqual(self.tree.find_max(), 99)
+        self.assertEqual(self.tree.floor(30), 29)
+        self.assertEqual(self.tree.ceiling(30), 32)
+        self.assertEqual(self.tree.lower(29), 20)
+        self.assertEqual(self.tree.higher(99), None)
+        self.assertEqual(self.tree.rank(65), 7)
+        self.assertEqual(self.tree.select(5), 41)
+        self.assertListEqual(list(reversed(self.tree))[:2], [99, 91])
+
+    def test_insert_returns_new_version(self) -> None:
+        tree = self.tree.insert(30)
+
+        self.assertListEqual(tree.inorder_traversal(), [11, 20, 29, 30, 32, 41, 50, 65, 72, 91, 99])
+        self.assertListEqual(self.tree.inorder_traversal(), [11, 20, 29, 32, 41, 50, 65, 72, 91, 99])
+        tree.check_invariants()
+        self.tree.check_invariants()
+        with self.assertRaises(ValueError):
+            tree.insert(30)
+
+    def test_remove_returns_new_version(self) -> None:
+        tree = self.tree.remove(41).remove(11)
+
+        self.assertListEqual(tree.inorder_traversal(), [20, 29, 32, 50, 65, 72, 91, 99])
+        self.assertEqual(len(self.tree), 10)
+        tree.check_invariants()
+        with self.assertRaises(ValueError):
+            tree.remove(41)
+
+    def test_structural_sharing(self) -> None:
+        tree = self.tree.insert(100)
+
+        self.assertIsNot(tree.root, self.tree.root)
+        self.assertIs(tree.root.left, self.tree.root.left)
+
+    def test_versions(self) -> None:
+        versions = [PersistentAVLTree()]
+        for value in range(100):
+            versions.append(versions[-1].insert(value))
+        for value in range(0, 100, 2):
+            versions.append(versions[-1].remove(value))
+
+        self.assertListEqual(versions[50].inorder_traversal(), list(range(50)))
+        self.assertListEqual(versions[-1].inorder_traversal(), list(range(1, 100, 2)))
+        self.assertEqual(versions[100].height, 6)
+        for tree in versions[::10]:
+            tree.check_invariants()
+
+    def test_from_sorted(self) -> None:
+        self.assertEqual(PersistentAVLTree.from_sorted(range(7)).root.value, 3)
+        with self.assertRaises(ValueError):
+            PersistentAVLTree.from_sorted([2, 1])
+
+
+if __name__ == '__main__':
+    unittest.main()
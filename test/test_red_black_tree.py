@@ -0,0 +1,75 @@
+import pickle
+import random
+import unittest
+
+from tree import RBNode, RedBlackTree
+
+
+class TestRedBlackTree(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tree = RedBlackTree()
+        for value in range(1, 11):
+            self.tree.insert(node=RBNode(value=value))
+
+    def _red(self, tree: RedBlackTree) -> list:
+        return [value for value in tree.iter_preorder() if tree.get(value).is_red]
+
+    def test_insert(self) -> None:
+        self.assertListEqual(self.tree.preorder_traversal(), [4, 2, 1, 3, 6, 5, 8, 7, 9, 10])
+        self.assertListEqual(self._red(self.tree), [8, 10])
+        self.tree.check_invariants()
+        with self.assertRaises(ValueError):
+            self.tree.insert(node=RBNode(value=5))
+
+    def test_remove(self) -> None:
+        self.tree.remove(node=RBNode(value=4))
+
+        self.assertListEqual(self.tree.preorder_traversal(), [5, 2, 1, 3, 8, 6, 7, 9, 10])
+        self.assertListEqual(self._red(self.tree), [7, 10])
+        self.tree.check_invariants()
+        with self.assertRaises(ValueError):
+            self.tree.remove(node=RBNode(value=4))
+
+    def test_queries(self) -> None:
+        self.assertEqual(len(self.tree), 10)
+        self.assertEqual(self.tree.successor(node=self.tree.root).value, 5)
+        self.assertEqual(self.tree.predecessor(node=self.tree.root).value, 3)
+        self.assertEqual(self.tree.rank(node=RBNode(value=7)), 7)
+        self.assertEqual(self.tree.select(3).value, 3)
+        self.assertListEqual(list(self.tree.range(3, 6)), [3, 4, 5, 6])
+
+    def test_random_updates(self) -> None:
+        rng = random.Random(0)
+        tree = RedBlackTree()
+        values = set()
+        for _ in range(2000):
+            value = rng.randrange(500)
+            if value in values:
+                tree.remove(node=RBNode(value=value))
+                values.discard(value)
+            else:
+                tree.insert(node=RBNode(value=value))
+                values.add(value)
+        tree.check_invariants()
+        self.assertListEqual(tree.inorder_traversal(), sorted(values))
+
+    def test_from_sorted(self) -> None:
+        tree = RedBlackTree.from_sorted(range(10))
+
+        self.assertListEqual(self._red(tree), [0, 3, 6])
+        tree.check_invariants()
+        tree.insert_many(range(5, 100))
+        tree.check_invariants()
+        self.assertEqual(len(tree), 100)
+
+    def test_check_invariants(self) -> None:
+        self.tree.root.right._red = True
+        with self.assertRaises(AssertionError):
+            self.tree.check_invariants()
+
+    def test_pickle(self) -> None:
+        tree = pickle.loads(pickle.dumps(self.tree))
+
+        self.assertIsInstance(tree, RedBlackTree)
+        self.assertListEqual(tree.inorder_traversal(), list(range(1, 11)))
+        tree.check_invariants()
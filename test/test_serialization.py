@@ -0,0 +1,38 @@
+import io
+import unittest
+
+from tree import AVLTree, BinarySearchTree
+
+
+class TestSerialization(unittest.TestCase):
+    def test_key_kinds(self) -> None:
+        for values in ([3, -2 ** 63, 2 ** 63 - 1], [0.5, -1.5], [2 ** 64, 1], ['b', 'a'], [True, False]):
+            with self.subTest(values=values):
+                avl_tree = AVLTree.loads(AVLTree.create(values).dumps())
+                self.assertListEqual(avl_tree.inorder_traversal(), sorted(values))
+                self.assertListEqual([type(value) for value in avl_tree], [type(value) for value in sorted(values)])
+
+    def test_packed_size(self) -> None:
+        data = AVLTree.create(range(1000)).dumps()
+        self.assertEqual(len(data), 14 + 250 + 8 * 1000)
+
+    def test_empty(self) -> None:
+        self.assertEqual(BinarySearchTree.loads(BinarySearchTree().dumps()).root, None)
+
+    def test_bad_magic(self) -> None:
+        with self.assertRaises(ValueError):
+            AVLTree.loads(b'XXXX' + AVLTree.create(range(3)).dumps()[4:])
+
+    def test_truncated(self) -> None:
+        with self.assertRaises(ValueError):
+            AVLTree.loads(AVLTree.create(range(10)).dumps()[:-1])
+
+    def test_corrupt_shape(self) -> None:
+        data = bytearray(AVLTree.create(range(10)).dumps())
+        data[14] = 0
+        with self.assertRaises(ValueError):
+            AVLTree.load(io.BytesIO(bytes(data)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+import unittest
+
+from tree import AVLTree
+from tree.sorted_snapshot import SortedSnapshot, numpy
+
+
+@unittest.skipUnless(numpy, 'NumPy is not installed')
+class TestVectorizedSnapshot(unittest.TestCase):
+    def setUp(self) -> None:
+        self.snapshot = AVLTree.create([41, 20, 65, 11, 29, 50, 91, 32, 72, 99]).snapshot()
+
+    def assertArrayEqual(self, result: 'numpy.ndarray', expected: list, dtype: type) -> None:
+        self.assertIsInstance(result, numpy.ndarray)
+        self.assertEqual(result.dtype.kind, numpy.dtype(dtype).kind)
+        self.assertListEqual(result.tolist(), expected)
+
+    def test_values(self) -> None:
+        self.assertIsInstance(self.snapshot.values, numpy.ndarray)
+        self.assertEqual(len(self.snapshot), 10)
+
+    def test_search_many(self) -> None:
+        self.assertArrayEqual(self.snapshot.search_many([11, 13, 99, 100, 0]),
+                              [True, False, True, False, False], bool)
+        self.assertArrayEqual(self.snapshot.search_many([]), [], bool)
+
+    def test_rank_many(self) -> None:
+        self.assertArrayEqual(self.snapshot.rank_many([11, 13, 99, 100, 0]), [1, 0, 10, 0, 0], int)
+
+    def test_count_range_many(self) -> None:
+        self.assertArrayEqual(self.snapshot.count_range_many([20, 30, 50, 100, 0], [65, 90, 40, 200, 10]),
+                              [6, 5, 0, 0, 0], int)
+
+    def test_empty_tree(self) -> None:
+        snapshot = AVLTree().snapshot()
+        self.assertArrayEqual(snapshot.search_many([1, 2]), [False, False], bool)
+        self.assertArrayEqual(snapshot.rank_many([1, 2]), [0, 0], int)
+        self.assertArrayEqual(snapshot.count_range_many([1], [2]), [0], int)
+
+    def test_strings(self) -> None:
+        snapshot = SortedSnapshot(['a', 'c', 'e'])
+        self.assertArrayEqual(snapshot.search_many(['c', 'd']), [True, False], bool)
+        self.assertArrayEqual(snapshot.rank_many(['e', 'b']), [3, 0], int)
+
+
+class TestListSnapshot(unittest.TestCase):
+    """Values NumPy cannot lay out in a flat array take the `bisect` path."""
+
+    def setUp(self) -> None:
+        self.snapshot = SortedSnapshot([(1, 'a'), (1, 'b'), (2, 'a')])
+
+    def test_values(self) -> None:
+        self.assertIsInstance(self.snapshot.values, list)
+
+    def test_queries(self) -> None:
+        self.assertListEqual(self.snapshot.search_many([(1, 'b'), (1, 'c')]), [True, False])
+        self.assertListEqual(self.snapshot.rank_many([(2, 'a'), (0, 'a')]), [3, 0])
+        self.assertListEqual(self.snapshot.count_range_many([(1, 'b')], [(2, 'a')]), [2])
+
+    def test_empty(self) -> None:
+        snapshot = SortedSnapshot([])
+        self.assertListEqual(list(snapshot.search_many([1])), [False])
+        self.assertListEqual(list(snapshot.rank_many([1])), [0])
+        self.assertListEqual(list(snapshot.count_range_many([1], [2])), [0])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+import unittest
+
+from tree import BSTNode, SplayTree
+
+
+class TestSplayTree(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tree = SplayTree()
+        for value in (41, 20, 65, 11, 29, 50, 91, 32, 72, 99):
+            self.tree.insert(node=BSTNode(value=value))
+
+    def test_insert_splays_the_new_node(self) -> None:
+        self.assertEqual(self.tree.root.value, 99)
+        self.tree.insert(node=BSTNode(value=30))
+
+        self.assertEqual(self.tree.root.value, 30)
+        self.assertListEqual(self.tree.inorder_traversal(), [11, 20, 29, 30, 32, 41, 50, 65, 72, 91, 99])
+        self.tree.check_invariants()
+        with self.assertRaises(ValueError):
+            self.tree.insert(node=BSTNode(value=41))
+
+    def test_search_splays(self) -> None:
+        node = self.tree.search(node=BSTNode(value=11))
+
+        self.assertIs(self.tree.root, node)
+        self.assertIn(50, self.tree)
+        self.assertEqual(self.tree.root.value, 50)
+        self.tree.check_invariants()
+
+    def test_miss_splays_the_last_node_visited(self) -> None:
+        self.assertEqual(self.tree.get(31), None)
+        self.assertIn(self.tree.root.value, (29, 32))
+        self.tree.check_invariants()
+
+    def test_zig_zig_halves_the_depth(self) -> None:
+        tree = SplayTree()
+        for value in range(1, 8):
+            tree.insert(node=BSTNode(value=value))
+        self.assertListEqual(tree.preorder_traversal(), [7, 6, 5, 4, 3, 2, 1])
+
+        tree.get(1)
+
+        self.assertListEqual(tree.preorder_traversal(), [1, 6, 4, 2, 3, 5, 7])
+        tree.check_invariants()
+
+    def test_remove(self) -> None:
+        self.tree.remove(node=BSTNode(value=41))
+        self.tree.remove(node=BSTNode(value=11))
+
+        self.assertListEqual(self.tree.inorder_traversal(), [20, 29, 32, 50, 65, 72, 91, 99])
+        self.tree.check_invariants()
+        with self.assertRaises(ValueError):
+            self.tree.remove(node=BSTNode(value=41))
+
+    def test_queries(self) -> None:
+        self.assertEqual(self.tree.floor(31).value, 29)
+        self.assertEqual(self.tree.ceiling(31).value, 32)
+        self.assertEqual(self.tree.rank(node=BSTNode(value=65)), 7)
+        self.assertEqual(self.tree.select(2).value, 20)
+        self.assertListEqual(list(self.tree.range(30, 70)), [32, 41, 50, 65])
+
+    def test_instrumented_rotations(self) -> None:
+        stats = self.tree.instrument()
+        self.tree.get(11)
+
+        self.assertGreater(stats.operations['get'].rotations, 0)
+        self.assertEqual(self.tree.root.value, 11)
+        self.tree.uninstrument()
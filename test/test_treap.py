@@ -0,0 +1,82 @@
+import pickle
+import random
+import unittest
+
+from tree import Treap, TreapNode
+
+
+class TestTreap(unittest.TestCase):
+    def setUp(self) -> None:
+        random.seed(0)
+        self.tree = Treap()
+        for value in range(1, 11):
+            self.tree.insert(node=TreapNode(value=value))
+
+    def test_insert(self) -> None:
+        self.assertListEqual(self.tree.inorder_traversal(), list(range(1, 11)))
+        priorities = [self.tree.get(value).priority for value in range(1, 11)]
+        self.assertEqual(self.tree.root.priority, max(priorities))
+        self.tree.check_invariants()
+        with self.assertRaises(ValueError):
+            self.tree.insert(node=TreapNode(value=5))
+
+    def test_remove(self) -> None:
+        root = self.tree.root.value
+        self.tree.remove(node=TreapNode(value=root))
+
+        self.assertNotIn(root, self.tree)
+        self.assertEqual(len(self.tree), 9)
+        self.tree.check_invariants()
+
+    def test_sorted_inserts_stay_shallow(self) -> None:
+        tree = Treap()
+        for value in range(1000):
+            tree.insert(node=TreapNode(value=value))
+
+        self.assertLess(max(map(self._depth, map(tree.get, range(1000)))), 40)
+        tree.check_invariants()
+
+    def test_random_updates(self) -> None:
+        rng = random.Random(0)
+        tree = Treap()
+        values = set()
+        for _ in range(2000):
+            value = rng.randrange(500)
+            if value in values:
+                tree.remove(node=TreapNode(value=value))
+                values.discard(value)
+            else:
+                tree.insert(node=TreapNode(value=value))
+                values.add(value)
+        tree.check_invariants()
+        self.assertListEqual(tree.inorder_traversal(), sorted(values))
+
+    def test_from_sorted(self) -> None:
+        tree = Treap.from_sorted(range(100))
+
+        tree.check_invariants()
+        self.assertEqual(tree.root.value, 50)
+        tree.remove_many(range(0, 100, 2))
+        tree.check_invariants()
+        self.assertListEqual(tree.inorder_traversal(), list(range(1, 100, 2)))
+
+    def test_check_invariants(self) -> None:
+        child = self.tree.root.left or self.tree.root.right
+        child._priority = 2
+        with self.assertRaises(AssertionError):
+            self.tree.check_invariants()
+
+    @staticmethod
+    def _depth(node: TreapNode) -> int:
+        depth = 0
+        while node.parent is not None:
+            node = node.parent
+            depth += 1
+        return depth
+
+    def test_pickle(self) -> None:
+        tree = pickle.loads(pickle.dumps(self.tree))
+
+        self.assertIsInstance(tree, Treap)
+        self.assertListEqual(tree.preorder_traversal(), self.tree.preorder_traversal())
+        tree.check_invariants()
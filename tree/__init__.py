@@ -1,6 +1,22 @@
+from .array_avl_tree import ArrayAVLTree
+from .async_tree import AsyncAVLTree
+from .avl_map import AVLMap
 from .avl_tree import AVLTree
+from .block_tree import SortedBlockTree
 from .bst import BinarySearchTree
+from .cached_tree import CachedAVLTree
+from .concurrent_tree import ConcurrentAVLTree, RWLock
+from .cursor import TreeCursor
+from .mapped_snapshot import MappedSnapshot
+from .node.avl_map_node import AVLMapNode
 from .node.avl_node import AVLNode
 from .node.bst_node import BSTNode
+from .node.persistent_avl_node import PersistentAVLNode
+from .node.rb_node import RBNode
+from .node.treap_node import TreapNode
+from .persistent_avl_tree import PersistentAVLTree
+from .red_black_tree import RedBlackTree
+from .splay_tree import SplayTree
+from .treap import Treap
 
-__all__ = ['BinarySearchTree', 'AVLTree', 'BSTNode', 'AVLNode', ]
+__all__ = ['BinarySearchTree', 'AVLTree', 'RedBlackTree', 'Treap', 'SplayTree', 'ArrayAVLTree', 'SortedBlockTree', 'AVLMap', 'MappedSnapshot', 'TreeCursor', 'CachedAVLTree', 'ConcurrentAVLTree', 'RWLock', 'AsyncAVLTree', 'PersistentAVLTree', 'BSTNode', 'AVLNode', 'AVLMapNode', 'PersistentAVLNode', 'RBNode', 'TreapNode', ]
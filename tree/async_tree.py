@@ -0,0 +1,162 @@
+import asyncio
+from itertools import islice
+from typing import Any, AsyncIterator, Optional
+
+from .avl_tree import AVLTree
+from .bst import BinarySearchTree
+from .node import BSTNode
+
+_INSERT, _REMOVE = 'insert', 'remove'
+
+
+class AsyncAVLTree:
+    """An asyncio front of an AVL Tree (or any Binary Search Tree) shared by many
+    coroutines.
+
+    Writes are not applied on the spot. They are queued, and a background task
+    applies them in arrival order, up to `slice_size` at a time: runs of inserts
+    or removals go through `insert_many`/`remove_many`, which sort them first.
+    The task yields to the event loop after every slice, so a burst of writes
+    never blocks the loop for more than one slice. A write resolves once it is
+    applied, a coroutine that awaited its write reads it back.
+
+    Reads are single O(log N) descents and run right away. Scans hand out at
+    most `slice_size` values between two yields and then resume after the last
+    value they handed out, so they see the writes applied in between and are
+    never invalidated by them.
+    """
+
+    def __init__(self, tree: Optional[BinarySearchTree] = None, *, slice_size: int = 256):
+        assert tree is None or isinstance(tree, BinarySearchTree)
+        assert slice_size > 0
+        self._tree = AVLTree() if tree is None else tree
+        self._slice_size = slice_size
+        self._pending: list[tuple[str, Any, asyncio.Future]] = []
+        self._flush_task: Optional[asyncio.Task] = None
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}({self._tree.inorder_traversal()})'
+
+    @property
+    def tree(self) -> BinarySearchTree:
+        """The wrapped tree, without the writes still queued."""
+        return self._tree
+
+    def __len__(self) -> int:
+        return len(self._tree)
+
+    # ========== Query operations ==========
+
+    async def search(self, value: Any) -> Optional[BSTNode]:
+        return self._tree._find(value)
+
+    async def contains(self, value: Any) -> bool:
+        return value in self._tree
+
+    async def floor(self, value: Any) -> Optional[BSTNode]:
+        return self._tree.floor(value)
+
+    async def ceiling(self, value: Any) -> Optional[BSTNode]:
+        return self._tree.ceiling(value)
+
+    async def rank(self, value: Any) -> Optional[int]:
+        node = self._tree._find(value)
+        return None if node is None else self._tree.rank(node)
+
+    async def count_range(self, lo: Any, hi: Any) -> int:
+        return self._tree.count_range(lo, hi)
+
+    async def range(
+            self,
+            lo: Any = None,
+            hi: Any = None,
+            inclusive: tuple[bool, bool] = (True, True),
+    ) -> AsyncIterator[Any]:
+        """Yields the values between `lo` and `hi` in ascending order, a missing
+        bound meaning no bound. Every slice is one O(log N + slice_size) walk of
+        the tree as it is at that moment.
+        """
+        tree = self._tree
+        low_inclusive, high_inclusive = inclusive
+        while True:
+            if lo is None:
+                node = tree.find_min()
+                if node is None:
+                    return
+                lo, low_inclusive = node._value, True
+            if hi is None:
+                node = tree.find_max()
+                bound, bound_inclusive = (lo, False) if node is None else (node._value, True)
+            else:
+                bound, bound_inclusive = hi, high_inclusive
+
+            values = list(islice(tree.range(lo, bound, (low_inclusive, bound_inclusive)),
+                                 self._slice_size))
+            for value in values:
+                yield value
+            if len(values) < self._slice_size:
+                return
+            lo, low_inclusive = values[-1], False
+            await asyncio.sleep(0)
+
+    def __aiter__(self) -> AsyncIterator[Any]:
+        return self.range()
+
+    # ========== Update operations ==========
+
+    async def insert(self, value: Any) -> bool:
+        """Resolves once applied, to whether `value` was not in the tree yet."""
+        return await self._enqueue(_INSERT, value)
+
+    async def remove(self, value: Any) -> bool:
+        """Resolves once applied, to whether `value` was in the tree."""
+        return await self._enqueue(_REMOVE, value)
+
+    async def flush(self) -> None:
+        """Waits until every queued write is applied."""
+        while self._flush_task is not None:
+            await asyncio.shield(self._flush_task)
+
+    def _enqueue(self, operation: str, value: Any) -> asyncio.Future:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((operation, value, future))
+        if self._flush_task is None:
+            self._flush_task = loop.create_task(self._flush())
+        return future
+
+    async def _flush(self) -> None:
+        try:
+            while self._pending:
+                batch = self._pending[:self._slice_size]
+                del self._pending[:self._slice_size]
+                start = 0
+                while start < len(batch):
+                    operation = batch[start][0]
+                    stop = start + 1
+                    while stop < len(batch) and batch[stop][0] == operation:
+                        stop += 1
+                    self._apply(operation, batch[start:stop])
+                    start = stop
+                await asyncio.sleep(0)
+        finally:
+            self._flush_task = None
+
+    def _apply(self, operation: str, run: list[tuple[str, Any, asyncio.Future]]) -> None:
+        """Applies a run of writes of the same kind as one batch. A write whose
+        caller stopped waiting is still applied.
+        """
+        values = [value for _, value, _ in run]
+        try:
+            if operation == _INSERT:
+                results = self._tree.insert_many(values)
+            else:
+                results = self._tree.remove_many(values)
+        except Exception as error:
+            for _, _, future in run:
+                if not future.done():
+                    future.set_exception(error)
+            return
+        for (_, _, future), result in zip(run, results):
+            if not future.done():
+                future.set_result(result)
@@ -0,0 +1,150 @@
+from collections.abc import ItemsView, KeysView, MutableMapping, ValuesView
+from operator import attrgetter
+from typing import Any, Callable, Iterable, Iterator, Optional
+
+from .avl_tree import AVLTree
+from .node import AVLMapNode
+
+
+class AVLMap(MutableMapping):
+    """A sorted map on top of an AVL Tree.
+
+    Every node carries the key and the payload in slots of its own, so payloads
+    need no comparison-overloaded wrappers. With a `key` function the ordering
+    key is computed once when an entry is inserted and kept in the node, every
+    comparison on the way down is then between plain ordering keys. Two keys
+    with the same ordering key are the same map key.
+
+    Iteration runs in key order. `keys()`, `values()` and `items()` are views
+    that walk the tree lazily.
+    """
+
+    def __init__(self, items: Any = (), *, key: Optional[Callable[[Any], Any]] = None, **kwargs: Any):
+        self._tree = AVLTree()
+        self._key = key
+        self.update(items, **kwargs)
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}({{{", ".join(f"{k!r}: {v!r}" for k, v in self.items())}}})'
+
+    @property
+    def tree(self) -> AVLTree:
+        return self._tree
+
+    def _sort_key(self, key: Any) -> Any:
+        return key if self._key is None else self._key(key)
+
+    def _node(self, key: Any) -> Optional[AVLMapNode]:
+        return self._tree._find(self._sort_key(key))
+
+    def __len__(self) -> int:
+        return len(self._tree)
+
+    def __contains__(self, key: Any) -> bool:
+        return self._node(key) is not None
+
+    def __getitem__(self, key: Any) -> Any:
+        """Runs in O(log N)."""
+        node = self._node(key)
+        if node is None:
+            raise KeyError(key)
+        return node._payload
+
+    def __setitem__(self, key: Any, payload: Any) -> None:
+        """Runs in O(log N), a single descent both finds an existing entry and
+        links a new one.
+        """
+        tree = self._tree
+        value = self._sort_key(key)
+        current = tree._root
+        if current is None:
+            tree._version += 1
+            tree._root = AVLMapNode(value, key=key, payload=payload)
+            return
+
+        while True:
+            current_value = current._value
+            if current_value > value:
+                if current._left is None:
+                    node = current._left = AVLMapNode(value, key=key, payload=payload)
+                    break
+                current = current._left
+            elif current_value < value:
+                if current._right is None:
+                    node = current._right = AVLMapNode(value, key=key, payload=payload)
+                    break
+                current = current._right
+            else:
+                current._key = key
+                current._payload = payload
+                return
+        tree._version += 1
+        node._parent = current
+        tree._retrace_insert(current)
+
+    def __delitem__(self, key: Any) -> None:
+        """Runs in O(log N)."""
+        node = self._node(key)
+        if node is None:
+            raise KeyError(key)
+        self._tree._retrace(self._tree._unlink(node))
+
+    def __iter__(self) -> Iterator[Any]:
+        return map(attrgetter('_key'), self._tree._iter_inorder_nodes())
+
+    def __reversed__(self) -> Iterator[Any]:
+        return map(attrgetter('_key'), self._tree._iter_reversed_nodes())
+
+    def keys(self) -> KeysView:
+        return KeysView(self)
+
+    def values(self) -> ValuesView:
+        return _AVLMapValuesView(self)
+
+    def items(self) -> ItemsView:
+        return _AVLMapItemsView(self)
+
+    def clear(self) -> None:
+        """O(1), drops the whole tree at once instead of popping entry by entry."""
+        self._tree = AVLTree()
+
+    def popitem(self) -> tuple[Any, Any]:
+        """O(log N), removes and returns the entry with the smallest key."""
+        node = self._tree.pop_min()
+        if node is None:
+            raise KeyError('popitem(): map is empty')
+        return node._key, node._payload
+
+    def check_invariants(self) -> None:
+        self._tree.check_invariants()
+
+    def __reduce__(self) -> tuple[Callable, tuple]:
+        """Pickles the entries as a flat sorted list, rebuilt in O(N) on load."""
+        return self.__class__._from_sorted_items, (list(self.items()), self._key)
+
+    @classmethod
+    def _from_sorted_items(
+            cls, items: list[tuple[Any, Any]], key: Optional[Callable[[Any], Any]]
+    ) -> 'AVLMap':
+        avl_map = cls(key=key)
+        sort_key = avl_map._sort_key
+        nodes = [AVLMapNode(sort_key(k), key=k, payload=payload) for k, payload in items]
+        avl_map._tree = AVLTree(root=AVLTree._link_balanced(nodes))
+        return avl_map
+
+    @classmethod
+    def fromkeys(cls, keys: Iterable[Any], payload: Any = None) -> 'AVLMap':
+        avl_map = cls()
+        for key in keys:
+            avl_map[key] = payload
+        return avl_map
+
+
+class _AVLMapValuesView(ValuesView):
+    def __iter__(self) -> Iterator[Any]:
+        return map(attrgetter('_payload'), self._mapping._tree._iter_inorder_nodes())
+
+
+class _AVLMapItemsView(ItemsView):
+    def __iter__(self) -> Iterator[tuple[Any, Any]]:
+        return map(attrgetter('_key', '_payload'), self._mapping._tree._iter_inorder_nodes())
@@ -1,4 +1,4 @@
-from typing import Any, Optional
+from typing import Any, Callable, Iterable, Optional
 
 from .bst import BinarySearchTree
 from .node import AVLNode
@@ -15,16 +15,17 @@ class AVLTree(BinarySearchTree):
     A vertex v is said to be height-balanced if |v.left.height - v.right.height| ≤ 1.
     """
 
-    def __init__(self, root: AVLNode):
-        assert isinstance(root, AVLNode)
+    node_class = AVLNode
+
+    def __init__(self, root: Optional[AVLNode] = None):
         super().__init__(root=root)
 
     @property
     def height(self) -> int:
         """The lower bound height h > log2 N."""
-        if not self._root:
+        if self._root is None:
             return -1
-        return self._root.height
+        return self._root._height
 
     @property
     def is_balanced(self) -> bool:
@@ -33,74 +34,385 @@ class AVLTree(BinarySearchTree):
 
         That will never change.
         """
-        return self._root.is_balanced
+        return self._root is None or self._root.is_balanced
+
+    def _check_node(self, node: AVLNode) -> None:
+        super()._check_node(node)
+        left, right = node._left, node._right
+        left_height = -1 if left is None else left._height
+        right_height = -1 if right is None else right._height
+        if node._height != max(left_height, right_height) + 1:
+            raise AssertionError(f'{node} has a stale height {node._height}')
+        if abs(left_height - right_height) > 1:
+            raise AssertionError(f'{node} is not height-balanced')
+
+    @classmethod
+    def _rebalance(cls, node: AVLNode) -> AVLNode:
+        """O(1), refreshes `node` and rotates it back into balance if needed. Returns
+        the new root of the subtree.
+        """
+        node.update()
+        balance = node.balance_factor
+        if balance > 1:
+            if node._left.balance_factor < 0:
+                cls._rotate_left(node._left)
+            return cls._rotate_right(node)
+        if balance < -1:
+            if node._right.balance_factor > 0:
+                cls._rotate_right(node._right)
+            return cls._rotate_left(node)
+        return node
 
-    def rotate_right(self, node: AVLNode) -> None:
-        """O(1)."""
+    def insert(self, node: AVLNode, start: Optional[AVLNode] = None) -> None:
+        """May change the height of the AVL Tree."""
         assert isinstance(node, AVLNode)
-        assert node.left
+        assert start is None or isinstance(start, AVLNode)
+        super().insert(node=node, start=start)
+
+    def _retrace_insert(self, node: AVLNode) -> int:
+        """Runs in O(log N). Heights are recomputed bottom-up only until a subtree
+        keeps its height, since nothing above it can change then. An insertion
+        needs at most one (single or double) rotation, which restores the height
+        the subtree had before. Above the stop only the subtree sizes grow by one.
+
+        Every child height is read once, straight from the slots. Returns the
+        number of nodes whose height was recomputed.
+        """
+        refreshed = 0
+        while node is not None:
+            left, right = node._left, node._right
+            left_height = -1 if left is None else left._height
+            right_height = -1 if right is None else right._height
+            refreshed += 1
 
-        w = node.left
-        if node is self.root:
-            self._root = w
+            if left_height - right_height == 2:
+                if left._left is None or (left._right is not None
+                                          and left._right._height > left._left._height):
+                    self.rotate_left_right(node=node)
+                else:
+                    self.rotate_right(node=node)
+                node = node._parent._parent
+                break
+            if right_height - left_height == 2:
+                if right._right is None or (right._left is not None
+                                            and right._left._height > right._right._height):
+                    self.rotate_right_left(node=node)
+                else:
+                    self.rotate_left(node=node)
+                node = node._parent._parent
+                break
 
-        w.parent = node.parent
-        node.parent = w
-        node.left = w.right
-        if w.right:
-            w.right.parent = node
-        w.right = node
+            node._size += 1
+            height = max(left_height, right_height) + 1
+            if height == node._height:
+                node = node._parent
+                break
+            node._height = height
+            node = node._parent
 
-        w.update_height()
-        node.update_height()
+        while node is not None:
+            node._size += 1
+            node = node._parent
+        return refreshed
 
-    def rotate_left(self, node: AVLNode) -> None:
-        """O(1)."""
+    def remove(self, node: AVLNode) -> None:
+        """May change the height h of the AVL Tree. Runs in O(log N), only the path
+        above the spliced out node is rebalanced.
+        """
         assert isinstance(node, AVLNode)
-        assert node.right
+        super().remove(node=node)
 
-        w = node.right
-        if node is self.root:
-            self._root = w
+    def _retrace(self, node: Optional[AVLNode]) -> None:
+        """Runs in O(log N), rebalances the path from `node` up to the root after a
+        removal below it. Unlike an insertion, a removal may need a rotation at
+        every level, but the heights are recomputed only until a subtree keeps its
+        height; above that only the subtree sizes shrink by one.
+        """
+        while node is not None:
+            left, right = node._left, node._right
+            left_height = -1 if left is None else left._height
+            right_height = -1 if right is None else right._height
 
-        w.parent = node.parent
-        node.parent = w
-        node.right = w.left
-        if w.left:
-            w.left.parent = node
-        w.left = node
+            if left_height - right_height == 2:
+                height = node._height
+                left_left, left_right = left._left, left._right
+                if (-1 if left_left is None else left_left._height) < \
+                        (-1 if left_right is None else left_right._height):
+                    self.rotate_left_right(node=node)
+                else:
+                    self.rotate_right(node=node)
+                top = node._parent
+                node = top._parent
+                if top._height == height:
+                    break
+                continue
+            if right_height - left_height == 2:
+                height = node._height
+                right_left, right_right = right._left, right._right
+                if (-1 if right_right is None else right_right._height) < \
+                        (-1 if right_left is None else right_left._height):
+                    self.rotate_right_left(node=node)
+                else:
+                    self.rotate_left(node=node)
+                top = node._parent
+                node = top._parent
+                if top._height == height:
+                    break
+                continue
 
-        w.update_height()
-        node.update_height()
+            node._size -= 1
+            height = max(left_height, right_height) + 1
+            if height == node._height:
+                node = node._parent
+                break
+            node._height = height
+            node = node._parent
 
-    def insert(self, node: AVLNode, start: Optional[AVLNode] = None) -> None:
-        """May change the height of the AVL Tree."""
-        assert isinstance(node, AVLNode)
-        assert start is None or isinstance(start, AVLNode)
-        super().insert(node=node, start=start)
+        while node is not None:
+            node._size -= 1
+            node = node._parent
+
+    def delete_range(self, lo: Any, hi: Any, inclusive: tuple[bool, bool] = (True, True)) -> int:
+        """Runs in O(log N) regardless of how many values are removed: the tree is
+        split at both bounds and the outer parts are joined again. The removed
+        nodes stay linked among themselves as a detached subtree. Returns the
+        number of removed values.
+        """
+        return self._delete_range(lo, hi, inclusive, self._split)
+
+    def delete_range_counted(self, lo: Any, hi: Any, inclusive: tuple[bool, bool] = (True, True)) -> int:
+        return self._delete_range(lo, hi, inclusive, self._counting_split)
 
-        while node.parent:
-            if node.balance_factor == 2 and node.left.balance_factor == 1:
-                self.rotate_right(node=node)
-            elif node.balance_factor == 2 and node.left.balance_factor == -1:
-                self.rotate_left(node=node.left)
-                self.rotate_right(node=node)
-            elif node.balance_factor == -2 and node.right.balance_factor == -1:
-                self.rotate_left(node=node)
-            elif node.balance_factor == -2 and node.right.balance_factor == 1:
-                self.rotate_right(node=node.right)
-                self.rotate_left(node=node)
-            node = node.parent
-            self._root.update_height()
-
-    def remove(self, value: Any) -> None:
-        """May change the height h of the AVL Tree."""
-        raise NotImplemented
-        # update height
-
-    # @classmethod
-    # def create(
-    #         cls, *, empty: bool = False, random: bool = False, balanced: bool = True
-    # ) -> 'AVLTree':
-    #     assert balanced is True
-    #     return super(AVLTree, cls).create()
+    def _delete_range(self, lo: Any, hi: Any, inclusive: tuple[bool, bool], split: Callable) -> int:
+        low_inclusive, high_inclusive = inclusive
+        if self._root is None or hi < lo or (hi == lo and not (low_inclusive and high_inclusive)):
+            return 0
+        self._version += 1
+
+        left, found, rest = split(self._root, lo)
+        removed = 0
+        if found is not None:
+            if low_inclusive:
+                removed += 1
+            else:
+                left = self._join(left, found, None)
+        middle, found, right = split(rest, hi)
+        removed += 0 if middle is None else middle._size
+        if found is not None:
+            if high_inclusive:
+                removed += 1
+            else:
+                right = self._join(None, found, right)
+
+        self._root = self._join_trees(left, right)
+        return removed
+
+    # ========== Split, join and set algebra ==========
+    #
+    # These relink the nodes of their operands instead of copying them, which is
+    # what keeps them logarithmic. The operands are consumed and left empty.
+
+    def split(self, value: Any) -> tuple['AVLTree', Optional[AVLNode], 'AVLTree']:
+        """Runs in O(log N). Splits the tree into the trees of the values < `value`
+        and > `value`, and the node holding `value` (or None), detached.
+        """
+        left, found, right = self._split(self._take_root(), value)
+        return type(self)(root=left), found, type(self)(root=right)
+
+    @classmethod
+    def join(cls, left: 'AVLTree', pivot: AVLNode, right: 'AVLTree') -> 'AVLTree':
+        """Runs in O(|left.height - right.height| + 1). Every value of `left` has to
+        be smaller than the value of `pivot`, every value of `right` larger.
+        """
+        assert isinstance(left, AVLTree) and isinstance(right, AVLTree)
+        assert isinstance(pivot, AVLNode)
+        assert pivot._parent is None and pivot._left is None and pivot._right is None
+        assert left._root is None or left.find_max()._value < pivot._value
+        assert right._root is None or pivot._value < right.find_min()._value
+
+        return cls(root=cls._join(left._take_root(), pivot, right._take_root()))
+
+    def union(self, other: 'AVLTree') -> 'AVLTree':
+        """Runs in O(m log(n/m + 1)) for trees of sizes m <= n. Where both trees
+        hold a value, the node of this tree is kept.
+        """
+        assert isinstance(other, AVLTree)
+        return type(self)(root=self._union(self._take_root(), other._take_root()))
+
+    def intersection(self, other: 'AVLTree') -> 'AVLTree':
+        """Runs in O(m log(n/m + 1)) for trees of sizes m <= n. The nodes of this tree
+        are kept.
+        """
+        assert isinstance(other, AVLTree)
+        return type(self)(root=self._intersection(self._take_root(), other._take_root()))
+
+    def difference(self, other: 'AVLTree') -> 'AVLTree':
+        """Runs in O(m log(n/m + 1)) for trees of sizes m <= n, the values of this
+        tree that are not in `other`.
+        """
+        assert isinstance(other, AVLTree)
+        return type(self)(root=self._difference(self._take_root(), other._take_root()))
+
+    def _take_root(self) -> Optional[AVLNode]:
+        """O(1), empties the tree and hands over its root."""
+        root = self._root
+        self._root = None
+        self._version += 1
+        return root
+
+    @classmethod
+    def _union(cls, a: Optional[AVLNode], b: Optional[AVLNode]) -> Optional[AVLNode]:
+        if a is None:
+            return b
+        if b is None:
+            return a
+        left, right = cls._detach(a)
+        smaller, _, larger = cls._split(b, a._value)
+        return cls._join(cls._union(left, smaller), a, cls._union(right, larger))
+
+    @classmethod
+    def _intersection(cls, a: Optional[AVLNode], b: Optional[AVLNode]) -> Optional[AVLNode]:
+        if a is None or b is None:
+            return None
+        left, right = cls._detach(a)
+        smaller, found, larger = cls._split(b, a._value)
+        left, right = cls._intersection(left, smaller), cls._intersection(right, larger)
+        if found is None:
+            return cls._join_trees(left, right)
+        return cls._join(left, a, right)
+
+    @classmethod
+    def _difference(cls, a: Optional[AVLNode], b: Optional[AVLNode]) -> Optional[AVLNode]:
+        if a is None or b is None:
+            return a
+        left, right = cls._detach(b)
+        smaller, _, larger = cls._split(a, b._value)
+        return cls._join_trees(cls._difference(smaller, left), cls._difference(larger, right))
+
+    @classmethod
+    def _join(
+            cls, left: Optional[AVLNode], pivot: AVLNode, right: Optional[AVLNode]
+    ) -> AVLNode:
+        """Runs in O(|left.height - right.height| + 1). Joins two detached subtrees
+        with `left` < `pivot` < `right` into one AVL Tree and returns its root.
+
+        The shorter tree is hung, together with the pivot, off the spine of the
+        taller one where the heights meet, then only that spine is rebalanced.
+        """
+        left_height = -1 if left is None else left._height
+        right_height = -1 if right is None else right._height
+
+        if left_height > right_height + 1:
+            parent, current = None, left
+            while current is not None and current._height > right_height + 1:
+                parent, current = current, current._right
+            pivot.set_children(left=current, right=right)
+            parent._right = pivot
+            pivot._parent = parent
+        elif right_height > left_height + 1:
+            parent, current = None, right
+            while current is not None and current._height > left_height + 1:
+                parent, current = current, current._left
+            pivot.set_children(left=left, right=current)
+            parent._left = pivot
+            pivot._parent = parent
+        else:
+            pivot.set_children(left=left, right=right)
+            pivot._parent = None
+            return pivot
+
+        node = parent
+        while True:
+            node = cls._rebalance(node)
+            if node._parent is None:
+                return node
+            node = node._parent
+
+    @classmethod
+    def _join_trees(cls, left: Optional[AVLNode], right: Optional[AVLNode]) -> Optional[AVLNode]:
+        """O(log N), joins two detached subtrees with `left` < `right`, the smallest
+        node of `right` becoming the pivot.
+        """
+        if right is None:
+            return left
+        pivot, right = cls._split_min(right)
+        return cls._join(left, pivot, right)
+
+    @classmethod
+    def _split_min(cls, root: AVLNode) -> tuple[AVLNode, Optional[AVLNode]]:
+        """O(log N), detaches the smallest node of the subtree. Returns it together
+        with the root of what is left.
+        """
+        left, right = cls._detach(root)
+        if left is None:
+            return root, right
+        smallest, left = cls._split_min(left)
+        return smallest, cls._join(left, root, right)
+
+    @classmethod
+    def _split(
+            cls, root: Optional[AVLNode], value: Any
+    ) -> tuple[Optional[AVLNode], Optional[AVLNode], Optional[AVLNode]]:
+        """Runs in O(log N). Splits a detached subtree into the roots of the values
+        < `value` and > `value`, and the node holding `value` (or None), detached.
+
+        Every level joins the part it keeps with what the level below returned,
+        and the joins telescope to O(log N) in total.
+        """
+        if root is None:
+            return None, None, None
+        left, right = cls._detach(root)
+        if value == root._value:
+            root.update()
+            return left, root, right
+        if value < root._value:
+            smaller, found, larger = cls._split(left, value)
+            return smaller, found, cls._join(larger, root, right)
+        smaller, found, larger = cls._split(right, value)
+        return cls._join(left, root, smaller), found, larger
+
+    def _counting_split(
+            self, root: Optional[AVLNode], value: Any
+    ) -> tuple[Optional[AVLNode], Optional[AVLNode], Optional[AVLNode]]:
+        """`_split` of an instrumented tree, counting the node of every level."""
+        if root is None:
+            return None, None, None
+        left, right = self._detach(root)
+        if value == root._value:
+            self._stats.count(1, 1)
+            root.update()
+            return left, root, right
+        self._stats.count(1, 2)
+        if value < root._value:
+            smaller, found, larger = self._counting_split(left, value)
+            return smaller, found, self._join(larger, root, right)
+        smaller, found, larger = self._counting_split(right, value)
+        return self._join(left, root, smaller), found, larger
+
+    @staticmethod
+    def _detach(node: AVLNode) -> tuple[Optional[AVLNode], Optional[AVLNode]]:
+        """O(1), cuts `node` off its parent and its children, which are returned."""
+        left, right = node._left, node._right
+        node.replace(node=None)
+        # The augmented attributes are left stale, a join refreshes them anyway.
+        node._left = node._right = None
+        if left is not None:
+            left._parent = None
+        if right is not None:
+            right._parent = None
+        return left, right
+
+    @classmethod
+    def create(
+            cls,
+            values: Iterable[Any] = (),
+            *,
+            empty: bool = False,
+            random: bool = False,
+            balanced: bool = True,
+    ) -> 'AVLTree':
+        """Same as `BinarySearchTree.create`, but bulk-builds by default since the
+        tree ends up balanced either way.
+        """
+        return super(AVLTree, cls).create(
+            values, empty=empty, random=random, balanced=balanced)
@@ -0,0 +1,492 @@
+from bisect import bisect_left, bisect_right
+from os import PathLike
+from typing import Any, Iterable, Iterator, Optional, Union
+
+from .mapped_snapshot import MappedSnapshot
+
+
+class SortedBlockTree:
+    """An ordered set of keys kept in sorted blocks of a few hundred keys, a
+    two-level B+-tree: the root is the list of the largest key of every block,
+    the leaves are the blocks themselves, plain Python lists.
+
+    A lookup is one `bisect` over the root and one over a leaf, both over
+    contiguous arrays of pointers, instead of the ~log2 N dependent pointer
+    loads of a descent through `AVLNode`s. The leaves are kept in key order, so
+    traversals and range scans walk them one after another.
+
+    A leaf is split in two once it holds more than 2 x `load` keys and merged
+    into a neighbour once it falls below `load` / 2. The positions needed by
+    `rank` and `select` come from a Fenwick tree over the leaf sizes, rebuilt
+    lazily after a split or a merge.
+
+    Keys are answered by value, where AVLTree returns nodes this tree returns keys.
+    There is no preorder or postorder, the shape is not a binary tree.
+    """
+
+    def __init__(self, load: int = 512):
+        assert isinstance(load, int) and load >= 4
+        self._load = load
+        self._blocks: list[list[Any]] = []
+        self._maxes: list[Any] = []
+        self._len = 0
+        # 1-based Fenwick tree over the block sizes, None while stale.
+        self._index: Optional[list[int]] = None
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}({self.inorder_traversal()})'
+
+    def __len__(self) -> int:
+        return self._len
+
+    @property
+    def load(self) -> int:
+        return self._load
+
+    @property
+    def height(self) -> int:
+        """The number of levels below the root, like the height of a binary tree."""
+        return -1 if not self._blocks else 0 if len(self._blocks) == 1 else 1
+
+    # ========== Positional index ==========
+
+    def _fenwick(self) -> list[int]:
+        index = self._index
+        if index is None:
+            index = [0]
+            index.extend(map(len, self._blocks))
+            size = len(index)
+            for i in range(1, size):
+                parent = i + (i & -i)
+                if parent < size:
+                    index[parent] += index[i]
+            self._index = index
+        return index
+
+    def _bump(self, block: int, delta: int) -> None:
+        index = self._index
+        if index is None:
+            return
+        i = block + 1
+        size = len(index)
+        while i < size:
+            index[i] += delta
+            i += i & -i
+
+    def _offset(self, block: int) -> int:
+        """O(log B), the number of keys in the blocks before `block`."""
+        index = self._fenwick()
+        count = 0
+        while block:
+            count += index[block]
+            block -= block & -block
+        return count
+
+    def _position(self, position: int) -> tuple[int, int]:
+        """O(log B), the block and the offset in it of the 0-based `position`."""
+        index = self._fenwick()
+        block = 0
+        step = 1 << (len(index) - 1).bit_length()
+        while step:
+            probe = block + step
+            if probe < len(index) and index[probe] <= position:
+                position -= index[probe]
+                block = probe
+            step >>= 1
+        return block, position
+
+    # ========== Query operations ==========
+
+    def __contains__(self, key: Any) -> bool:
+        return self.search(key) is not None
+
+    def search(self, key: Any) -> Optional[Any]:
+        """Runs in O(log N). The key if it is in the tree, None otherwise."""
+        i = bisect_left(self._maxes, key)
+        if i == len(self._maxes):
+            return None
+        block = self._blocks[i]
+        current = block[bisect_left(block, key)]
+        return current if current == key else None
+
+    def get(self, key: Any, default: Optional[Any] = None) -> Optional[Any]:
+        """Runs in O(log N). The key if it is in the tree, `default` otherwise."""
+        found = self.search(key)
+        return default if found is None else found
+
+    def find_min(self) -> Optional[Any]:
+        return self._blocks[0][0] if self._blocks else None
+
+    def find_max(self) -> Optional[Any]:
+        return self._maxes[-1] if self._maxes else None
+
+    def floor(self, key: Any) -> Optional[Any]:
+        """Runs in O(log N). The largest key <= `key`."""
+        maxes = self._maxes
+        i = bisect_left(maxes, key)
+        if i < len(maxes):
+            block = self._blocks[i]
+            j = bisect_right(block, key)
+            if j:
+                return block[j - 1]
+        return maxes[i - 1] if i else None
+
+    def ceiling(self, key: Any) -> Optional[Any]:
+        """Runs in O(log N). The smallest key >= `key`."""
+        i = bisect_left(self._maxes, key)
+        if i == len(self._maxes):
+            return None
+        block = self._blocks[i]
+        return block[bisect_left(block, key)]
+
+    def lower(self, key: Any) -> Optional[Any]:
+        """Runs in O(log N). The largest key < `key`."""
+        maxes = self._maxes
+        i = bisect_left(maxes, key)
+        if i < len(maxes):
+            block = self._blocks[i]
+            j = bisect_left(block, key)
+            if j:
+                return block[j - 1]
+        return maxes[i - 1] if i else None
+
+    def higher(self, key: Any) -> Optional[Any]:
+        """Runs in O(log N). The smallest key > `key`."""
+        i = bisect_right(self._maxes, key)
+        if i == len(self._maxes):
+            return None
+        block = self._blocks[i]
+        return block[bisect_right(block, key)]
+
+    def successor(self, key: Any) -> Optional[Any]:
+        """Same as `higher`."""
+        return self.higher(key)
+
+    def predecessor(self, key: Any) -> Optional[Any]:
+        """Same as `lower`."""
+        return self.lower(key)
+
+    def rank(self, key: Any) -> Optional[int]:
+        """Runs in O(log N). The 1-based position of `key`, None if it is absent."""
+        i = bisect_left(self._maxes, key)
+        if i == len(self._maxes):
+            return None
+        block = self._blocks[i]
+        j = bisect_left(block, key)
+        if block[j] != key:
+            return None
+        return self._offset(i) + j + 1
+
+    def select(self, rank: int) -> Optional[Any]:
+        """Runs in O(log N). The `rank`-th smallest key (1-based)."""
+        if not 1 <= rank <= self._len:
+            return None
+        i, j = self._position(rank - 1)
+        return self._blocks[i][j]
+
+    def _count_below(self, key: Any, inclusive: bool = False) -> int:
+        search = bisect_right if inclusive else bisect_left
+        i = search(self._maxes, key)
+        if i == len(self._maxes):
+            return self._len
+        return self._offset(i) + search(self._blocks[i], key)
+
+    def count_range(self, lo: Any, hi: Any, inclusive: tuple[bool, bool] = (True, True)) -> int:
+        """Runs in O(log N), counts the keys between `lo` and `hi`, each bound
+        included as told by `inclusive`.
+        """
+        if hi < lo:
+            return 0
+        return max(self._count_below(hi, inclusive=inclusive[1])
+                   - self._count_below(lo, inclusive=not inclusive[0]), 0)
+
+    def range(self, lo: Any, hi: Any, inclusive: tuple[bool, bool] = (True, True)) -> Iterator[Any]:
+        """Yields the keys between `lo` and `hi` in order, each bound included as
+        told by `inclusive`. O(log N) to the first key, then one sequential walk.
+        """
+        start = bisect_left if inclusive[0] else bisect_right
+        i = start(self._maxes, lo)
+        if i == len(self._maxes):
+            return
+        blocks = self._blocks
+        j = start(blocks[i], lo)
+        for k in range(i, len(blocks)):
+            for key in blocks[k][j:] if j else blocks[k]:
+                if hi < key or (key == hi and not inclusive[1]):
+                    return
+                yield key
+            j = 0
+
+    def median(self) -> Optional[Any]:
+        return self.select((self._len + 1) // 2)
+
+    def export_snapshot(self, path: Union[str, PathLike], typecode: str = 'q') -> None:
+        """Runs in O(N), writes the keys to a file that any number of processes can
+        open read-only as a `MappedSnapshot`.
+        """
+        MappedSnapshot.write(path, self.iter_inorder(), typecode=typecode)
+
+    def iter_inorder(self) -> Iterator[Any]:
+        for block in self._blocks:
+            yield from block
+
+    def iter_reversed(self) -> Iterator[Any]:
+        for block in reversed(self._blocks):
+            yield from reversed(block)
+
+    def __iter__(self) -> Iterator[Any]:
+        return self.iter_inorder()
+
+    def __reversed__(self) -> Iterator[Any]:
+        return self.iter_reversed()
+
+    def inorder_traversal(self) -> list[Any]:
+        return [key for block in self._blocks for key in block]
+
+    # ========== Update operations ==========
+
+    def insert(self, key: Any) -> None:
+        """Runs in O(log N + `load`), the keys after `key` in its block shift by one."""
+        if not self._insert(key):
+            raise ValueError(f'{key!r} already in tree')
+
+    def _insert(self, key: Any) -> bool:
+        """One lookup, returns whether `key` was inserted (False if present)."""
+        maxes = self._maxes
+        if not maxes:
+            self._blocks.append([key])
+            maxes.append(key)
+            self._len = 1
+            self._index = None
+            return True
+        i = bisect_left(maxes, key)
+        if i == len(maxes):
+            i -= 1
+            self._blocks[i].append(key)
+            maxes[i] = key
+        else:
+            block = self._blocks[i]
+            j = bisect_left(block, key)
+            if block[j] == key:
+                return False
+            block.insert(j, key)
+        self._len += 1
+        if len(self._blocks[i]) > 2 * self._load:
+            self._split(i)
+        else:
+            self._bump(i, 1)
+        return True
+
+    def remove(self, key: Any) -> None:
+        """Runs in O(log N + `load`)."""
+        if not self._remove(key):
+            raise ValueError(f'{key!r} not found')
+
+    def _remove(self, key: Any) -> bool:
+        """One lookup, returns whether `key` was removed (False if absent)."""
+        i = bisect_left(self._maxes, key)
+        if i < len(self._maxes):
+            block = self._blocks[i]
+            j = bisect_left(block, key)
+            if block[j] == key:
+                self._delete(i, j)
+                return True
+        return False
+
+    def pop_min(self) -> Optional[Any]:
+        if not self._blocks:
+            return None
+        key = self._blocks[0][0]
+        self._delete(0, 0)
+        return key
+
+    def pop_max(self) -> Optional[Any]:
+        if not self._blocks:
+            return None
+        i = len(self._blocks) - 1
+        key = self._maxes[i]
+        self._delete(i, len(self._blocks[i]) - 1)
+        return key
+
+    def delete_range(self, lo: Any, hi: Any, inclusive: tuple[bool, bool] = (True, True)) -> int:
+        """Removes the keys between `lo` and `hi`, each bound included as told by
+        `inclusive`. Runs in O(log N + B + `load`) for B touched blocks, the blocks
+        wholly inside the range are dropped at once. Returns the number of keys
+        removed.
+        """
+        if hi < lo:
+            return 0
+        maxes, blocks = self._maxes, self._blocks
+        start = bisect_left if inclusive[0] else bisect_right
+        stop = bisect_right if inclusive[1] else bisect_left
+        first, last = start(maxes, lo), stop(maxes, hi)
+        if first == len(maxes) or last < first:
+            return 0
+        begin = start(blocks[first], lo)
+        end = stop(blocks[last], hi) if last < len(blocks) else 0
+        if first == last:
+            if end <= begin:
+                return 0
+            removed = end - begin
+            del blocks[first][begin:end]
+        else:
+            removed = len(blocks[first]) - begin + end
+            removed += sum(map(len, blocks[first + 1:last]))
+            del blocks[first][begin:]
+            if last < len(blocks):
+                del blocks[last][:end]
+            del blocks[first + 1:last]
+            del maxes[first + 1:last]
+        self._len -= removed
+        self._index = None
+        # At most the two blocks at the bounds are left short or empty.
+        if first + 1 < len(blocks):
+            self._repair(first + 1)
+        self._repair(first)
+        return removed
+
+    def _split(self, i: int) -> None:
+        block = self._blocks[i]
+        half = len(block) // 2
+        self._blocks.insert(i + 1, block[half:])
+        del block[half:]
+        self._maxes.insert(i, block[-1])
+        self._index = None
+
+    def _delete(self, i: int, j: int) -> None:
+        block = self._blocks[i]
+        del block[j]
+        self._len -= 1
+        if len(block) < self._load // 2:
+            self._repair(i)
+        else:
+            if j == len(block):
+                self._maxes[i] = block[-1]
+            self._bump(i, -1)
+
+    def _repair(self, i: int) -> None:
+        """Refreshes the largest key of block `i` and merges it into a neighbour if it
+        fell below `load` / 2. An empty block is dropped.
+        """
+        blocks, maxes = self._blocks, self._maxes
+        if i >= len(blocks):
+            return
+        self._index = None
+        block = blocks[i]
+        if not block:
+            del blocks[i]
+            del maxes[i]
+            return
+        maxes[i] = block[-1]
+        if len(block) >= self._load // 2 or len(blocks) == 1:
+            return
+        if i + 1 == len(blocks):
+            i -= 1
+        blocks[i].extend(blocks[i + 1])
+        maxes[i] = maxes[i + 1]
+        del blocks[i + 1]
+        del maxes[i + 1]
+        if len(blocks[i]) > 2 * self._load:
+            self._split(i)
+
+    def insert_many(self, keys: Iterable[Any]) -> list[bool]:
+        """Returns, in the order of `keys`, whether each key was inserted. A batch
+        that outweighs the tree is merged into it and the blocks are cut again in
+        O(N + M log M).
+        """
+        keys = list(keys)
+        inserted = [False] * len(keys)
+        order = sorted(range(len(keys)), key=keys.__getitem__)
+        if len(keys) * max(1, self._len.bit_length()) < self._len:
+            for i in order:
+                inserted[i] = self._insert(keys[i])
+            return inserted
+
+        merged = []
+        existing = self.iter_inorder()
+        current = next(existing, None)
+        for i in order:
+            key = keys[i]
+            while current is not None and current < key:
+                merged.append(current)
+                current = next(existing, None)
+            if current is not None and current == key:
+                continue
+            if merged and merged[-1] == key:
+                continue
+            merged.append(key)
+            inserted[i] = True
+        if current is not None:
+            merged.append(current)
+            merged.extend(existing)
+        self._relink(merged)
+        return inserted
+
+    def remove_many(self, keys: Iterable[Any]) -> list[bool]:
+        """Returns, in the order of `keys`, whether each key was removed. One lookup
+        per key.
+        """
+        keys = list(keys)
+        removed = [False] * len(keys)
+        for i in sorted(range(len(keys)), key=keys.__getitem__):
+            removed[i] = self._remove(keys[i])
+        return removed
+
+    def _relink(self, keys: list[Any]) -> None:
+        # As many blocks as `load` keys each would need, evened out so that the
+        # last one is not left short.
+        count = -(-len(keys) // self._load)
+        self._blocks = [keys[i * len(keys) // count:(i + 1) * len(keys) // count]
+                        for i in range(count)]
+        self._maxes = [block[-1] for block in self._blocks]
+        self._len = len(keys)
+        self._index = None
+
+    @classmethod
+    def from_sorted(cls, keys: Iterable[Any], load: int = 512) -> 'SortedBlockTree':
+        """Runs in O(N), cuts strictly increasing `keys` into evenly filled blocks."""
+        keys = list(keys)
+        for i in range(1, len(keys)):
+            if not keys[i - 1] < keys[i]:
+                raise ValueError(f'{keys[i]!r} breaks the strictly increasing order')
+        tree = cls(load=load)
+        tree._relink(keys)
+        return tree
+
+    @classmethod
+    def create(cls, keys: Iterable[Any] = (), load: int = 512) -> 'SortedBlockTree':
+        """Runs in O(N log N), sorts and deduplicates `keys` first."""
+        ordered = []
+        for key in sorted(keys):
+            if not ordered or ordered[-1] != key:
+                ordered.append(key)
+        return cls.from_sorted(ordered, load=load)
+
+    def check_invariants(self) -> None:
+        """Runs in O(N), the debug pass over order, block sizes, the root keys and
+        the positional index.
+        """
+        blocks, maxes = self._blocks, self._maxes
+        if len(blocks) != len(maxes):
+            raise AssertionError(f'{len(blocks)} blocks under {len(maxes)} root keys')
+        previous = None
+        for i, block in enumerate(blocks):
+            if not block:
+                raise AssertionError(f'block {i} is empty')
+            if len(block) > 2 * self._load:
+                raise AssertionError(f'block {i} holds {len(block)} keys')
+            if len(blocks) > 1 and len(block) < self._load // 2:
+                raise AssertionError(f'block {i} holds only {len(block)} keys')
+            if maxes[i] != block[-1]:
+                raise AssertionError(f'block {i} ends in {block[-1]!r}, the root says {maxes[i]!r}')
+            for key in block:
+                if previous is not None and not previous < key:
+                    raise AssertionError(f'{previous!r} and {key!r} are out of order')
+                previous = key
+        if self._len != sum(map(len, blocks)):
+            raise AssertionError(f'length {self._len}, the blocks hold {sum(map(len, blocks))}')
+        if self._index is not None:
+            index = self._index
+            self._index = None
+            if index != self._fenwick():
+                raise AssertionError('the positional index is stale')
@@ -1,6 +1,15 @@
-from typing import Callable, Any, Optional
+from io import BytesIO
+from operator import attrgetter
+from os import PathLike
+from random import shuffle
+from typing import Callable, Any, BinaryIO, Iterable, Iterator, Optional, Sequence, Union
 
+from .mapped_snapshot import MappedSnapshot
+from .cursor import TreeCursor
+from .instrumentation import Callback, TreeStats, instrumented_class
 from .node import BSTNode
+from .serialization import read_nodes, write_nodes
+from .sorted_snapshot import SortedSnapshot
 
 
 class BinarySearchTree:
@@ -12,199 +21,1320 @@ class BinarySearchTree:
     Tree has height log2 N < h < N.
     """
 
-    def __init__(self, root: BSTNode):
-        assert isinstance(root, BSTNode)
+    node_class = BSTNode
+    # Whether queries restructure the tree, so that they cannot run side by side.
+    self_adjusting = False
+
+    def __init__(self, root: Optional[BSTNode] = None):
+        assert root is None or isinstance(root, self.node_class)
 
         self._root = root
+        # Bumped by every update that adds or removes a node, cached derived data
+        # such as the sorted snapshot is rebuilt lazily once it falls behind.
+        self._version = 0
+        self._snapshot: Optional[SortedSnapshot] = None
+        self._snapshot_version = -1
 
     def __repr__(self) -> str:
         return f'BST({self.inorder_traversal()})'
 
     @property
-    def root(self) -> BSTNode:
+    def root(self) -> Optional[BSTNode]:
         return self._root
 
+    def __len__(self) -> int:
+        return 0 if self._root is None else self._root.size
+
     @property
     def query_operations(self) -> tuple[Callable, ...]:
         return (self.search,
+                self.get,
+                self.floor,
+                self.ceiling,
+                self.lower,
+                self.higher,
                 self.successor,
                 self.predecessor,
                 self.inorder_traversal,
                 self.preorder_traversal,
                 self.postorder_traversal,
                 self.rank,
-                self.select,)
+                self.select,
+                self.range,
+                self.count_range,
+                self.median,
+                self.search_many,
+                self.rank_many,
+                self.count_range_many,)
 
     @property
     def update_operations(self) -> tuple[Callable, ...]:
         return (self.insert,
+                self.insert_many,
                 self.remove,
+                self.remove_many,
+                self.pop_min,
+                self.pop_max,
+                self.delete_range,
                 self.create,)
 
-    def find_max(self, start: BSTNode = None) -> BSTNode:
+    def find_max(self, start: BSTNode = None) -> Optional[BSTNode]:
         """Runs in O(h) where h is the height of the tree."""
         current = self._root if start is None else start
-        while current.right:
-            current = current.right
+        if current is None:
+            return None
+        while current._right is not None:
+            current = current._right
         return current
 
-    def find_min(self, start: BSTNode = None) -> BSTNode:
+    def find_min(self, start: BSTNode = None) -> Optional[BSTNode]:
         """Runs in O(h) where h is the height of the tree."""
         current = self._root if start is None else start
-        while current.left:
-            current = current.left
+        if current is None:
+            return None
+        while current._left is not None:
+            current = current._left
         return current
 
+    def check_invariants(self) -> None:
+        """Runs in O(N). The opt-in debug pass for everything the algorithms do not
+        validate on the way: node types, parent links, the BST property and the
+        augmented attributes. Raises AssertionError on the first violation, also
+        under `python -O`.
+        """
+        root = self._root
+        if root is not None and root._parent is not None:
+            raise AssertionError(f'root {root} has parent {root._parent}')
+        previous = None
+        for node in self._iter_inorder_nodes():
+            if not isinstance(node, self.node_class):
+                raise AssertionError(f'{node!r} is not a {self.node_class.__name__}')
+            for child in (node._left, node._right):
+                if child is not None and child._parent is not node:
+                    raise AssertionError(f'{child} does not point back to {node}')
+            if previous is not None and not previous._value < node._value:
+                raise AssertionError(f'{previous} and {node} are out of order')
+            self._check_node(node)
+            previous = node
+
+    def _check_node(self, node: BSTNode) -> None:
+        left, right = node._left, node._right
+        size = (0 if left is None else left._size) + (0 if right is None else right._size) + 1
+        if node._size != size:
+            raise AssertionError(f'{node} has size {node._size}, expected {size}')
+
     # ========== Query operations ==========
 
     def successor(self, node: BSTNode) -> Optional[BSTNode]:
         """Run in O(h) where h is the height of the tree."""
         assert isinstance(node, BSTNode)
 
-        if node.right:
-            return self.find_min(start=node.right)
+        if node._right is not None:
+            return self.find_min(start=node._right)
         else:
-            p = node.parent
+            p = node._parent
             t = node
-            while p and t == p.right:
+            while p is not None and t is p._right:
                 t = p
-                p = t.parent
-            return p if p else None
+                p = t._parent
+            return p
 
     def predecessor(self, node: BSTNode) -> Optional[BSTNode]:
         """Run in O(h) where h is the height of the tree."""
         assert isinstance(node, BSTNode)
 
-        if node.left:
-            return self.find_max(start=node.left)
+        if node._left is not None:
+            return self.find_max(start=node._left)
         else:
-            p = node.parent
+            p = node._parent
             t = node
-            while p and t == p.left:
+            while p is not None and t is p._left:
                 t = p
-                p = t.parent
-            return p if p else None
+                p = t._parent
+            return p
+
+    def cursor(self, value: Any = None) -> TreeCursor:
+        """A finger for stepping through neighbours and searching near the last
+        position, placed at the smallest value >= `value`, or before the start.
+        """
+        return TreeCursor(self, value)
 
     def search(self, node: BSTNode, start: BSTNode = None) -> Optional[BSTNode]:
         """Run in O(h) where h is the height of the tree."""
         assert isinstance(node, BSTNode)
         assert start is None or isinstance(start, BSTNode)
+        return self._find(node._value, start=start)
+
+    def _find(self, value: Any, start: Optional[BSTNode] = None) -> Optional[BSTNode]:
+        """Iterative descent, runs in O(h) without allocating anything."""
         current = self._root if start is None else start
+        while current is not None:
+            current_value = current._value
+            if current_value == value:
+                return current
+            current = current._right if current_value < value else current._left
+        return None
 
-        if current is None:
-            return None  # value not found
+    # ========== Key-based queries ==========
 
-        elif current.value == node.value:
-            return current
-        elif current.value < node.value:
-            if current.right:
-                return self.search(node=node, start=current.right)
-            return None
-        else:
-            if current.left:
-                return self.search(node=node, start=current.left)
-            return None
+    def __contains__(self, value: Any) -> bool:
+        return self._find(value) is not None
+
+    def get(self, value: Any, default: Optional[BSTNode] = None) -> Optional[BSTNode]:
+        """Runs in O(h). The node holding `value`, or `default`."""
+        node = self._find(value)
+        return default if node is None else node
+
+    def floor(self, value: Any) -> Optional[BSTNode]:
+        """Runs in O(h). The node holding the largest value <= `value`."""
+        current = self._root
+        candidate = None
+        while current is not None:
+            current_value = current._value
+            if current_value == value:
+                return current
+            if current_value < value:
+                candidate = current
+                current = current._right
+            else:
+                current = current._left
+        return candidate
+
+    def ceiling(self, value: Any) -> Optional[BSTNode]:
+        """Runs in O(h). The node holding the smallest value >= `value`."""
+        current = self._root
+        candidate = None
+        while current is not None:
+            current_value = current._value
+            if current_value == value:
+                return current
+            if current_value > value:
+                candidate = current
+                current = current._left
+            else:
+                current = current._right
+        return candidate
+
+    def lower(self, value: Any) -> Optional[BSTNode]:
+        """Runs in O(h). The node holding the largest value < `value`."""
+        current = self._root
+        candidate = None
+        while current is not None:
+            if current._value < value:
+                candidate = current
+                current = current._right
+            else:
+                current = current._left
+        return candidate
+
+    def higher(self, value: Any) -> Optional[BSTNode]:
+        """Runs in O(h). The node holding the smallest value > `value`."""
+        current = self._root
+        candidate = None
+        while current is not None:
+            if current._value > value:
+                candidate = current
+                current = current._left
+            else:
+                current = current._right
+        return candidate
+
+    def iter_inorder(self, start: Optional[BSTNode] = None) -> Iterator[Any]:
+        """Lazily yields the values in ascending order.
+
+        Runs in O(N) overall and holds only O(h) nodes on an explicit stack, so
+        degenerate trees do not hit the recursion limit.
+        """
+        assert start is None or isinstance(start, BSTNode)
+        return map(attrgetter('_value'), self._iter_inorder_nodes(start=start))
+
+    def _iter_inorder_nodes(self, start: Optional[BSTNode] = None) -> Iterator[BSTNode]:
+        current = self._root if start is None else start
+        stack = []
+        push, pop = stack.append, stack.pop
+        while stack or current is not None:
+            while current is not None:
+                push(current)
+                current = current._left
+            current = pop()
+            yield current
+            current = current._right
+
+    def iter_reversed(self, start: Optional[BSTNode] = None) -> Iterator[Any]:
+        """Lazily yields the values in descending order, O(h) extra memory."""
+        assert start is None or isinstance(start, BSTNode)
+        return map(attrgetter('_value'), self._iter_reversed_nodes(start=start))
+
+    def _iter_reversed_nodes(self, start: Optional[BSTNode] = None) -> Iterator[BSTNode]:
+        current = self._root if start is None else start
+        stack = []
+        push, pop = stack.append, stack.pop
+        while stack or current is not None:
+            while current is not None:
+                push(current)
+                current = current._right
+            current = pop()
+            yield current
+            current = current._left
+
+    def iter_preorder(self, start: Optional[BSTNode] = None) -> Iterator[Any]:
+        """Lazily yields the values in preorder, O(h) extra memory."""
+        assert start is None or isinstance(start, BSTNode)
+        return map(attrgetter('_value'), self._iter_preorder_nodes(start=start))
+
+    def _iter_preorder_nodes(self, start: Optional[BSTNode] = None) -> Iterator[BSTNode]:
+        current = self._root if start is None else start
+        stack = [current] if current is not None else []
+        push, pop = stack.append, stack.pop
+        while stack:
+            current = pop()
+            yield current
+            if current._right is not None:
+                push(current._right)
+            if current._left is not None:
+                push(current._left)
+
+    def iter_postorder(self, start: Optional[BSTNode] = None) -> Iterator[Any]:
+        """Lazily yields the values in postorder, O(h) extra memory."""
+        assert start is None or isinstance(start, BSTNode)
+        current = self._root if start is None else start
+        stack = []
+        push, pop = stack.append, stack.pop
+        last = None
+        while stack or current is not None:
+            while current is not None:
+                push(current)
+                current = current._left
+            right = stack[-1]._right
+            if right is not None and right is not last:
+                current = right
+            else:
+                last = pop()
+                yield last._value
+
+    def __iter__(self) -> Iterator[Any]:
+        return self.iter_inorder()
+
+    def __reversed__(self) -> Iterator[Any]:
+        return self.iter_reversed()
 
     def inorder_traversal(
             self, start: Optional[BSTNode] = None, traversal: list = None
     ) -> list[Any]:
         """Runs in O(N), regardless of the height of the tree."""
-        assert start is None or isinstance(start, BSTNode)
         if traversal is None:
             traversal = []
-        current = self._root if start is None else start
-
-        if current.left:
-            traversal = self.inorder_traversal(start=current.left, traversal=traversal)
-        traversal.append(current.value)
-        if current.right:
-            traversal = self.inorder_traversal(start=current.right, traversal=traversal)
+        traversal.extend(self.iter_inorder(start=start))
         return traversal
 
     def preorder_traversal(
             self, start: Optional[BSTNode] = None, traversal: list = None
     ) -> list[Any]:
         """Runs in O(N), regardless of the height of the tree."""
-        assert start is None or isinstance(start, BSTNode)
         if traversal is None:
             traversal = []
-        current = self._root if start is None else start
-
-        traversal.append(current.value)
-        if current.left:
-            traversal = self.preorder_traversal(start=current.left, traversal=traversal)
-        if current.right:
-            traversal = self.preorder_traversal(start=current.right, traversal=traversal)
+        traversal.extend(self.iter_preorder(start=start))
         return traversal
 
     def postorder_traversal(
             self, start: Optional[BSTNode] = None, traversal: list = None
     ) -> list[Any]:
         """Runs in O(N), regardless of the height of the tree."""
-        assert start is None or isinstance(start, BSTNode)
         if traversal is None:
             traversal = []
-        current = self._root if start is None else start
-
-        if current.left:
-            traversal = self.postorder_traversal(start=current.left, traversal=traversal)
-        if current.right:
-            traversal = self.postorder_traversal(start=current.right, traversal=traversal)
-        traversal.append(current.value)
+        traversal.extend(self.iter_postorder(start=start))
         return traversal
 
     def rank(self, node: BSTNode) -> Optional[int]:
-        # assert isinstance(node, BSTNode)
-        raise NotImplemented
+        """Runs in O(h) where h is the height of the tree.
+
+        Returns the 1-based position of the value of `node` in the sorted order,
+        or None if the value is not in the tree. Every node keeps the size of its
+        subtree, so the whole left subtree is skipped at once.
+        """
+        assert isinstance(node, BSTNode)
+        value = node._value
+        current = self._root
+        rank = 0
+        while current is not None:
+            current_value = current._value
+            if current_value < value:
+                left = current._left
+                rank += 1 if left is None else left._size + 1
+                current = current._right
+            elif current_value > value:
+                current = current._left
+            else:
+                left = current._left
+                return rank + (1 if left is None else left._size + 1)
+        return None
 
     def select(self, rank: int) -> Optional[BSTNode]:
-        raise NotImplemented
+        """Runs in O(h) where h is the height of the tree.
+
+        Returns the node holding the `rank`-th smallest value (1-based), or None if
+        `rank` is out of range.
+        """
+        if not 1 <= rank <= len(self):
+            return None
+        current = self._root
+        while True:
+            left = current._left
+            left_size = 0 if left is None else left._size
+            if rank <= left_size:
+                current = left
+            elif rank == left_size + 1:
+                return current
+            else:
+                rank -= left_size + 1
+                current = current._right
+
+    def range(self, lo: Any, hi: Any, inclusive: tuple[bool, bool] = (True, True)) -> Iterator[Any]:
+        """Lazily yields the values between `lo` and `hi` in ascending order, each
+        bound included as told by `inclusive`. Descends to `lo` once and then walks
+        in order, O(h + k) for k values with O(h) extra memory.
+        """
+        return map(attrgetter('_value'), self._range_nodes(lo, hi, inclusive))
+
+    def _range_nodes(self, lo: Any, hi: Any, inclusive: tuple[bool, bool]) -> Iterator[BSTNode]:
+        low_inclusive, high_inclusive = inclusive
+        stack = []
+        push, pop = stack.append, stack.pop
+        current = self._root
+        # Only the nodes at or above `lo` the descent turned left at are pending.
+        while current is not None:
+            value = current._value
+            if value > lo or (low_inclusive and value == lo):
+                push(current)
+                current = current._left
+            else:
+                current = current._right
+
+        while stack:
+            node = pop()
+            value = node._value
+            if value > hi or (not high_inclusive and value == hi):
+                return
+            yield node
+            current = node._right
+            while current is not None:
+                push(current)
+                current = current._left
+
+    def _count_below(self, value: Any, inclusive: bool = False) -> int:
+        """Runs in O(h), counts the values < `value` (<= if `inclusive`)."""
+        current = self._root
+        count = 0
+        while current is not None:
+            current_value = current._value
+            if current_value < value or (inclusive and current_value == value):
+                left = current._left
+                count += 1 if left is None else left._size + 1
+                current = current._right
+            else:
+                current = current._left
+        return count
+
+    def count_range(self, lo: Any, hi: Any, inclusive: tuple[bool, bool] = (True, True)) -> int:
+        """Runs in O(h), counts the values v such that lo <= v <= hi, each bound
+        included as told by `inclusive`.
+        """
+        if hi < lo:
+            return 0
+        low_inclusive, high_inclusive = inclusive
+        return max(self._count_below(hi, inclusive=high_inclusive)
+                   - self._count_below(lo, inclusive=not low_inclusive), 0)
+
+    def median(self) -> Optional[BSTNode]:
+        """Runs in O(h). The lower median for trees with an even number of nodes."""
+        return self.select((len(self) + 1) // 2)
+
+    # ========== Batch queries ==========
+
+    def snapshot(self) -> SortedSnapshot:
+        """The sorted values of the tree, flattened into one array. Built in O(N) on
+        the first call after an update, cached until the next one.
+        """
+        if self._snapshot_version != self._version:
+            self._snapshot = SortedSnapshot(self.iter_inorder())
+            self._snapshot_version = self._version
+        return self._snapshot
+
+    def export_snapshot(self, path: Union[str, PathLike], typecode: str = 'q') -> None:
+        """Runs in O(N), writes the values as fixed-width keys to a file that any
+        number of processes can open read-only as a `MappedSnapshot`.
+        """
+        MappedSnapshot.write(path, self.iter_inorder(), typecode=typecode)
+
+    def search_many(self, values: Iterable[Any]) -> Sequence[bool]:
+        """O(M log N) over the snapshot, whether each of `values` is in the tree."""
+        return self.snapshot().search_many(values)
+
+    def rank_many(self, values: Iterable[Any]) -> Sequence[int]:
+        """O(M log N) over the snapshot, the 1-based rank of each of `values`, 0 for
+        values that are not in the tree.
+        """
+        return self.snapshot().rank_many(values)
+
+    def count_range_many(self, lo: Iterable[Any], hi: Iterable[Any]) -> Sequence[int]:
+        """O(M log N) over the snapshot, `count_range` for every pair of bounds."""
+        return self.snapshot().count_range_many(lo, hi)
 
     # ========== Update operations ==========
 
     def insert(self, node: BSTNode, start: Optional[BSTNode] = None) -> None:
         """Runs in O(h) where h is the height of the tree.
+
+        The descent is iterative and links the node without refreshing anything,
+        `_retrace_insert` then walks back up exactly once.
         """
         assert isinstance(node, BSTNode)
         assert start is None or isinstance(start, BSTNode)
-        current = self._root if start is None else start
+        self._version += 1
+        if self._root is None:
+            node._parent = None
+            self._root = node
+            return
+        self._link_leaf(node, self._root if start is None else start)
+        self._retrace_insert(node._parent)
 
-        if current.value > node.value:
-            if current.left:
-                self.insert(node=node, start=current.left)
-            else:
-                current.add_child(node=node, to_left=True)
-        elif current.value < node.value:
-            if current.right:
-                self.insert(node=node, start=current.right)
+    def _link_leaf(self, node: BSTNode, current: BSTNode) -> None:
+        """Descends from `current` and links `node` as a leaf, refreshing nothing."""
+        value = node._value
+        while True:
+            current_value = current._value
+            if current_value > value:
+                if current._left is None:
+                    current._left = node
+                    break
+                current = current._left
+            elif current_value < value:
+                if current._right is None:
+                    current._right = node
+                    break
+                current = current._right
             else:
-                current.add_child(node=node, to_right=True)
-        else:
-            raise ValueError(f'{current} already in tree')
+                self._version -= 1
+                raise ValueError(f'{current} already in tree')
+        node._parent = current
+
+    def _retrace_insert(self, node: BSTNode) -> int:
+        """Refreshes the path above a freshly linked leaf, `node` being its parent.
+        Returns the number of nodes whose augmented attributes were recomputed.
+
+        A plain BST only keeps the subtree sizes, which grow by one up to the root.
+        """
+        refreshed = 0
+        while node is not None:
+            node._size += 1
+            refreshed += 1
+            node = node._parent
+        return refreshed
 
     def remove(self, node: BSTNode) -> None:
+        """Runs in O(h) where h is the height of the tree."""
         assert isinstance(node, BSTNode)
-        node = self.search(node=node)
-        if not node:
+        found = self._find(node._value)
+        if found is None:
             raise ValueError(f'{node} not found')
+        self._retrace(self._unlink(found))
 
-        if node.is_leaf:
-            # This part is clearly O(1) — on top of the earlier O(h) search-like effort.
-            node.remove()
-        elif node.has_one_child:
+    def pop_min(self) -> Optional[BSTNode]:
+        """Runs in O(h), removes and returns the node holding the smallest value."""
+        node = self.find_min()
+        if node is not None:
+            self._retrace(self._unlink(node))
+        return node
+
+    def pop_max(self) -> Optional[BSTNode]:
+        """Runs in O(h), removes and returns the node holding the largest value."""
+        node = self.find_max()
+        if node is not None:
+            self._retrace(self._unlink(node))
+        return node
+
+    def _replace(self, node: BSTNode, replacement: Optional[BSTNode]) -> None:
+        if node is self._root:
+            self._root = replacement
+        node.replace(node=replacement)
+
+    def _unlink(self, node: BSTNode, successor: Optional[BSTNode] = None) -> Optional[BSTNode]:
+        """Splices `node` out of the tree and detaches it. Returns the deepest node
+        whose subtree lost a node. Every node from there up to the root still
+        counts the removed node in its size, `_retrace` settles that.
+
+        A caller that already found the successor of a node with two children may
+        pass it in to save the walk down to it.
+        """
+        self._version += 1
+        left, right = node._left, node._right
+        if left is None or right is None:
             # This part is clearly O(1) — on top of the earlier O(h) search-like effort.
-            node.parent.add_child(node=node.left or node.right)
-            # node.parent = node.left or node.right
-            # node._left, node._right = None, None
-            # node.remove()
+            stale = node._parent
+            self._replace(node, right if left is None else left)
         else:
             # This part requires O(h) due to the need to find the successor node —
-            # on top of the earlier O(h) search-like effort.
-            # fixme
-            node.replace(node=self.successor(node=node))
+            # on top of the earlier O(h) search-like effort. The successor has no left
+            # child, so it is spliced out of its place and takes the place of `node`.
+            if successor is None:
+                successor = self.find_min(start=right)
+            stale = successor._parent
+            self._replace(successor, successor._right)
+            if stale is node:
+                stale = successor
+            self._replace(node, successor)
+            successor.adopt(node)
+
+        node.set_children(left=None, right=None)
+        return stale
+
+    def _retrace(self, node: Optional[BSTNode]) -> None:
+        """Settles the path from `node` up to the root after a removal below it."""
+        while node is not None:
+            node._size -= 1
+            node = node._parent
+
+    def delete_range(self, lo: Any, hi: Any, inclusive: tuple[bool, bool] = (True, True)) -> int:
+        """Removes the values between `lo` and `hi`, each bound included as told by
+        `inclusive`. Runs in O(k h) for k removed values. Returns k.
+        """
+        nodes = list(self._range_nodes(lo, hi, inclusive))
+        for node in nodes:
+            self._retrace(self._unlink(node))
+        return len(nodes)
+
+    def rotate_right(self, node: BSTNode) -> None:
+        """O(1)."""
+        assert isinstance(node, self.node_class)
+        assert node._left is not None
+
+        w = self._rotate_right(node)
+        if w._parent is None:
+            self._root = w
+
+    def rotate_left(self, node: BSTNode) -> None:
+        """O(1)."""
+        assert isinstance(node, self.node_class)
+        assert node._right is not None
+
+        w = self._rotate_left(node)
+        if w._parent is None:
+            self._root = w
+
+    def rotate_left_right(self, node: BSTNode) -> None:
+        """O(1), the double rotation of a node whose left child leans right."""
+        self.rotate_left(node=node._left)
+        self.rotate_right(node=node)
+
+    def rotate_right_left(self, node: BSTNode) -> None:
+        """O(1), the mirror image of `rotate_left_right`."""
+        self.rotate_right(node=node._right)
+        self.rotate_left(node=node)
+
+    @staticmethod
+    def _rotate_right(node: BSTNode) -> BSTNode:
+        """O(1), the rotation itself. Does not know about the root of any tree, so it
+        also works on detached subtrees. Returns the new root of the subtree.
+        """
+        w = node._left
+        parent = node._parent
+        if parent is not None:
+            if parent._left is node:
+                parent._left = w
+            else:
+                parent._right = w
+
+        w._parent = parent
+        node._parent = w
+        inner = w._right
+        node._left = inner
+        if inner is not None:
+            inner._parent = node
+        w._right = node
+
+        # `node` is now the child of `w`, so it has to be refreshed first.
+        node.update()
+        w.update()
+        return w
+
+    @staticmethod
+    def _rotate_left(node: BSTNode) -> BSTNode:
+        """O(1), the mirror image of `_rotate_right`."""
+        w = node._right
+        parent = node._parent
+        if parent is not None:
+            if parent._left is node:
+                parent._left = w
+            else:
+                parent._right = w
+
+        w._parent = parent
+        node._parent = w
+        inner = w._left
+        node._right = inner
+        if inner is not None:
+            inner._parent = node
+        w._left = node
+
+        node.update()
+        w.update()
+        return w
+
+    def insert_many(self, values: Iterable[Any]) -> list[bool]:
+        """Inserts a batch of values. Returns, in the order of `values`, whether each
+        of them was inserted (True) or already present (False); duplicates never
+        raise.
+
+        The batch is sorted first. A batch that is small compared to the tree is
+        inserted key after key, every descent resuming from the previously inserted
+        node (finger insert) instead of from the root, which runs in
+        O(M log(N/M + 1)) for the descents. A large batch is merged with the
+        in-order node sequence and the tree is relinked in O(N + M).
+        """
+        values = list(values)
+        order = sorted(range(len(values)), key=values.__getitem__)
+        if self._prefers_rebuild(batch_size=len(values)):
+            return self._merge_insert(values=values, order=order)
+        return self._finger_insert(values=values, order=order)
+
+    def remove_many(self, values: Iterable[Any]) -> list[bool]:
+        """Removes a batch of values. Returns, in the order of `values`, whether each
+        of them was removed (True) or absent (False); absent values never raise.
+
+        Like `insert_many`, a small batch is removed value after value while a large
+        one is merged with the in-order node sequence and the remaining nodes are
+        relinked in O(N + M). Existing node objects are reused, removed nodes are
+        detached.
+        """
+        values = list(values)
+        order = sorted(range(len(values)), key=values.__getitem__)
+        if self._prefers_rebuild(batch_size=len(values)):
+            return self._merge_remove(values=values, order=order)
+
+        removed = [False] * len(values)
+        for i in order:
+            node = self._find(values[i])
+            if node is not None:
+                self._retrace(self._unlink(node))
+                removed[i] = True
+        return removed
+
+    def _prefers_rebuild(self, batch_size: int) -> bool:
+        """Relinking touches all N nodes once, while M separate updates cost about
+        M log N steps each, so rebuild once the batch outweighs the tree.
+        """
+        size = len(self)
+        return batch_size * max(1, size.bit_length()) >= size
+
+    def _finger_insert(self, values: list[Any], order: list[int]) -> list[bool]:
+        inserted = [False] * len(values)
+        finger = None
+        for i in order:
+            value = values[i]
+            start = None
+            if finger is not None:
+                start = self._finger_climb(finger, value)
+                if start is None:
+                    continue
+
+            node = self.node_class(value=value)
+            try:
+                self.insert(node=node, start=start)
+            except ValueError:
+                continue
+            inserted[i] = True
+            finger = node
+        return inserted
+
+    @staticmethod
+    def _finger_climb(finger: BSTNode, value: Any) -> Optional[BSTNode]:
+        """Climbs from `finger` until its subtree is the one that has to hold the
+        larger `value`. None if the climb runs into `value`.
+        """
+        if finger._value == value:
+            return None
+        start, parent = finger, finger._parent
+        while parent is not None and parent._value < value:
+            start = parent
+            parent = start._parent
+        if parent is not None and parent._value == value:
+            return None
+        return start
+
+    def _merge_insert(self, values: list[Any], order: list[int]) -> list[bool]:
+        inserted = [False] * len(values)
+        merged = []
+        existing = self._iter_inorder_nodes()
+        current = next(existing, None)
+        for i in order:
+            value = values[i]
+            while current is not None and current._value < value:
+                merged.append(current)
+                current = next(existing, None)
+            if current is not None and current._value == value:
+                continue
+            if merged and merged[-1]._value == value:
+                continue
+            merged.append(self.node_class(value=value))
+            inserted[i] = True
+        if current is not None:
+            merged.append(current)
+            merged.extend(existing)
+
+        self._root = self._link_balanced(merged)
+        self._version += 1
+        return inserted
+
+    def _merge_remove(self, values: list[Any], order: list[int]) -> list[bool]:
+        removed = [False] * len(values)
+        kept = []
+        dropped = []
+        existing = self._iter_inorder_nodes()
+        current = next(existing, None)
+        for i in order:
+            value = values[i]
+            while current is not None and current._value < value:
+                kept.append(current)
+                current = next(existing, None)
+            if current is not None and current._value == value:
+                dropped.append(current)
+                removed[i] = True
+                current = next(existing, None)
+        if current is not None:
+            kept.append(current)
+            kept.extend(existing)
+
+        self._root = self._link_balanced(kept)
+        self._version += 1
+        for node in dropped:
+            node.set_children(left=None, right=None)
+            node._parent = None
+        return removed
+
+    # ========== Instrumentation ==========
+
+    def instrument(self, callback: Optional[Callback] = None, sample_every: int = 1) -> TreeStats:
+        """Starts counting, per public operation, the calls, time, comparisons,
+        nodes visited and rotations, with histograms of the latencies and of the
+        depth reached (sampled every `sample_every` calls). `callback(operation,
+        record)` is called after every operation with its own counts.
+
+        Only this tree object is switched over to an instrumented subclass, so an
+        uninstrumented tree pays nothing for the feature.
+        """
+        self._stats = TreeStats(callback=callback, sample_every=sample_every)
+        self.__class__ = instrumented_class(self.__class__)
+        return self._stats
+
+    def uninstrument(self) -> Optional[TreeStats]:
+        """Switches the tree back to its plain class, returns the final stats."""
+        stats = self.stats
+        if stats is not None:
+            self.__class__ = self.__class__.__bases__[0]
+            del self._stats
+        return stats
+
+    @property
+    def stats(self) -> Optional[TreeStats]:
+        return self.__dict__.get('_stats')
+
+    # ========== Counted twins ==========
+    #
+    # An instrumented tree runs `<name>_counted` in place of `<name>`. Each twin is
+    # the loop of its original step for step, adding the nodes it stepped on and
+    # the value comparisons it made to the operation in progress. Keep them in
+    # sync. Plain trees never run them.
+
+    def find_min_counted(self, start: BSTNode = None) -> Optional[BSTNode]:
+        current = self._root if start is None else start
+        if current is None:
+            return None
+        visited = 1
+        while current._left is not None:
+            current = current._left
+            visited += 1
+        self._stats.count(visited)
+        return current
+
+    def find_max_counted(self, start: BSTNode = None) -> Optional[BSTNode]:
+        current = self._root if start is None else start
+        if current is None:
+            return None
+        visited = 1
+        while current._right is not None:
+            current = current._right
+            visited += 1
+        self._stats.count(visited)
+        return current
+
+    def successor_counted(self, node: BSTNode) -> Optional[BSTNode]:
+        assert isinstance(node, BSTNode)
+
+        if node._right is not None:
+            return self.find_min(start=node._right)
+        p = node._parent
+        t = node
+        visited = 0
+        while p is not None and t is p._right:
+            visited += 1
+            t = p
+            p = t._parent
+        self._stats.count(visited if p is None else visited + 1)
+        return p
+
+    def predecessor_counted(self, node: BSTNode) -> Optional[BSTNode]:
+        assert isinstance(node, BSTNode)
+
+        if node._left is not None:
+            return self.find_max(start=node._left)
+        p = node._parent
+        t = node
+        visited = 0
+        while p is not None and t is p._left:
+            visited += 1
+            t = p
+            p = t._parent
+        self._stats.count(visited if p is None else visited + 1)
+        return p
+
+    def _find_counted(self, value: Any, start: Optional[BSTNode] = None) -> Optional[BSTNode]:
+        current = self._root if start is None else start
+        visited = comparisons = 0
+        try:
+            while current is not None:
+                visited += 1
+                comparisons += 1
+                current_value = current._value
+                if current_value == value:
+                    return current
+                comparisons += 1
+                current = current._right if current_value < value else current._left
+            return None
+        finally:
+            self._stats.count(visited, comparisons)
+
+    def floor_counted(self, value: Any) -> Optional[BSTNode]:
+        current = self._root
+        candidate = None
+        visited = comparisons = 0
+        try:
+            while current is not None:
+                visited += 1
+                comparisons += 1
+                current_value = current._value
+                if current_value == value:
+                    return current
+                comparisons += 1
+                if current_value < value:
+                    candidate = current
+                    current = current._right
+                else:
+                    current = current._left
+            return candidate
+        finally:
+            self._stats.count(visited, comparisons)
+
+    def ceiling_counted(self, value: Any) -> Optional[BSTNode]:
+        current = self._root
+        candidate = None
+        visited = comparisons = 0
+        try:
+            while current is not None:
+                visited += 1
+                comparisons += 1
+                current_value = current._value
+                if current_value == value:
+                    return current
+                comparisons += 1
+                if current_value > value:
+                    candidate = current
+                    current = current._left
+                else:
+                    current = current._right
+            return candidate
+        finally:
+            self._stats.count(visited, comparisons)
+
+    def lower_counted(self, value: Any) -> Optional[BSTNode]:
+        current = self._root
+        candidate = None
+        visited = 0
+        while current is not None:
+            visited += 1
+            if current._value < value:
+                candidate = current
+                current = current._right
+            else:
+                current = current._left
+        self._stats.count(visited, visited)
+        return candidate
+
+    def higher_counted(self, value: Any) -> Optional[BSTNode]:
+        current = self._root
+        candidate = None
+        visited = 0
+        while current is not None:
+            visited += 1
+            if current._value > value:
+                candidate = current
+                current = current._left
+            else:
+                current = current._right
+        self._stats.count(visited, visited)
+        return candidate
+
+    def rank_counted(self, node: BSTNode) -> Optional[int]:
+        assert isinstance(node, BSTNode)
+        value = node._value
+        current = self._root
+        rank = 0
+        visited = comparisons = 0
+        try:
+            while current is not None:
+                visited += 1
+                comparisons += 1
+                current_value = current._value
+                if current_value < value:
+                    left = current._left
+                    rank += 1 if left is None else left._size + 1
+                    current = current._right
+                    continue
+                comparisons += 1
+                if current_value > value:
+                    current = current._left
+                else:
+                    left = current._left
+                    return rank + (1 if left is None else left._size + 1)
+            return None
+        finally:
+            self._stats.count(visited, comparisons)
+
+    def select_counted(self, rank: int) -> Optional[BSTNode]:
+        if not 1 <= rank <= len(self):
+            return None
+        current = self._root
+        visited = 0
+        try:
+            while True:
+                visited += 1
+                left = current._left
+                left_size = 0 if left is None else left._size
+                if rank <= left_size:
+                    current = left
+                elif rank == left_size + 1:
+                    return current
+                else:
+                    rank -= left_size + 1
+                    current = current._right
+        finally:
+            self._stats.count(visited)
+
+    def _count_below_counted(self, value: Any, inclusive: bool = False) -> int:
+        current = self._root
+        count = 0
+        visited = comparisons = 0
+        while current is not None:
+            visited += 1
+            current_value = current._value
+            comparisons += 1
+            below = current_value < value
+            if not below and inclusive:
+                comparisons += 1
+                below = current_value == value
+            if below:
+                left = current._left
+                count += 1 if left is None else left._size + 1
+                current = current._right
+            else:
+                current = current._left
+        self._stats.count(visited, comparisons)
+        return count
+
+    def _range_nodes_counted(self, lo: Any, hi: Any, inclusive: tuple[bool, bool]) -> Iterator[BSTNode]:
+        # Counts are handed over before every yield, the operation in progress may
+        # be another one by the time the iteration resumes.
+        count = self._stats.count
+        low_inclusive, high_inclusive = inclusive
+        stack = []
+        push, pop = stack.append, stack.pop
+        current = self._root
+        visited = comparisons = 0
+        while current is not None:
+            visited += 1
+            comparisons += 1
+            value = current._value
+            above = value > lo
+            if not above and low_inclusive:
+                comparisons += 1
+                above = value == lo
+            if above:
+                push(current)
+                current = current._left
+            else:
+                current = current._right
+
+        while stack:
+            node = pop()
+            value = node._value
+            comparisons += 1
+            beyond = value > hi
+            if not beyond and not high_inclusive:
+                comparisons += 1
+                beyond = value == hi
+            if beyond:
+                count(visited, comparisons)
+                return
+            count(visited, comparisons)
+            visited = comparisons = 0
+            yield node
+            current = node._right
+            while current is not None:
+                visited += 1
+                push(current)
+                current = current._left
+        count(visited, comparisons)
+
+    def _iter_inorder_nodes_counted(self, start: Optional[BSTNode] = None) -> Iterator[BSTNode]:
+        count = self._stats.count
+        for node in BinarySearchTree._iter_inorder_nodes(self, start=start):
+            count(1)
+            yield node
+
+    def _iter_reversed_nodes_counted(self, start: Optional[BSTNode] = None) -> Iterator[BSTNode]:
+        count = self._stats.count
+        for node in BinarySearchTree._iter_reversed_nodes(self, start=start):
+            count(1)
+            yield node
+
+    def _iter_preorder_nodes_counted(self, start: Optional[BSTNode] = None) -> Iterator[BSTNode]:
+        count = self._stats.count
+        for node in BinarySearchTree._iter_preorder_nodes(self, start=start):
+            count(1)
+            yield node
+
+    def iter_postorder_counted(self, start: Optional[BSTNode] = None) -> Iterator[Any]:
+        count = self._stats.count
+        for value in BinarySearchTree.iter_postorder(self, start=start):
+            count(1)
+            yield value
+
+    def _link_leaf_counted(self, node: BSTNode, current: BSTNode) -> None:
+        value = node._value
+        visited = comparisons = 0
+        try:
+            while True:
+                visited += 1
+                comparisons += 1
+                current_value = current._value
+                if current_value > value:
+                    if current._left is None:
+                        current._left = node
+                        break
+                    current = current._left
+                    continue
+                comparisons += 1
+                if current_value < value:
+                    if current._right is None:
+                        current._right = node
+                        break
+                    current = current._right
+                else:
+                    self._version -= 1
+                    raise ValueError(f'{current} already in tree')
+        finally:
+            self._stats.count(visited, comparisons)
+        node._parent = current
+
+    def _finger_climb_counted(self, finger: BSTNode, value: Any) -> Optional[BSTNode]:
+        visited = comparisons = 1
+        try:
+            if finger._value == value:
+                return None
+            start, parent = finger, finger._parent
+            while parent is not None:
+                visited += 1
+                comparisons += 1
+                if not parent._value < value:
+                    break
+                start = parent
+                parent = start._parent
+            if parent is not None:
+                comparisons += 1
+                if parent._value == value:
+                    return None
+            return start
+        finally:
+            self._stats.count(visited, comparisons)
+
+    def _merge_insert_counted(self, values: list[Any], order: list[int]) -> list[bool]:
+        # The nodes are counted by the in-order walk, only the comparisons here.
+        inserted = [False] * len(values)
+        merged = []
+        existing = self._iter_inorder_nodes()
+        current = next(existing, None)
+        comparisons = 0
+        for i in order:
+            value = values[i]
+            while current is not None:
+                comparisons += 1
+                if not current._value < value:
+                    break
+                merged.append(current)
+                current = next(existing, None)
+            if current is not None:
+                comparisons += 1
+                if current._value == value:
+                    continue
+            if merged:
+                comparisons += 1
+                if merged[-1]._value == value:
+                    continue
+            merged.append(self.node_class(value=value))
+            inserted[i] = True
+        if current is not None:
+            merged.append(current)
+            merged.extend(existing)
+        self._stats.count(0, comparisons)
+
+        self._root = self._link_balanced(merged)
+        self._version += 1
+        return inserted
+
+    def _merge_remove_counted(self, values: list[Any], order: list[int]) -> list[bool]:
+        removed = [False] * len(values)
+        kept = []
+        dropped = []
+        existing = self._iter_inorder_nodes()
+        current = next(existing, None)
+        comparisons = 0
+        for i in order:
+            value = values[i]
+            while current is not None:
+                comparisons += 1
+                if not current._value < value:
+                    break
+                kept.append(current)
+                current = next(existing, None)
+            if current is not None:
+                comparisons += 1
+                if current._value == value:
+                    dropped.append(current)
+                    removed[i] = True
+                    current = next(existing, None)
+        if current is not None:
+            kept.append(current)
+            kept.extend(existing)
+        self._stats.count(0, comparisons)
+
+        self._root = self._link_balanced(kept)
+        self._version += 1
+        for node in dropped:
+            node.set_children(left=None, right=None)
+            node._parent = None
+        return removed
+
+    # ========== Serialization ==========
+
+    def dump(self, fileobj: BinaryIO) -> None:
+        """Runs in O(N), writes the exact shape and the values of the tree in the
+        compact binary format described in `tree.serialization`.
+        """
+        write_nodes(self._root, fileobj)
+
+    @classmethod
+    def load(cls, fileobj: BinaryIO) -> 'BinarySearchTree':
+        """Runs in O(N), relinks the dumped shape as is, no insertion and no
+        rebalancing. The augmented attributes are restored in one linear pass.
+        """
+        return cls(root=read_nodes(cls.node_class, fileobj))
+
+    def dumps(self) -> bytes:
+        buffer = BytesIO()
+        self.dump(buffer)
+        return buffer.getvalue()
+
+    @classmethod
+    def loads(cls, data: bytes) -> 'BinarySearchTree':
+        return cls.load(BytesIO(data))
+
+    def __reduce__(self) -> tuple[Callable, tuple[bytes]]:
+        """Pickles through `dumps`, the default would recurse once per level of
+        the tree and fail on deep ones. An instrumented tree pickles as its plain
+        class, the generated subclass cannot be looked up by name and the stats
+        are not kept.
+        """
+        cls = next(c for c in type(self).__mro__ if '_instrumented' not in c.__dict__)
+        return cls.loads, (self.dumps(),)
 
     @classmethod
     def create(
-            cls, *, empty: bool = False, random: bool = False, balanced: bool = False
+            cls,
+            values: Iterable[Any] = (),
+            *,
+            empty: bool = False,
+            random: bool = False,
+            balanced: bool = False,
     ) -> 'BinarySearchTree':
-        raise NotImplemented
+        """Builds a tree out of `values`, duplicates are dropped.
+
+        - `empty`: ignore `values` and return an empty tree.
+        - `balanced`: sort the values first and build a perfectly height-balanced
+          tree in O(N log N), O(N) if the values are already sorted.
+        - `random`: insert the values in a random order, expected height O(log N).
+        - otherwise the values are inserted one by one in the given order.
+        """
+        if empty:
+            return cls()
+        if balanced:
+            return cls.from_iterable(values)
+
+        values = list(values)
+        if random:
+            shuffle(values)
+        tree = cls()
+        for value in values:
+            if value not in tree:
+                tree.insert(node=cls.node_class(value=value))
+        return tree
+
+    @classmethod
+    def from_iterable(cls, values: Iterable[Any]) -> 'BinarySearchTree':
+        """Runs in O(N log N), sorts and deduplicates `values` before building a
+        perfectly height-balanced tree. Sorted input only costs O(N) since Timsort
+        detects the run.
+        """
+        ordered = []
+        for value in sorted(values):
+            if not ordered or ordered[-1] != value:
+                ordered.append(value)
+        return cls.from_sorted(ordered)
+
+    @classmethod
+    def from_sorted(cls, values: Iterable[Any]) -> 'BinarySearchTree':
+        """Runs in O(N), builds a perfectly height-balanced tree out of strictly
+        increasing `values` without a single comparison-driven descent.
+        """
+        nodes = []
+        for value in values:
+            if nodes and not nodes[-1]._value < value:
+                raise ValueError(f'{value!r} breaks the strictly increasing order')
+            nodes.append(cls.node_class(value=value))
+        return cls(root=cls._link_balanced(nodes))
+
+    @staticmethod
+    def _link_balanced(nodes: Sequence[BSTNode]) -> Optional[BSTNode]:
+        """Links the sorted `nodes` into a perfectly height-balanced tree and returns
+        its root. Runs in O(N), the recursion is only O(log N) deep.
+        """
+        def link(lo: int, hi: int) -> Optional[BSTNode]:
+            if lo >= hi:
+                return None
+            mid = (lo + hi) // 2
+            node = nodes[mid]
+            node.set_children(left=link(lo, mid), right=link(mid + 1, hi))
+            return node
+
+        root = link(0, len(nodes))
+        if root is not None:
+            root._parent = None
+        return root
@@ -0,0 +1,226 @@
+from collections import OrderedDict
+from functools import wraps
+from typing import Any, Callable, NamedTuple, Optional
+
+from .avl_tree import AVLTree
+from .bst import BinarySearchTree
+from .node import BSTNode
+
+
+_MISSING = object()
+
+
+class CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
+def _passing(name: str) -> Callable:
+    method = getattr(AVLTree, name)
+
+    @wraps(method)
+    def passed(self: 'CachedAVLTree', *args: Any, **kwargs: Any) -> Any:
+        return getattr(self._tree, name)(*args, **kwargs)
+    return passed
+
+
+def _clearing(name: str) -> Callable:
+    method = getattr(AVLTree, name)
+
+    @wraps(method)
+    def cleared(self: 'CachedAVLTree', *args: Any, **kwargs: Any) -> Any:
+        try:
+            return getattr(self._tree, name)(*args, **kwargs)
+        finally:
+            self.cache_clear()
+    return cleared
+
+
+class CachedAVLTree:
+    """A read-through LRU cache in front of the lookups of an AVL Tree (or any
+    Binary Search Tree): `search`, `get` and `in` by value, `successor` and
+    `predecessor` by the value of the given node. Each kind keeps up to `maxsize`
+    entries, a hit costs one dict lookup instead of a descent from the root.
+
+    An entry maps a value to the node that answers it, or to None. Rotations and
+    the successor splice of a removal move nodes around but never change which
+    node holds a value, so they leave every entry valid. Only the values whose
+    answer changes are dropped: on `insert(v)` or `remove(v)` the entries of v,
+    the successor entry of the value below v and the predecessor entry of the
+    value above it. The batch updates clear the whole cache.
+
+    Updates made on `tree` directly are caught by its version counter, the next
+    lookup through the cache then starts from an empty cache. Values have to be
+    hashable.
+    """
+
+    def __init__(self, tree: Optional[BinarySearchTree] = None, *, maxsize: int = 1024):
+        assert tree is None or isinstance(tree, BinarySearchTree)
+        assert isinstance(maxsize, int) and maxsize > 0
+        self._tree = AVLTree() if tree is None else tree
+        self._maxsize = maxsize
+        self._found: OrderedDict[Any, Optional[BSTNode]] = OrderedDict()
+        self._successors: OrderedDict[Any, Optional[BSTNode]] = OrderedDict()
+        self._predecessors: OrderedDict[Any, Optional[BSTNode]] = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+        self._version = self._tree._version
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}({self.inorder_traversal()})'
+
+    @property
+    def tree(self) -> BinarySearchTree:
+        """The wrapped tree, updates made on it directly clear the cache."""
+        return self._tree
+
+    @property
+    def hits(self) -> int:
+        return self._hits
+
+    @property
+    def misses(self) -> int:
+        return self._misses
+
+    def cache_info(self) -> CacheInfo:
+        """Same fields as `functools.lru_cache`, `currsize` counts every kind."""
+        currsize = len(self._found) + len(self._successors) + len(self._predecessors)
+        return CacheInfo(self._hits, self._misses, self._maxsize, currsize)
+
+    def cache_clear(self) -> None:
+        """Drops every entry, the counters are kept."""
+        self._found.clear()
+        self._successors.clear()
+        self._predecessors.clear()
+        self._version = self._tree._version
+
+    def _lookup(self, cache: OrderedDict, value: Any, compute: Callable[..., Optional[BSTNode]],
+                argument: Any) -> Optional[BSTNode]:
+        """The hit path is repeated inline by the lookups, this is their miss path."""
+        if self._version != self._tree._version:
+            self.cache_clear()
+        node = cache.get(value, _MISSING)
+        if node is not _MISSING:
+            cache.move_to_end(value)
+            self._hits += 1
+            return node
+        self._misses += 1
+        node = cache[value] = compute(argument)
+        if len(cache) > self._maxsize:
+            cache.popitem(last=False)
+        return node
+
+    def _invalidate(self, value: Any, below: Optional[BSTNode], above: Optional[BSTNode]) -> None:
+        """Drops the entries whose answer changed when `value` came or went, `below`
+        and `above` being its neighbours in the tree.
+        """
+        if self._version != self._tree._version - 1:
+            # Something else changed the tree since the cache last looked.
+            self.cache_clear()
+            return
+        self._found.pop(value, None)
+        self._successors.pop(value, None)
+        self._predecessors.pop(value, None)
+        if below is not None:
+            self._successors.pop(below._value, None)
+        if above is not None:
+            self._predecessors.pop(above._value, None)
+        self._version = self._tree._version
+
+    # ========== Cached queries ==========
+
+    def search(self, node: BSTNode, start: BSTNode = None) -> Optional[BSTNode]:
+        """O(1) on a hit, O(h) on a miss. A search below `start` is not cached."""
+        assert isinstance(node, BSTNode)
+        if start is not None:
+            return self._tree.search(node=node, start=start)
+        return self.get(node._value)
+
+    def get(self, value: Any, default: Optional[BSTNode] = None) -> Optional[BSTNode]:
+        found = self._found
+        node = found.get(value, _MISSING)
+        if node is _MISSING or self._version != self._tree._version:
+            node = self._lookup(found, value, self._tree._find, value)
+        else:
+            found.move_to_end(value)
+            self._hits += 1
+        return default if node is None else node
+
+    def __contains__(self, value: Any) -> bool:
+        return self.get(value) is not None
+
+    def successor(self, node: BSTNode) -> Optional[BSTNode]:
+        """O(1) on a hit, O(h) on a miss."""
+        assert isinstance(node, BSTNode)
+        return self._lookup(self._successors, node._value, self._tree.successor, node)
+
+    def predecessor(self, node: BSTNode) -> Optional[BSTNode]:
+        """O(1) on a hit, O(h) on a miss."""
+        assert isinstance(node, BSTNode)
+        return self._lookup(self._predecessors, node._value, self._tree.predecessor, node)
+
+    # ========== Other queries ==========
+
+    __len__ = _passing('__len__')
+    __iter__ = _passing('__iter__')
+    __reversed__ = _passing('__reversed__')
+    find_min = _passing('find_min')
+    find_max = _passing('find_max')
+    floor = _passing('floor')
+    ceiling = _passing('ceiling')
+    lower = _passing('lower')
+    higher = _passing('higher')
+    rank = _passing('rank')
+    select = _passing('select')
+    count_range = _passing('count_range')
+    range = _passing('range')
+    median = _passing('median')
+    iter_inorder = _passing('iter_inorder')
+    iter_reversed = _passing('iter_reversed')
+    inorder_traversal = _passing('inorder_traversal')
+    preorder_traversal = _passing('preorder_traversal')
+    postorder_traversal = _passing('postorder_traversal')
+    check_invariants = _passing('check_invariants')
+
+    # ========== Update operations ==========
+
+    def insert(self, node: BSTNode, start: Optional[BSTNode] = None) -> None:
+        """O(h), plus O(h) for each of the two neighbour lookups of the new node."""
+        tree = self._tree
+        tree.insert(node=node, start=start)
+        self._invalidate(node._value, tree.predecessor(node=node), tree.successor(node=node))
+
+    def remove(self, node: BSTNode) -> None:
+        """O(h)."""
+        assert isinstance(node, BSTNode)
+        tree = self._tree
+        found = tree._find(node._value)
+        if found is None:
+            raise ValueError(f'{node} not found')
+        below, above = tree.predecessor(node=found), tree.successor(node=found)
+        tree.remove(node=found)
+        self._invalidate(found._value, below, above)
+
+    def pop_min(self) -> Optional[BSTNode]:
+        tree = self._tree
+        node = tree.find_min()
+        if node is not None:
+            above = tree.successor(node=node)
+            tree.pop_min()
+            self._invalidate(node._value, None, above)
+        return node
+
+    def pop_max(self) -> Optional[BSTNode]:
+        tree = self._tree
+        node = tree.find_max()
+        if node is not None:
+            below = tree.predecessor(node=node)
+            tree.pop_max()
+            self._invalidate(node._value, below, None)
+        return node
+
+    insert_many = _clearing('insert_many')
+    remove_many = _clearing('remove_many')
+    delete_range = _clearing('delete_range')
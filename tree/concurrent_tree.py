@@ -0,0 +1,190 @@
+import threading
+from bisect import bisect_left, bisect_right
+from contextlib import contextmanager
+from functools import wraps
+from typing import Any, Callable, ContextManager, Iterator, Optional
+
+from .avl_tree import AVLTree
+from .bst import BinarySearchTree
+from .sorted_snapshot import SortedSnapshot
+
+
+class RWLock:
+    """A readers-writer lock: any number of readers or a single writer.
+
+    Writers are preferred, once one is waiting no new reader gets in, so a steady
+    stream of readers cannot starve it. The lock is not reentrant.
+    """
+
+    def __init__(self):
+        self._condition = threading.Condition(threading.Lock())
+        self._readers = 0
+        self._writer = False
+        self._waiting_writers = 0
+
+    def acquire_read(self) -> None:
+        with self._condition:
+            while self._writer or self._waiting_writers:
+                self._condition.wait()
+            self._readers += 1
+
+    def release_read(self) -> None:
+        with self._condition:
+            self._readers -= 1
+            if not self._readers:
+                self._condition.notify_all()
+
+    def acquire_write(self) -> None:
+        with self._condition:
+            self._waiting_writers += 1
+            while self._writer or self._readers:
+                self._condition.wait()
+            self._waiting_writers -= 1
+            self._writer = True
+
+    def release_write(self) -> None:
+        with self._condition:
+            self._writer = False
+            self._condition.notify_all()
+
+    @contextmanager
+    def read(self) -> Iterator[None]:
+        self.acquire_read()
+        try:
+            yield
+        finally:
+            self.release_read()
+
+    @contextmanager
+    def write(self) -> Iterator[None]:
+        self.acquire_write()
+        try:
+            yield
+        finally:
+            self.release_write()
+
+
+def _reading(name: str) -> Callable:
+    method = getattr(AVLTree, name)
+
+    @wraps(method)
+    def read(self: 'ConcurrentAVLTree', *args: Any, **kwargs: Any) -> Any:
+        with self._read_lock():
+            return getattr(self._tree, name)(*args, **kwargs)
+    return read
+
+
+def _writing(name: str) -> Callable:
+    method = getattr(AVLTree, name)
+
+    @wraps(method)
+    def write(self: 'ConcurrentAVLTree', *args: Any, **kwargs: Any) -> Any:
+        with self._lock.write():
+            return getattr(self._tree, name)(*args, **kwargs)
+    return write
+
+
+class ConcurrentAVLTree:
+    """A thread-safe front of an AVL Tree (or any Binary Search Tree) for many
+    reader threads and a writer.
+
+    Queries share a readers-writer lock, updates hold it exclusively, so a reader
+    never sees a rotation halfway through. Nodes handed out by queries are the
+    live nodes of the tree, only their `value` is safe to read afterwards.
+
+    The scans (`iter_inorder`, `iter_reversed`, `range` and `__iter__`) do not
+    walk the tree. They iterate the cached `SortedSnapshot`, which updates never
+    modify: an update only makes the next scan build a fresh one. A long scan
+    therefore holds the lock just long to fetch the snapshot and never blocks a
+    writer, at the cost of an O(N) copy after each round of updates.
+
+    A self-adjusting tree such as the `SplayTree` restructures itself on lookups
+    and an instrumented one records every query in its stats, so on those the
+    queries take the lock exclusively as well and no longer run in parallel.
+
+    For compound operations take `lock` yourself and work on `tree` directly.
+    """
+
+    def __init__(self, tree: Optional[BinarySearchTree] = None):
+        assert tree is None or isinstance(tree, BinarySearchTree)
+        self._tree = AVLTree() if tree is None else tree
+        self._lock = RWLock()
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}({self.inorder_traversal()})'
+
+    @property
+    def tree(self) -> BinarySearchTree:
+        """The wrapped tree, not synchronized."""
+        return self._tree
+
+    @property
+    def lock(self) -> RWLock:
+        return self._lock
+
+    def _read_lock(self) -> ContextManager[None]:
+        """The shared lock, or the exclusive one when queries write to the tree."""
+        tree = self._tree
+        if tree.self_adjusting or tree.stats is not None:
+            return self._lock.write()
+        return self._lock.read()
+
+    # ========== Query operations ==========
+
+    __len__ = _reading('__len__')
+    __contains__ = _reading('__contains__')
+    search = _reading('search')
+    get = _reading('get')
+    find_min = _reading('find_min')
+    find_max = _reading('find_max')
+    successor = _reading('successor')
+    predecessor = _reading('predecessor')
+    floor = _reading('floor')
+    ceiling = _reading('ceiling')
+    lower = _reading('lower')
+    higher = _reading('higher')
+    rank = _reading('rank')
+    select = _reading('select')
+    count_range = _reading('count_range')
+    median = _reading('median')
+    search_many = _reading('search_many')
+    rank_many = _reading('rank_many')
+    count_range_many = _reading('count_range_many')
+    inorder_traversal = _reading('inorder_traversal')
+    preorder_traversal = _reading('preorder_traversal')
+    postorder_traversal = _reading('postorder_traversal')
+    check_invariants = _reading('check_invariants')
+
+    # ========== Snapshot scans ==========
+
+    def snapshot(self) -> SortedSnapshot:
+        """O(1) unless the tree changed since the last call, O(N) then."""
+        with self._read_lock():
+            return self._tree.snapshot()
+
+    def iter_inorder(self) -> Iterator[Any]:
+        return iter(self.snapshot().values)
+
+    def iter_reversed(self) -> Iterator[Any]:
+        return reversed(self.snapshot().values)
+
+    def __iter__(self) -> Iterator[Any]:
+        return self.iter_inorder()
+
+    def range(self, lo: Any, hi: Any, inclusive: tuple[bool, bool] = (True, True)) -> Iterator[Any]:
+        """O(log N) to find the bounds in the snapshot, then O(1) per value."""
+        values = self.snapshot().values
+        low_inclusive, high_inclusive = inclusive
+        start = (bisect_left if low_inclusive else bisect_right)(values, lo)
+        stop = (bisect_right if high_inclusive else bisect_left)(values, hi)
+        return map(values.__getitem__, range(start, stop))
+
+    # ========== Update operations ==========
+
+    insert = _writing('insert')
+    insert_many = _writing('insert_many')
+    remove = _writing('remove')
+    remove_many = _writing('remove_many')
+    pop_min = _writing('pop_min')
+    pop_max = _writing('pop_max')
+    delete_range = _writing('delete_range')
@@ -0,0 +1,163 @@
+from typing import Any, Optional
+
+from .node import BSTNode
+
+
+class TreeCursor:
+    """A finger into a Binary Search Tree (or AVL Tree) for walking neighbours.
+
+    `next` and `prev` step along the parent and child links: a single step may
+    climb or descend O(h) nodes, but a walk over k consecutive nodes touches
+    O(k + h) nodes in total, amortized O(1) per step.
+
+    `seek(value)` searches from the current position instead of from the root.
+    It climbs only until the subtree it is in covers `value` and descends from
+    there. Values d positions away sit in a subtree of height O(log d) unless
+    the two sides are split by an ancestor far above them, which is then the
+    only place the climb has to go.
+
+    The cursor survives updates of the tree: once the tree changed it checks
+    whether its node is still linked in, and falls back to the value it was at
+    otherwise.
+    """
+
+    __slots__ = ['_tree', '_node', '_value', '_off', '_version']
+
+    def __init__(self, tree: Any, value: Any = None):
+        self._tree = tree
+        self._node: Optional[BSTNode] = None
+        self._value = None
+        # -1 before the start, 1 past the end, 0 at (or last at) `_value`.
+        self._off = -1
+        self._version = tree._version
+        if value is not None:
+            self.seek(value)
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}({self._node})'
+
+    @property
+    def node(self) -> Optional[BSTNode]:
+        """The node the cursor is at, None before the start or past the end."""
+        return self._node
+
+    @property
+    def value(self) -> Any:
+        return None if self._node is None else self._node._value
+
+    def _at(self, node: Optional[BSTNode], off: int = 1) -> Optional[BSTNode]:
+        """Moves to `node`, or off the end given by `off` if it is None."""
+        self._node = node
+        if node is None:
+            self._off = off
+        else:
+            self._value = node._value
+            self._off = 0
+        return node
+
+    def _attached(self) -> bool:
+        """Whether the cursor still points into the tree. O(1) unless the tree was
+        updated since the last move, O(h) then.
+        """
+        node, tree = self._node, self._tree
+        if node is None:
+            return False
+        if self._version == tree._version:
+            return True
+        self._version = tree._version
+        while node._parent is not None:
+            node = node._parent
+        if node is tree._root:
+            return True
+        self._node = None
+        return False
+
+    def seek(self, value: Any) -> Optional[BSTNode]:
+        """Moves to the smallest value >= `value`, past the end if there is none.
+        Runs in O(log d) from a nearby position, O(h) at worst.
+        """
+        if not self._attached():
+            return self._at(self._descend(self._tree._root, value, None))
+        node = self._node
+        current_value = node._value
+        if current_value == value:
+            return node
+
+        # Climb to the lowest ancestor whose subtree covers `value`. The parent
+        # that stops the climb bounds that subtree and is the fallback ceiling.
+        bound = None
+        if current_value < value:
+            while node._parent is not None:
+                parent = node._parent
+                if parent._left is node and not parent._value < value:
+                    bound = parent
+                    break
+                node = parent
+        else:
+            while node._parent is not None:
+                parent = node._parent
+                if parent._right is node and not value < parent._value:
+                    if parent._value == value:
+                        return self._at(parent)
+                    break
+                node = parent
+        return self._at(self._descend(node, value, bound))
+
+    @staticmethod
+    def _descend(node: Optional[BSTNode], value: Any, candidate: Optional[BSTNode]) -> Optional[BSTNode]:
+        while node is not None:
+            current_value = node._value
+            if current_value == value:
+                return node
+            if current_value > value:
+                candidate = node
+                node = node._left
+            else:
+                node = node._right
+        return candidate
+
+    def first(self) -> Optional[BSTNode]:
+        self._version = self._tree._version
+        return self._at(self._tree.find_min(), off=-1)
+
+    def last(self) -> Optional[BSTNode]:
+        self._version = self._tree._version
+        return self._at(self._tree.find_max(), off=1)
+
+    def next(self) -> Optional[BSTNode]:
+        """Moves to the next node in order and returns it, None past the end.
+        Amortized O(1) over a walk.
+        """
+        if not self._attached():
+            if self._off:
+                return None if self._off > 0 else self._at(self._tree.find_min(), off=1)
+            return self._at(self._tree.higher(self._value), off=1)
+        node = self._node
+        if node._right is not None:
+            node = node._right
+            while node._left is not None:
+                node = node._left
+            return self._at(node)
+        parent = node._parent
+        while parent is not None and node is parent._right:
+            node, parent = parent, parent._parent
+        return self._at(parent)
+
+    def prev(self) -> Optional[BSTNode]:
+        """Moves to the previous node in order and returns it, None before the
+        start. Amortized O(1) over a walk.
+        """
+        if not self._attached():
+            if self._off:
+                return None if self._off < 0 else self._at(self._tree.find_max(), off=-1)
+            return self._at(self._tree.lower(self._value), off=-1)
+        node = self._node
+        if node._left is not None:
+            node = node._left
+            while node._right is not None:
+                node = node._right
+            return self._at(node)
+        parent = node._parent
+        while parent is not None and node is parent._left:
+            node, parent = parent, parent._parent
+        return self._at(parent, off=-1)
@@ -0,0 +1,212 @@
+"""Opt-in instrumentation of a tree, see `BinarySearchTree.instrument`.
+
+Instrumenting swaps the class of one tree object for a generated subclass whose
+public operations are wrapped, and uninstrumenting swaps it back. Trees that are
+not instrumented run the plain classes, untouched.
+
+The nodes visited and the comparisons are counted on the path the operation
+actually takes: wherever a tree class defines a `<name>_counted` twin next to a
+method `<name>`, the generated subclass runs the twin instead. A method that a
+subclass overrides without a twin of its own is run as is and counts nothing.
+"""
+import time
+from functools import wraps
+from typing import Any, Callable, Iterator, Optional
+
+# The public operations that are timed, each call recorded when it returns.
+OPERATIONS = ('search', '__contains__', 'get', 'find_min', 'find_max', 'successor', 'predecessor',
+              'floor', 'ceiling', 'lower', 'higher', 'rank', 'select', 'count_range', 'median',
+              'inorder_traversal', 'preorder_traversal', 'postorder_traversal',
+              'insert', 'remove', 'pop_min', 'pop_max', 'insert_many', 'remove_many', 'delete_range')
+# The lazy ones, recorded once the iteration ends, their time spent inside `next`.
+ITERATIONS = ('range', 'iter_inorder', 'iter_reversed', 'iter_preorder', 'iter_postorder')
+ROTATIONS = ('rotate_left', 'rotate_right')
+DOUBLE_ROTATIONS = ('rotate_left_right', 'rotate_right_left')
+
+Callback = Callable[[str, dict], None]
+
+
+class OperationStats:
+    """The counters of one operation across all of its calls.
+
+    `nodes_visited` counts the nodes the searches of an operation stepped on,
+    whether guided by value, by rank or toward an extreme, and the nodes a
+    traversal yields. The walks that only restructure are not visits: retracing,
+    rotations, splaying and joins. `comparisons` counts the comparisons
+    against the values in the tree, not those of heights, sizes or priorities.
+    """
+
+    __slots__ = ['calls', 'total_ns', 'comparisons', 'nodes_visited', 'rotations',
+                 'latency_histogram', 'depth_histogram']
+
+    def __init__(self):
+        self.calls = 0
+        self.total_ns = 0
+        self.comparisons = 0
+        self.nodes_visited = 0
+        self.rotations = 0
+        # Bucket b counts the calls that took [2^(b-1), 2^b) nanoseconds.
+        self.latency_histogram: dict[int, int] = {}
+        # Sampled number of nodes a call visited, for a descent the depth it reached plus one.
+        self.depth_histogram: dict[int, int] = {}
+
+    def as_dict(self) -> dict:
+        return {
+            'calls': self.calls,
+            'total_ns': self.total_ns,
+            'comparisons': self.comparisons,
+            'nodes_visited': self.nodes_visited,
+            'rotations': self.rotations,
+            'latency_histogram': {1 << bucket: count
+                                  for bucket, count in sorted(self.latency_histogram.items())},
+            'depth_histogram': dict(sorted(self.depth_histogram.items())),
+        }
+
+
+class TreeStats:
+    """Everything an instrumented tree has counted so far."""
+
+    def __init__(self, callback: Optional[Callback] = None, sample_every: int = 1):
+        assert sample_every > 0
+        self.callback = callback
+        self.sample_every = sample_every
+        self.operations: dict[str, OperationStats] = {}
+        self.rotations = dict.fromkeys(ROTATIONS + DOUBLE_ROTATIONS, 0)
+        # The record of the outermost operation in progress, None in between.
+        self._current: Optional[dict] = None
+
+    def reset(self) -> None:
+        self.operations.clear()
+        self.rotations = dict.fromkeys(self.rotations, 0)
+
+    def as_dict(self) -> dict:
+        return {
+            'operations': {name: stats.as_dict() for name, stats in self.operations.items()},
+            'rotations': dict(self.rotations),
+        }
+
+    def count(self, visited: int, comparisons: int = 0) -> None:
+        """Adds to the operation in progress, if there is one."""
+        record = self._current
+        if record is not None:
+            record['nodes_visited'] += visited
+            record['comparisons'] += comparisons
+
+    def _record(self, operation: str, record: dict) -> None:
+        stats = self.operations.get(operation)
+        if stats is None:
+            stats = self.operations[operation] = OperationStats()
+        stats.calls += 1
+        stats.total_ns += record['elapsed_ns']
+        stats.comparisons += record['comparisons']
+        stats.nodes_visited += record['nodes_visited']
+        stats.rotations += record['rotations']
+        bucket = record['elapsed_ns'].bit_length()
+        stats.latency_histogram[bucket] = stats.latency_histogram.get(bucket, 0) + 1
+        if record['nodes_visited'] and stats.calls % self.sample_every == 0:
+            depth = record['nodes_visited']
+            stats.depth_histogram[depth] = stats.depth_histogram.get(depth, 0) + 1
+        if self.callback is not None:
+            self.callback(operation, record)
+
+
+def _new_record() -> dict:
+    return {'elapsed_ns': 0, 'comparisons': 0, 'nodes_visited': 0, 'rotations': 0}
+
+
+def _timed(name: str, method: Callable, run: Callable) -> Callable:
+    """Times `run`, the method or its counted twin, and records it as `name`."""
+    @wraps(method)
+    def timed(self: Any, *args: Any, **kwargs: Any) -> Any:
+        stats: TreeStats = self._stats
+        if stats._current is not None:
+            # Nested inside another operation, which is counted as a whole.
+            return run(self, *args, **kwargs)
+
+        record = stats._current = _new_record()
+        started = time.perf_counter_ns()
+        try:
+            return run(self, *args, **kwargs)
+        finally:
+            record['elapsed_ns'] = time.perf_counter_ns() - started
+            stats._current = None
+            stats._record(name, record)
+    return timed
+
+
+def _recorded(name: str, method: Callable, run: Callable) -> Callable:
+    """Same as `_timed` for a method returning a lazy iterator."""
+    @wraps(method)
+    def recorded(self: Any, *args: Any, **kwargs: Any) -> Iterator[Any]:
+        stats: TreeStats = self._stats
+        if stats._current is not None:
+            return run(self, *args, **kwargs)
+        return _iteration(stats, name, run(self, *args, **kwargs))
+    return recorded
+
+
+def _iteration(stats: TreeStats, name: str, iterator: Iterator[Any]) -> Iterator[Any]:
+    """Makes its own record the operation in progress for the duration of every
+    `next`, so that only the time spent in the tree is counted, and records it
+    once the iteration is exhausted or closed.
+    """
+    record = _new_record()
+    try:
+        while True:
+            outer, stats._current = stats._current, record
+            started = time.perf_counter_ns()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+            finally:
+                record['elapsed_ns'] += time.perf_counter_ns() - started
+                stats._current = outer
+            yield item
+    finally:
+        stats._record(name, record)
+
+
+def _counted_rotation(name: str, method: Callable) -> Callable:
+    @wraps(method)
+    def counted(self: Any, *args: Any, **kwargs: Any) -> Any:
+        stats: TreeStats = self._stats
+        stats.rotations[name] += 1
+        if stats._current is not None and name in ROTATIONS:
+            stats._current['rotations'] += 1
+        return method(self, *args, **kwargs)
+    return counted
+
+
+_instrumented_classes: dict[type, type] = {}
+
+
+def instrumented_class(tree_class: type) -> type:
+    """The instrumented subclass of `tree_class`, generated once and cached."""
+    if getattr(tree_class, '_instrumented', False):
+        return tree_class
+    cls = _instrumented_classes.get(tree_class)
+    if cls is not None:
+        return cls
+
+    namespace = {'_instrumented': True}
+    for twin in dir(tree_class):
+        if twin.endswith('_counted'):
+            name = twin[:-len('_counted')]
+            # Only a twin defined alongside the method it stands in for.
+            owner = next((cls for cls in tree_class.__mro__ if name in cls.__dict__), None)
+            if owner is not None and twin in owner.__dict__:
+                namespace[name] = owner.__dict__[twin]
+    for name in OPERATIONS:
+        method = getattr(tree_class, name)
+        namespace[name] = _timed(name, method, namespace.get(name, method))
+    for name in ITERATIONS:
+        method = getattr(tree_class, name)
+        namespace[name] = _recorded(name, method, namespace.get(name, method))
+    for name in ROTATIONS + DOUBLE_ROTATIONS:
+        if hasattr(tree_class, name):
+            namespace[name] = _counted_rotation(name, getattr(tree_class, name))
+
+    cls = _instrumented_classes[tree_class] = type(
+        f'Instrumented{tree_class.__name__}', (tree_class,), namespace)
+    return cls
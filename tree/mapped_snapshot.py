@@ -0,0 +1,243 @@
+import mmap
+import os
+import struct
+import sys
+from array import array
+from typing import Any, Iterable, Iterator, Optional, Union
+
+_HEADER = struct.Struct('<4sBccBQ')
+MAGIC = b'EYTZ'
+FORMAT_VERSION = 1
+_BYTE_ORDERS = {'little': 0, 'big': 1}
+
+
+class MappedSnapshot:
+    """A read-only, memory-mapped copy of the keys of a tree.
+
+    The file holds the N fixed-width keys in Eytzinger (BFS) order, the implicit
+    tree where the children of slot k are slots 2k and 2k + 1, followed by the
+    1-based in-order rank of every slot. A descent reads slots 1, 2-3, 4-7, ...,
+    so the top levels of every lookup share the same few pages.
+
+    The keys are read straight out of the mapping through a typed `memoryview`,
+    nothing is copied on open. Processes that map the same file share one copy
+    of it in the page cache, which also makes opening a large snapshot close to
+    instant. The file is written in native byte order and is refused elsewhere.
+
+        MappedSnapshot.write('keys.eytz', avl_tree.iter_inorder())
+        with MappedSnapshot('keys.eytz') as snapshot:
+            snapshot.ceiling(42)
+    """
+
+    def __init__(self, path: Union[str, os.PathLike]):
+        with open(path, 'rb') as file:
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            magic, version, typecode, rank_typecode, byte_order, count = \
+                _HEADER.unpack_from(self._mmap)
+            if magic != MAGIC:
+                raise ValueError('not a mapped snapshot')
+            if version != FORMAT_VERSION:
+                raise ValueError(f'unsupported mapped snapshot version {version}')
+            if byte_order != _BYTE_ORDERS[sys.byteorder]:
+                raise ValueError('mapped snapshot written with another byte order')
+
+            view = memoryview(self._mmap)
+            keys_end = _HEADER.size + count * array(typecode.decode()).itemsize
+            ranks_start = _align(keys_end)
+            ranks_end = ranks_start + count * array(rank_typecode.decode()).itemsize
+            if len(view) < ranks_end:
+                view.release()
+                raise ValueError('truncated mapped snapshot')
+            self._keys = view[_HEADER.size:keys_end].cast(typecode.decode())
+            self._ranks = view[ranks_start:ranks_end].cast(rank_typecode.decode())
+            view.release()
+        except BaseException:
+            self._mmap.close()
+            raise
+        self._count = count
+
+    @staticmethod
+    def write(
+            path: Union[str, os.PathLike], keys: Iterable[Any], typecode: str = 'q'
+    ) -> None:
+        """Runs in O(N), `keys` have to be strictly increasing, as the in-order
+        walk of a tree yields them.
+        """
+        ordered = array(typecode, keys)
+        count = len(ordered)
+        for i in range(1, count):
+            if not ordered[i - 1] < ordered[i]:
+                raise ValueError(f'{ordered[i]!r} breaks the strictly increasing order')
+
+        eytzinger = array(typecode, bytes(count * ordered.itemsize))
+        rank_typecode = 'I' if count < 2 ** 32 else 'Q'
+        ranks = array(rank_typecode, bytes(count * array(rank_typecode).itemsize))
+        # An in-order walk of the implicit tree visits its slots in key order.
+        rank = 0
+        stack = []
+        k = 1
+        while stack or k <= count:
+            while k <= count:
+                stack.append(k)
+                k *= 2
+            k = stack.pop()
+            eytzinger[k - 1] = ordered[rank]
+            rank += 1
+            ranks[k - 1] = rank
+            k = 2 * k + 1
+
+        header = _HEADER.pack(MAGIC, FORMAT_VERSION, typecode.encode(), rank_typecode.encode(),
+                              _BYTE_ORDERS[sys.byteorder], count)
+        with open(path, 'wb') as file:
+            file.write(header)
+            file.write(eytzinger.tobytes())
+            file.write(bytes(_align(file.tell()) - file.tell()))
+            file.write(ranks.tobytes())
+
+    def close(self) -> None:
+        """Releases the views before the mapping, which refuses to close while
+        they are exported.
+        """
+        self._keys.release()
+        self._ranks.release()
+        self._mmap.close()
+
+    def __enter__(self) -> 'MappedSnapshot':
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}({self._count} keys)'
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def typecode(self) -> str:
+        return self._keys.format
+
+    # ========== Implicit tree ==========
+
+    def _lower_bound(self, key: Any) -> int:
+        """Runs in O(log N). The slot of the smallest key >= `key`, 0 if none.
+
+        The descent runs to the bottom without an equality test, going right
+        while the slot is smaller. The trailing right turns plus the last left
+        turn are then undone, which lands on the last slot it turned left at.
+        """
+        keys, count = self._keys, self._count
+        k = 1
+        while k <= count:
+            k = 2 * k + (keys[k - 1] < key)
+        return k >> (~k & (k + 1)).bit_length()
+
+    def _upper_bound(self, key: Any) -> int:
+        """Runs in O(log N). The slot of the smallest key > `key`, 0 if none."""
+        keys, count = self._keys, self._count
+        k = 1
+        while k <= count:
+            k = 2 * k + (keys[k - 1] <= key)
+        return k >> (~k & (k + 1)).bit_length()
+
+    def _previous(self, k: int) -> int:
+        """Runs in O(log N). The in-order predecessor of slot `k`, of the largest
+        key if `k` is 0, and 0 if there is none.
+        """
+        count = self._count
+        if k == 0:
+            k = 1
+            while 2 * k + 1 <= count:
+                k = 2 * k + 1
+            return k if count else 0
+        if 2 * k <= count:
+            k *= 2
+            while 2 * k + 1 <= count:
+                k = 2 * k + 1
+            return k
+        # Climb while `k` is a left child, its parent then comes before it.
+        while not k & 1:
+            k >>= 1
+        return k >> 1
+
+    def _key(self, k: int) -> Optional[Any]:
+        return None if k == 0 else self._keys[k - 1]
+
+    # ========== Query operations ==========
+
+    def __contains__(self, key: Any) -> bool:
+        k = self._lower_bound(key)
+        return k != 0 and self._keys[k - 1] == key
+
+    def search(self, key: Any) -> Optional[Any]:
+        """Runs in O(log N). The key if it is in the snapshot, None otherwise."""
+        return key if key in self else None
+
+    def find_min(self) -> Optional[Any]:
+        # The leftmost slot is the largest power of two that exists.
+        return self._key(1 << (self._count.bit_length() - 1) if self._count else 0)
+
+    def find_max(self) -> Optional[Any]:
+        return self._key(self._previous(0))
+
+    def floor(self, key: Any) -> Optional[Any]:
+        """Runs in O(log N). The largest key <= `key`."""
+        return self._key(self._previous(self._upper_bound(key)))
+
+    def ceiling(self, key: Any) -> Optional[Any]:
+        """Runs in O(log N). The smallest key >= `key`."""
+        return self._key(self._lower_bound(key))
+
+    def lower(self, key: Any) -> Optional[Any]:
+        """Runs in O(log N). The largest key < `key`."""
+        return self._key(self._previous(self._lower_bound(key)))
+
+    def higher(self, key: Any) -> Optional[Any]:
+        """Runs in O(log N). The smallest key > `key`."""
+        return self._key(self._upper_bound(key))
+
+    def successor(self, key: Any) -> Optional[Any]:
+        """Same as `higher`."""
+        return self.higher(key)
+
+    def predecessor(self, key: Any) -> Optional[Any]:
+        """Same as `lower`."""
+        return self.lower(key)
+
+    def rank(self, key: Any) -> Optional[int]:
+        """Runs in O(log N). The 1-based position of `key`, None if it is absent."""
+        k = self._lower_bound(key)
+        if k == 0 or self._keys[k - 1] != key:
+            return None
+        return self._ranks[k - 1]
+
+    def _count_below(self, key: Any, inclusive: bool = False) -> int:
+        k = self._upper_bound(key) if inclusive else self._lower_bound(key)
+        return self._count if k == 0 else self._ranks[k - 1] - 1
+
+    def count_range(self, lo: Any, hi: Any) -> int:
+        """Runs in O(log N), counts the keys k such that lo <= k <= hi."""
+        if hi < lo:
+            return 0
+        return self._count_below(hi, inclusive=True) - self._count_below(lo)
+
+    def __iter__(self) -> Iterator[Any]:
+        """Yields the keys in ascending order, an in-order walk of the implicit
+        tree with O(log N) extra memory.
+        """
+        keys, count = self._keys, self._count
+        stack = []
+        k = 1
+        while stack or k <= count:
+            while k <= count:
+                stack.append(k)
+                k *= 2
+            k = stack.pop()
+            yield keys[k - 1]
+            k = 2 * k + 1
+
+
+def _align(offset: int, alignment: int = 8) -> int:
+    return -(-offset // alignment) * alignment
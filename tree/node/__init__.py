@@ -1,4 +1,8 @@
+from .avl_map_node import AVLMapNode
 from .avl_node import AVLNode
 from .bst_node import BSTNode
+from .persistent_avl_node import PersistentAVLNode
+from .rb_node import RBNode
+from .treap_node import TreapNode
 
-__all__ = ['BSTNode', 'AVLNode', ]
+__all__ = ['BSTNode', 'AVLNode', 'AVLMapNode', 'PersistentAVLNode', 'RBNode', 'TreapNode', ]
@@ -0,0 +1,43 @@
+from typing import Any, Optional
+
+from .avl_node import AVLNode
+
+_SAME_AS_VALUE = object()
+
+
+class AVLMapNode(AVLNode):
+    """The node of an AVL Map.
+
+    `value` stays the ordering key the tree algorithms compare, `key` is the key
+    the map was given and `payload` is what it maps to. Without a key function
+    `key` and `value` are the same object.
+    """
+
+    __slots__ = ['_key', '_payload']
+
+    def __init__(
+            self,
+            value: Any,
+            parent: Optional['AVLMapNode'] = None,
+            *,
+            key: Any = _SAME_AS_VALUE,
+            payload: Any = None,
+    ):
+        self._key = value if key is _SAME_AS_VALUE else key
+        self._payload = payload
+        super().__init__(value=value, parent=parent)
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}({self._key!r}: {self._payload!r})'
+
+    @property
+    def key(self) -> Any:
+        return self._key
+
+    @property
+    def payload(self) -> Any:
+        return self._payload
+
+    @payload.setter
+    def payload(self, payload: Any) -> None:
+        self._payload = payload
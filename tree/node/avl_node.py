@@ -37,27 +37,21 @@ class AVLNode(BSTNode):
         return super().left
 
     @left.setter
-    def left(self, node: 'AVLNode') -> None:
-        assert isinstance(node, AVLNode)
+    def left(self, node: Optional['AVLNode']) -> None:
+        assert node is None or isinstance(node, AVLNode)
         self._left = node
 
     @property
     def height(self) -> int:
         return self._height
 
-    def add_child(
-            self, node: 'AVLNode', *, to_left: bool = False, to_right: bool = False
-    ) -> None:
-        super().add_child(node=node, to_left=to_left, to_right=to_right)
-        self.update_height()
-
     @property
     def left_child_height(self) -> int:
-        return 0 if self._left is None else self._left.height
+        return -1 if self._left is None else self._left.height
 
     @property
     def right_child_height(self) -> int:
-        return 0 if self._right is None else self._right.height
+        return -1 if self._right is None else self._right.height
 
     def update_height(self) -> None:
         """To have efficient performance, we shall not maintain `height` attribute via
@@ -68,6 +62,24 @@ class AVLNode(BSTNode):
         """
         self._height = max(self.left_child_height, self.right_child_height) + 1
 
+    def update(self) -> None:
+        # Inlined, this runs on every rotation.
+        left, right = self._left, self._right
+        if left is None:
+            left_height, left_size = -1, 0
+        else:
+            left_height, left_size = left._height, left._size
+        if right is None:
+            right_height, right_size = -1, 0
+        else:
+            right_height, right_size = right._height, right._size
+        self._height = (left_height if left_height > right_height else right_height) + 1
+        self._size = left_size + right_size + 1
+
+    def adopt(self, node: 'AVLNode') -> None:
+        self._height = node._height
+        super().adopt(node)
+
     @property
     def balance_factor(self) -> int:
         return self.left_child_height - self.right_child_height
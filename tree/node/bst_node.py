@@ -4,7 +4,7 @@ from typing import Any, Optional
 class BSTNode:
     """The node of a Binary Search Tree."""
 
-    __slots__ = ['_parent', '_right', '_left', '_value']
+    __slots__ = ['_parent', '_right', '_left', '_value', '_size']
 
     def __init__(self, value: Any, parent: Optional['BSTNode'] = None):
         assert parent is None or isinstance(parent, BSTNode)
@@ -12,6 +12,7 @@ class BSTNode:
         self._right: Optional['BSTNode'] = None
         self._left: Optional['BSTNode'] = None
         self._value = value
+        self._size = 1
 
         if parent:
             parent.add_child(node=self)
@@ -52,6 +53,64 @@ class BSTNode:
     def value(self) -> Any:
         return self._value
 
+    @property
+    def size(self) -> int:
+        """The number of nodes in the subtree rooted at this node."""
+        return self._size
+
+    @property
+    def left_child_size(self) -> int:
+        return 0 if self._left is None else self._left._size
+
+    @property
+    def right_child_size(self) -> int:
+        return 0 if self._right is None else self._right._size
+
+    def update_size(self) -> None:
+        """O(1), the children are expected to hold an up to date `size`."""
+        self._size = self.left_child_size + self.right_child_size + 1
+
+    def update(self) -> None:
+        """Recompute every augmented attribute of the node from its children."""
+        # Inlined, this runs on every rotation.
+        left, right = self._left, self._right
+        self._size = (0 if left is None else left._size) + (0 if right is None else right._size) + 1
+
+    def set_children(
+            self, *, left: Optional['BSTNode'], right: Optional['BSTNode']
+    ) -> None:
+        """O(1), replaces both children at once and refreshes this node. Unlike the
+        `left`/`right` setters it may overwrite existing children, which is what
+        the bulk builders need.
+        """
+        self._left = left
+        self._right = right
+        if left is not None:
+            left._parent = self
+        if right is not None:
+            right._parent = self
+        self.update()
+
+    def adopt(self, node: 'BSTNode') -> None:
+        """O(1). Takes over the children and the augmented attributes of `node`, which
+        is left childless. Moves this node into the place of `node` as far as the
+        subtree below is concerned.
+        """
+        self._left, self._right = node._left, node._right
+        if self._left is not None:
+            self._left._parent = self
+        if self._right is not None:
+            self._right._parent = self
+        self._size = node._size
+        node._left = node._right = None
+
+    def update_ancestors(self) -> None:
+        """Runs in O(h), refreshes this node and every node up to the root."""
+        current = self
+        while current is not None:
+            current.update()
+            current = current._parent
+
     @property
     def is_leaf(self) -> bool:
         return not bool(self._left or self._right)
@@ -78,6 +137,7 @@ class BSTNode:
         elif to_right or self._value < node._value:
             self._right = node
             node._parent = self
+        self.update_ancestors()
 
     def remove(self) -> None:
         assert self.is_leaf
@@ -86,8 +146,20 @@ class BSTNode:
             self._parent._right = None
         else:
             self._parent._left = None
+        self._parent.update_ancestors()
 
-    def replace(self, node: 'BSTNode') -> None:
-        assert isinstance(node, BSTNode)
-        # TODO
-        raise NotImplemented
+    def replace(self, node: Optional['BSTNode']) -> None:
+        """O(1). Hands the place of this node under its parent over to `node` and
+        detaches this node from the parent. The augmented attributes of the
+        ancestors are left for the caller to refresh.
+        """
+        assert node is None or isinstance(node, BSTNode)
+        parent = self._parent
+        if parent is not None:
+            if parent._left is self:
+                parent._left = node
+            else:
+                parent._right = node
+        if node is not None:
+            node._parent = parent
+        self._parent = None
@@ -0,0 +1,54 @@
+from typing import Any, Optional
+
+
+class PersistentAVLNode:
+    """The immutable node of a persistent AVL Tree.
+
+    There is no parent pointer: a node may be the child of nodes in any number of
+    tree versions at once. Height and size are computed once, on construction.
+    """
+
+    __slots__ = ['_left', '_right', '_value', '_size', '_height']
+
+    def __init__(
+            self,
+            value: Any,
+            left: Optional['PersistentAVLNode'] = None,
+            right: Optional['PersistentAVLNode'] = None,
+    ):
+        self._left = left
+        self._right = right
+        self._value = value
+        if left is None:
+            if right is None:
+                self._size, self._height = 1, 0
+            else:
+                self._size, self._height = right._size + 1, right._height + 1
+        elif right is None:
+            self._size, self._height = left._size + 1, left._height + 1
+        else:
+            self._size = left._size + right._size + 1
+            self._height = max(left._height, right._height) + 1
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}({self._value})'
+
+    @property
+    def left(self) -> Optional['PersistentAVLNode']:
+        return self._left
+
+    @property
+    def right(self) -> Optional['PersistentAVLNode']:
+        return self._right
+
+    @property
+    def value(self) -> Any:
+        return self._value
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    @property
+    def height(self) -> int:
+        return self._height
@@ -0,0 +1,22 @@
+from typing import Any, Optional
+
+from .bst_node import BSTNode
+
+
+class RBNode(BSTNode):
+    """The node of a Red-Black Tree. A new node is red."""
+
+    __slots__ = ['_red']
+
+    def __init__(self, value: Any, parent: Optional['RBNode'] = None):
+        assert parent is None or isinstance(parent, RBNode)
+        self._red = True
+        super().__init__(value=value, parent=parent)
+
+    @property
+    def is_red(self) -> bool:
+        return self._red
+
+    def adopt(self, node: 'RBNode') -> None:
+        self._red = node._red
+        super().adopt(node)
@@ -0,0 +1,23 @@
+from random import random
+from typing import Any, Optional
+
+from .bst_node import BSTNode
+
+
+class TreapNode(BSTNode):
+    """The node of a Treap, with a random priority drawn once at creation."""
+
+    __slots__ = ['_priority']
+
+    def __init__(self, value: Any, parent: Optional['TreapNode'] = None):
+        assert parent is None or isinstance(parent, TreapNode)
+        self._priority = random()
+        super().__init__(value=value, parent=parent)
+
+    @property
+    def priority(self) -> float:
+        return self._priority
+
+    def adopt(self, node: 'TreapNode') -> None:
+        self._priority = node._priority
+        super().adopt(node)
@@ -0,0 +1,306 @@
+from typing import Any, Iterable, Iterator, Optional
+
+from .node import PersistentAVLNode
+
+
+def _height(node: Optional[PersistentAVLNode]) -> int:
+    return -1 if node is None else node._height
+
+
+class PersistentAVLTree:
+    """An immutable AVL Tree. `insert` and `remove` leave the tree they are called on
+    untouched and return a new version of it.
+
+    A new version copies only the O(log N) nodes on the path to the change and
+    shares every other subtree with the version it came from, so keeping any
+    number of old versions around for consistent reads or rollback costs
+    O(log N) nodes per update rather than a copy of the whole tree.
+
+    Nodes have no parent pointer, which would tie a subtree to a single parent.
+    Every algorithm descends from the root instead, and values are answered by
+    value, like `ArrayAVLTree`.
+    """
+
+    __slots__ = ['_root']
+
+    def __init__(self, root: Optional[PersistentAVLNode] = None):
+        assert root is None or isinstance(root, PersistentAVLNode)
+        self._root = root
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}({self.inorder_traversal()})'
+
+    @property
+    def root(self) -> Optional[PersistentAVLNode]:
+        return self._root
+
+    def __len__(self) -> int:
+        return 0 if self._root is None else self._root._size
+
+    @property
+    def height(self) -> int:
+        return _height(self._root)
+
+    # ========== Query operations ==========
+
+    def _find(self, value: Any) -> Optional[PersistentAVLNode]:
+        current = self._root
+        while current is not None:
+            current_value = current._value
+            if current_value == value:
+                return current
+            current = current._right if current_value < value else current._left
+        return None
+
+    def __contains__(self, value: Any) -> bool:
+        return self._find(value) is not None
+
+    def search(self, value: Any) -> Optional[Any]:
+        """Runs in O(log N). The value if it is in the tree, None otherwise."""
+        node = self._find(value)
+        return None if node is None else node._value
+
+    def find_min(self) -> Optional[Any]:
+        current = self._root
+        if current is None:
+            return None
+        while current._left is not None:
+            current = current._left
+        return current._value
+
+    def find_max(self) -> Optional[Any]:
+        current = self._root
+        if current is None:
+            return None
+        while current._right is not None:
+            current = current._right
+        return current._value
+
+    def floor(self, value: Any) -> Optional[Any]:
+        """Runs in O(log N). The largest value <= `value`."""
+        current, candidate = self._root, None
+        while current is not None:
+            if current._value == value:
+                return current._value
+            if current._value < value:
+                candidate, current = current, current._right
+            else:
+                current = current._left
+        return None if candidate is None else candidate._value
+
+    def ceiling(self, value: Any) -> Optional[Any]:
+        """Runs in O(log N). The smallest value >= `value`."""
+        current, candidate = self._root, None
+        while current is not None:
+            if current._value == value:
+                return current._value
+            if current._value > value:
+                candidate, current = current, current._left
+            else:
+                current = current._right
+        return None if candidate is None else candidate._value
+
+    def lower(self, value: Any) -> Optional[Any]:
+        """Runs in O(log N). The largest value < `value`."""
+        current, candidate = self._root, None
+        while current is not None:
+            if current._value < value:
+                candidate, current = current, current._right
+            else:
+                current = current._left
+        return None if candidate is None else candidate._value
+
+    def higher(self, value: Any) -> Optional[Any]:
+        """Runs in O(log N). The smallest value > `value`."""
+        current, candidate = self._root, None
+        while current is not None:
+            if current._value > value:
+                candidate, current = current, current._left
+            else:
+                current = current._right
+        return None if candidate is None else candidate._value
+
+    def rank(self, value: Any) -> Optional[int]:
+        """Runs in O(log N). The 1-based position of `value`, None if it is absent."""
+        current, rank = self._root, 0
+        while current is not None:
+            left_size = 0 if current._left is None else current._left._size
+            if current._value < value:
+                rank += left_size + 1
+                current = current._right
+            elif current._value > value:
+                current = current._left
+            else:
+                return rank + left_size + 1
+        return None
+
+    def select(self, rank: int) -> Optional[Any]:
+        """Runs in O(log N). The `rank`-th smallest value (1-based)."""
+        if not 1 <= rank <= len(self):
+            return None
+        current = self._root
+        while True:
+            left_size = 0 if current._left is None else current._left._size
+            if rank <= left_size:
+                current = current._left
+            elif rank == left_size + 1:
+                return current._value
+            else:
+                rank -= left_size + 1
+                current = current._right
+
+    def iter_inorder(self) -> Iterator[Any]:
+        """Lazily yields the values in ascending order. Later versions cannot
+        disturb the walk, the nodes it holds never change.
+        """
+        current = self._root
+        stack = []
+        while stack or current is not None:
+            while current is not None:
+                stack.append(current)
+                current = current._left
+            current = stack.pop()
+            yield current._value
+            current = current._right
+
+    def iter_reversed(self) -> Iterator[Any]:
+        current = self._root
+        stack = []
+        while stack or current is not None:
+            while current is not None:
+                stack.append(current)
+                current = current._right
+            current = stack.pop()
+            yield current._value
+            current = current._left
+
+    def __iter__(self) -> Iterator[Any]:
+        return self.iter_inorder()
+
+    def __reversed__(self) -> Iterator[Any]:
+        return self.iter_reversed()
+
+    def inorder_traversal(self) -> list[Any]:
+        return list(self.iter_inorder())
+
+    # ========== Update operations ==========
+
+    def insert(self, value: Any) -> 'PersistentAVLTree':
+        """Runs in O(log N) and allocates O(log N) nodes. Returns the new version."""
+        return type(self)(root=self._insert(self._root, value))
+
+    def remove(self, value: Any) -> 'PersistentAVLTree':
+        """Runs in O(log N) and allocates O(log N) nodes. Returns the new version."""
+        return type(self)(root=self._remove(self._root, value))
+
+    @classmethod
+    def _insert(cls, node: Optional[PersistentAVLNode], value: Any) -> PersistentAVLNode:
+        if node is None:
+            return PersistentAVLNode(value)
+        if value < node._value:
+            return cls._balance(cls._insert(node._left, value), node._value, node._right)
+        if node._value < value:
+            return cls._balance(node._left, node._value, cls._insert(node._right, value))
+        raise ValueError(f'{value!r} already in tree')
+
+    @classmethod
+    def _remove(cls, node: Optional[PersistentAVLNode], value: Any) -> Optional[PersistentAVLNode]:
+        if node is None:
+            raise ValueError(f'{value!r} not found')
+        if value < node._value:
+            return cls._balance(cls._remove(node._left, value), node._value, node._right)
+        if node._value < value:
+            return cls._balance(node._left, node._value, cls._remove(node._right, value))
+        if node._left is None:
+            return node._right
+        if node._right is None:
+            return node._left
+        successor, right = cls._remove_min(node._right)
+        return cls._balance(node._left, successor, right)
+
+    @classmethod
+    def _remove_min(cls, node: PersistentAVLNode) -> tuple[Any, Optional[PersistentAVLNode]]:
+        if node._left is None:
+            return node._value, node._right
+        smallest, left = cls._remove_min(node._left)
+        return smallest, cls._balance(left, node._value, node._right)
+
+    @staticmethod
+    def _balance(
+            left: Optional[PersistentAVLNode], value: Any, right: Optional[PersistentAVLNode]
+    ) -> PersistentAVLNode:
+        """O(1), builds the node of `value` over `left` and `right`, whose heights
+        differ by at most 2, applying the single or double rotation an imbalance
+        needs. Rotating allocates new nodes rather than relinking old ones.
+        """
+        left_height, right_height = _height(left), _height(right)
+        if left_height > right_height + 1:
+            if _height(left._left) >= _height(left._right):
+                return PersistentAVLNode(
+                    left._value, left._left, PersistentAVLNode(value, left._right, right))
+            inner = left._right
+            return PersistentAVLNode(
+                inner._value,
+                PersistentAVLNode(left._value, left._left, inner._left),
+                PersistentAVLNode(value, inner._right, right))
+        if right_height > left_height + 1:
+            if _height(right._right) >= _height(right._left):
+                return PersistentAVLNode(
+                    right._value, PersistentAVLNode(value, left, right._left), right._right)
+            inner = right._left
+            return PersistentAVLNode(
+                inner._value,
+                PersistentAVLNode(value, left, inner._left),
+                PersistentAVLNode(right._value, inner._right, right._right))
+        return PersistentAVLNode(value, left, right)
+
+    # ========== Construction ==========
+
+    @classmethod
+    def from_sorted(cls, values: Iterable[Any]) -> 'PersistentAVLTree':
+        """Runs in O(N), builds a perfectly height-balanced tree out of strictly
+        increasing `values`.
+        """
+        values = list(values)
+        for i in range(1, len(values)):
+            if not values[i - 1] < values[i]:
+                raise ValueError(f'{values[i]!r} breaks the strictly increasing order')
+
+        def link(lo: int, hi: int) -> Optional[PersistentAVLNode]:
+            if lo >= hi:
+                return None
+            mid = (lo + hi) // 2
+            return PersistentAVLNode(values[mid], link(lo, mid), link(mid + 1, hi))
+
+        return cls(root=link(0, len(values)))
+
+    @classmethod
+    def create(cls, values: Iterable[Any] = ()) -> 'PersistentAVLTree':
+        """Runs in O(N log N), sorts and deduplicates `values` first."""
+        ordered = []
+        for value in sorted(values):
+            if not ordered or ordered[-1] != value:
+                ordered.append(value)
+        return cls.from_sorted(ordered)
+
+    def check_invariants(self) -> None:
+        """Runs in O(N), the debug pass over order, sizes, heights and balance."""
+        previous = None
+        stack = []
+        current = self._root
+        while stack or current is not None:
+            while current is not None:
+                stack.append(current)
+                current = current._left
+            node = stack.pop()
+            left, right = node._left, node._right
+            if previous is not None and not previous._value < node._value:
+                raise AssertionError(f'{previous} and {node} are out of order')
+            if node._size != (0 if left is None else left._size) + (0 if right is None else right._size) + 1:
+                raise AssertionError(f'{node} has a stale size {node._size}')
+            if node._height != max(_height(left), _height(right)) + 1:
+                raise AssertionError(f'{node} has a stale height {node._height}')
+            if abs(_height(left) - _height(right)) > 1:
+                raise AssertionError(f'{node} is not height-balanced')
+            previous = node
+            current = right
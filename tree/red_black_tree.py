@@ -0,0 +1,233 @@
+from typing import Any, BinaryIO, Iterable, Optional, Sequence
+
+from .bst import BinarySearchTree
+from .node import RBNode
+
+
+class RedBlackTree(BinarySearchTree):
+    """The Red-Black Tree.
+    Balanced Binary Search Tree.
+
+    Every node is red or black, the root is black, a red node has no red child and
+    every path from a node down to a missing child passes the same number of black
+    nodes. Height h ≤ 2 log2(N + 1).
+
+    The looser invariant than AVL makes for a taller tree but at most 2 rotations
+    per insert and 3 per removal, recolouring does the rest.
+    """
+
+    node_class = RBNode
+
+    def __init__(self, root: Optional[RBNode] = None):
+        super().__init__(root=root)
+        # Whether `_unlink` spliced out a black node and the child that took its
+        # place, for `_retrace` to restore the black heights.
+        self._removed_black = False
+        self._replacement: Optional[RBNode] = None
+
+    def __repr__(self) -> str:
+        return f'RedBlackTree({self.inorder_traversal()})'
+
+    def check_invariants(self) -> None:
+        """Runs in O(N log N), also checks that the root is black and that every path
+        down to a missing child passes the same number of black nodes.
+        """
+        super().check_invariants()
+        if self._root is not None and self._root._red:
+            raise AssertionError(f'root {self._root} is red')
+        black_height = None
+        for node in self._iter_inorder_nodes():
+            if node._left is not None and node._right is not None:
+                continue
+            blacks = 0
+            current = node
+            while current is not None:
+                blacks += not current._red
+                current = current._parent
+            if black_height is None:
+                black_height = blacks
+            elif blacks != black_height:
+                raise AssertionError(f'{node} has black height {blacks}, expected {black_height}')
+
+    def _check_node(self, node: RBNode) -> None:
+        super()._check_node(node)
+        if node._red:
+            for child in (node._left, node._right):
+                if child is not None and child._red:
+                    raise AssertionError(f'red {node} has red child {child}')
+
+    # ========== Update operations ==========
+
+    def insert(self, node: RBNode, start: Optional[RBNode] = None) -> None:
+        """Runs in O(log N), links `node` as a red leaf, then recolours up the path
+        and makes at most 2 rotations.
+        """
+        assert isinstance(node, RBNode)
+        node._red = True
+        super().insert(node=node, start=start)
+
+        parent = node._parent
+        while parent is not None and parent._red:
+            # A red parent is never the root, so the grandparent exists.
+            grandparent = parent._parent
+            if parent is grandparent._left:
+                uncle = grandparent._right
+                if uncle is not None and uncle._red:
+                    parent._red = uncle._red = False
+                    grandparent._red = True
+                    node = grandparent
+                    parent = node._parent
+                    continue
+                if node is parent._right:
+                    self.rotate_left(node=parent)
+                    node, parent = parent, node
+                parent._red = False
+                grandparent._red = True
+                self.rotate_right(node=grandparent)
+            else:
+                uncle = grandparent._left
+                if uncle is not None and uncle._red:
+                    parent._red = uncle._red = False
+                    grandparent._red = True
+                    node = grandparent
+                    parent = node._parent
+                    continue
+                if node is parent._left:
+                    self.rotate_right(node=parent)
+                    node, parent = parent, node
+                parent._red = False
+                grandparent._red = True
+                self.rotate_left(node=grandparent)
+            break
+        self._root._red = False
+
+    def remove(self, node: RBNode) -> None:
+        """Runs in O(log N), at most 3 rotations."""
+        assert isinstance(node, RBNode)
+        super().remove(node=node)
+
+    def _unlink(self, node: RBNode, successor: Optional[RBNode] = None) -> Optional[RBNode]:
+        """Also remembers the child that took the place of the node actually spliced
+        out, if that node was black: one black node is then missing on its paths.
+        """
+        left, right = node._left, node._right
+        if left is None or right is None:
+            child = right if left is None else left
+            black = not node._red
+        else:
+            if successor is None:
+                successor = self.find_min(start=right)
+            child = successor._right
+            black = not successor._red
+        stale = super()._unlink(node, successor)
+        self._removed_black, self._replacement = black, child
+        return stale
+
+    def _retrace(self, node: Optional[RBNode]) -> None:
+        """Runs in O(log N). `node` is the parent of the child `_unlink` remembered,
+        if a black node was spliced out, that child carries an extra black up the
+        path until a red node or a rotation can absorb it.
+        """
+        super()._retrace(node)
+        if not self._removed_black:
+            return
+        child, parent = self._replacement, node
+        self._removed_black, self._replacement = False, None
+
+        while parent is not None and (child is None or not child._red):
+            if child is parent._left:
+                sibling = parent._right
+                if sibling._red:
+                    sibling._red = False
+                    parent._red = True
+                    self.rotate_left(node=parent)
+                    sibling = parent._right
+                near, far = sibling._left, sibling._right
+                if (near is None or not near._red) and (far is None or not far._red):
+                    sibling._red = True
+                    child, parent = parent, parent._parent
+                    continue
+                if far is None or not far._red:
+                    near._red = False
+                    sibling._red = True
+                    self.rotate_right(node=sibling)
+                    sibling = parent._right
+                sibling._red = parent._red
+                parent._red = False
+                sibling._right._red = False
+                self.rotate_left(node=parent)
+            else:
+                sibling = parent._left
+                if sibling._red:
+                    sibling._red = False
+                    parent._red = True
+                    self.rotate_right(node=parent)
+                    sibling = parent._left
+                near, far = sibling._right, sibling._left
+                if (near is None or not near._red) and (far is None or not far._red):
+                    sibling._red = True
+                    child, parent = parent, parent._parent
+                    continue
+                if far is None or not far._red:
+                    near._red = False
+                    sibling._red = True
+                    self.rotate_left(node=sibling)
+                    sibling = parent._left
+                sibling._red = parent._red
+                parent._red = False
+                sibling._left._red = False
+                self.rotate_right(node=parent)
+            child = self._root
+            break
+        if child is not None:
+            child._red = False
+
+    # ========== Bulk building ==========
+
+    @classmethod
+    def load(cls, fileobj: BinaryIO) -> 'RedBlackTree':
+        """Runs in O(N). The colours are not part of the format, so the loaded nodes
+        are relinked into a perfectly height-balanced tree instead of the dumped
+        shape.
+        """
+        tree = super(RedBlackTree, cls).load(fileobj)
+        return cls(root=cls._link_balanced(list(tree._iter_inorder_nodes())))
+
+    @classmethod
+    def create(
+            cls,
+            values: Iterable[Any] = (),
+            *,
+            empty: bool = False,
+            random: bool = False,
+            balanced: bool = True,
+    ) -> 'RedBlackTree':
+        """Same as `BinarySearchTree.create`, but bulk-builds by default since the
+        tree ends up balanced either way.
+        """
+        return super(RedBlackTree, cls).create(
+            values, empty=empty, random=random, balanced=balanced)
+
+    @staticmethod
+    def _link_balanced(nodes: Sequence[RBNode]) -> Optional[RBNode]:
+        """Runs in O(N). Every missing child of a perfectly height-balanced tree is at
+        the depth of the deepest level or one above, so colouring that deepest
+        level red and everything else black is a valid colouring.
+        """
+        root = BinarySearchTree._link_balanced(nodes)
+        level = [] if root is None else [root]
+        depth = 0
+        while level:
+            below = []
+            for node in level:
+                node._red = False
+                if node._left is not None:
+                    below.append(node._left)
+                if node._right is not None:
+                    below.append(node._right)
+            if not below and depth > 0:
+                for node in level:
+                    node._red = True
+            level = below
+            depth += 1
+        return root
@@ -0,0 +1,139 @@
+"""The binary format of `BinarySearchTree.dump` and `BinarySearchTree.load`.
+
+    header   '<4sBcQ': magic, format version, key kind, node count N
+    shape    ceil(N / 4) bytes, 2 bits per node in preorder: has left, has right
+    keys     the N values in preorder, either packed 8-byte little-endian
+             integers ('q') or floats ('d'), or one pickled list ('p')
+
+The shape and the preorder keys pin down every link, so loading needs neither
+comparisons nor rebalancing. Only the values are stored, the augmented size and
+height are derived again on load.
+"""
+import pickle
+import struct
+import sys
+from array import array
+from typing import Any, BinaryIO, Optional
+
+from .node import BSTNode
+
+MAGIC = b'BSTD'
+FORMAT_VERSION = 1
+
+_HEADER = struct.Struct('<4sBcQ')
+_LENGTH = struct.Struct('<Q')
+_INT64_MIN, _INT64_MAX = -2 ** 63, 2 ** 63 - 1
+
+
+def _key_kind(values: list[Any]) -> bytes:
+    """'q' if every value is a plain int in int64 range, 'd' if every value is a
+    float, 'p' otherwise. `bool` is left to pickle so it is not loaded as int.
+    """
+    if values and all(type(value) is int for value in values):
+        if _INT64_MIN <= min(values) and max(values) <= _INT64_MAX:
+            return b'q'
+    elif values and all(type(value) is float for value in values):
+        return b'd'
+    return b'p'
+
+
+def write_nodes(root: Optional[BSTNode], fileobj: BinaryIO) -> None:
+    """Runs in O(N) without recursion, so degenerate trees are fine."""
+    nodes = []
+    stack = [root] if root is not None else []
+    push, pop = stack.append, stack.pop
+    while stack:
+        node = pop()
+        nodes.append(node)
+        if node._right is not None:
+            push(node._right)
+        if node._left is not None:
+            push(node._left)
+
+    shape = bytearray((len(nodes) + 3) // 4)
+    for i, node in enumerate(nodes):
+        bits = (node._left is not None) << 1 | (node._right is not None)
+        if bits:
+            shape[i >> 2] |= bits << ((i & 3) << 1)
+
+    values = [node._value for node in nodes]
+    kind = _key_kind(values)
+    fileobj.write(_HEADER.pack(MAGIC, FORMAT_VERSION, kind, len(nodes)))
+    fileobj.write(shape)
+    if kind == b'p':
+        blob = pickle.dumps(values, protocol=pickle.HIGHEST_PROTOCOL)
+        fileobj.write(_LENGTH.pack(len(blob)))
+        fileobj.write(blob)
+    else:
+        packed = array(kind.decode(), values)
+        if sys.byteorder == 'big':
+            packed.byteswap()
+        fileobj.write(packed.tobytes())
+
+
+def _read_exactly(fileobj: BinaryIO, size: int) -> bytes:
+    data = fileobj.read(size)
+    if len(data) != size:
+        raise ValueError('truncated tree dump')
+    return data
+
+
+def read_nodes(node_class: type, fileobj: BinaryIO) -> Optional[BSTNode]:
+    """Runs in O(N): one pass links the nodes in preorder, one pass in reverse
+    preorder, where every child comes before its parent, refreshes the sizes and
+    heights. Returns the root.
+    """
+    magic, version, kind, count = _HEADER.unpack(_read_exactly(fileobj, _HEADER.size))
+    if magic != MAGIC:
+        raise ValueError('not a tree dump')
+    if version != FORMAT_VERSION:
+        raise ValueError(f'unsupported tree dump version {version}')
+
+    shape = _read_exactly(fileobj, (count + 3) // 4)
+    if kind == b'p':
+        length, = _LENGTH.unpack(_read_exactly(fileobj, _LENGTH.size))
+        values = pickle.loads(_read_exactly(fileobj, length))
+        if len(values) != count:
+            raise ValueError('corrupt tree dump')
+    elif kind in (b'q', b'd'):
+        values = array(kind.decode())
+        values.frombytes(_read_exactly(fileobj, count * values.itemsize))
+        if sys.byteorder == 'big':
+            values.byteswap()
+    else:
+        raise ValueError(f'unknown key kind {kind!r}')
+
+    if not count:
+        return None
+    nodes = [node_class(value=value) for value in values]
+    # Preorder: a node with a left child is followed by it, otherwise by its
+    # right child, and a leaf by the right child of the last node with both.
+    pending = []
+    parent, left_side = None, False
+    for i, node in enumerate(nodes):
+        if parent is not None:
+            if left_side:
+                parent._left = node
+            else:
+                parent._right = node
+            node._parent = parent
+        elif i:
+            raise ValueError('corrupt tree dump')
+
+        bits = shape[i >> 2] >> ((i & 3) << 1) & 3
+        if bits == 3:
+            pending.append(node)
+        if bits & 2:
+            parent, left_side = node, True
+        elif bits & 1:
+            parent, left_side = node, False
+        elif pending:
+            parent, left_side = pending.pop(), False
+        else:
+            parent = None
+    if parent is not None:
+        raise ValueError('corrupt tree dump')
+
+    for node in reversed(nodes):
+        node.update()
+    return nodes[0]
@@ -0,0 +1,77 @@
+from bisect import bisect_left, bisect_right
+from typing import Any, Iterable, Sequence
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+class SortedSnapshot:
+    """A flattened, sorted copy of the values of a tree that answers batches of
+    queries with binary searches over one contiguous array.
+
+    With NumPy installed, values that make a flat array of numbers or strings are
+    kept in an `ndarray` and every batch is a handful of vectorized `searchsorted`
+    calls, returning `ndarray`s. Other values (tuples, arbitrary objects) and
+    trees without NumPy fall back to `bisect` over a list and return lists.
+    """
+
+    __slots__ = ['_values', '_vectorized']
+
+    def __init__(self, values: Iterable[Any]):
+        values = list(values)
+        self._values, self._vectorized = values, False
+        if numpy is not None:
+            array = numpy.asarray(values)
+            if array.ndim == 1 and array.dtype != object:
+                self._values, self._vectorized = array, True
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    @property
+    def values(self) -> Sequence[Any]:
+        return self._values
+
+    def search_many(self, keys: Iterable[Any]) -> Sequence[bool]:
+        """O(M log N), whether each of `keys` is in the snapshot."""
+        if self._vectorized:
+            keys = numpy.asarray(keys)
+            values = self._values
+            if not len(values):
+                return numpy.zeros(keys.shape, dtype=bool)
+            index = numpy.searchsorted(values, keys, side='left')
+            return (index < len(values)) & (values[numpy.minimum(index, len(values) - 1)] == keys)
+
+        values = self._values
+        found = []
+        for key in keys:
+            i = bisect_left(values, key)
+            found.append(i < len(values) and values[i] == key)
+        return found
+
+    def rank_many(self, keys: Iterable[Any]) -> Sequence[int]:
+        """O(M log N), the 1-based rank of each of `keys`, 0 for absent keys."""
+        if self._vectorized:
+            keys = numpy.asarray(keys)
+            index = numpy.searchsorted(self._values, keys, side='left')
+            return numpy.where(self.search_many(keys), index + 1, 0)
+
+        values = self._values
+        ranks = []
+        for key in keys:
+            i = bisect_left(values, key)
+            ranks.append(i + 1 if i < len(values) and values[i] == key else 0)
+        return ranks
+
+    def count_range_many(self, lo: Iterable[Any], hi: Iterable[Any]) -> Sequence[int]:
+        """O(M log N), for each pair the number of values v such that lo <= v <= hi."""
+        if self._vectorized:
+            counts = (numpy.searchsorted(self._values, numpy.asarray(hi), side='right')
+                      - numpy.searchsorted(self._values, numpy.asarray(lo), side='left'))
+            return numpy.maximum(counts, 0)
+
+        values = self._values
+        return [max(bisect_right(values, high) - bisect_left(values, low), 0)
+                for low, high in zip(lo, hi)]
@@ -0,0 +1,123 @@
+from typing import Any, Optional
+
+from .bst import BinarySearchTree
+from .node import BSTNode
+
+
+class SplayTree(BinarySearchTree):
+    """The Splay Tree.
+    Self-adjusting Binary Search Tree.
+
+    `search`, `get`, `in`, `insert` and `remove` rotate the node they reached up
+    to the root, roughly halving the depth of every node on the way. No balance
+    information is kept: a single operation may take O(N), any sequence of M of
+    these operations takes O(M log N), and a key accessed often stays near the
+    root, so skewed lookups cost far less than log2 N.
+
+    The other queries (`floor`, `ceiling`, `lower`, `higher`, `successor`,
+    `predecessor`, `rank`, `select`, ...) and the traversals leave the tree as it
+    is, so the amortized bound does not cover them: each runs in O(h), which can
+    be O(N) until a splaying operation reshapes the tree.
+    """
+
+    node_class = BSTNode
+    self_adjusting = True
+
+    def __init__(self, root: Optional[BSTNode] = None):
+        super().__init__(root=root)
+
+    def __repr__(self) -> str:
+        return f'SplayTree({self.inorder_traversal()})'
+
+    def _splay(self, node: BSTNode) -> None:
+        """Amortized O(log N), rotates `node` up to the root two levels at a time:
+        zig-zig rotates the grandparent first, zig-zag rotates `node` twice.
+
+        Runs the detached `_rotate_left`/`_rotate_right` and sets the root once at
+        the end, an instrumented tree takes the public rotations through
+        `_rotate_up_counted` so that they get counted.
+        """
+        if node._parent is None:
+            return
+        rotate_up = self._rotate_up
+        parent = node._parent
+        while parent is not None:
+            grandparent = parent._parent
+            if grandparent is None:
+                rotate_up(node)
+                break
+            if (parent._left is node) == (grandparent._left is parent):
+                rotate_up(parent)
+                rotate_up(node)
+            else:
+                rotate_up(node)
+                rotate_up(node)
+            parent = node._parent
+        self._root = node
+
+    @classmethod
+    def _rotate_up(cls, node: BSTNode) -> None:
+        parent = node._parent
+        if parent._left is node:
+            cls._rotate_right(parent)
+        else:
+            cls._rotate_left(parent)
+
+    def _rotate_up_counted(self, node: BSTNode) -> None:
+        parent = node._parent
+        if parent._left is node:
+            self.rotate_right(node=parent)
+        else:
+            self.rotate_left(node=parent)
+
+    def _find(self, value: Any, start: Optional[BSTNode] = None) -> Optional[BSTNode]:
+        """Iterative descent, then splays the node holding `value` or, if there is
+        none, the last node visited.
+        """
+        current = self._root if start is None else start
+        last = None
+        while current is not None:
+            current_value = current._value
+            if current_value == value:
+                self._splay(current)
+                return current
+            last = current
+            current = current._right if current_value < value else current._left
+        if last is not None:
+            self._splay(last)
+        return None
+
+    def _find_counted(self, value: Any, start: Optional[BSTNode] = None) -> Optional[BSTNode]:
+        current = self._root if start is None else start
+        last = None
+        visited = comparisons = 0
+        while current is not None:
+            visited += 1
+            comparisons += 1
+            current_value = current._value
+            if current_value == value:
+                self._stats.count(visited, comparisons)
+                self._splay(current)
+                return current
+            comparisons += 1
+            last = current
+            current = current._right if current_value < value else current._left
+        self._stats.count(visited, comparisons)
+        if last is not None:
+            self._splay(last)
+        return None
+
+    # ========== Update operations ==========
+
+    def insert(self, node: BSTNode, start: Optional[BSTNode] = None) -> None:
+        """Amortized O(log N), links `node` as a leaf and splays it."""
+        super().insert(node=node, start=start)
+        self._splay(node)
+
+    def _retrace(self, node: Optional[BSTNode]) -> None:
+        """Settles the subtree sizes above a removal, then splays the parent of the
+        node spliced out.
+        """
+        super()._retrace(node)
+        if node is not None:
+            self._splay(node)
@@ -0,0 +1,102 @@
+from random import random
+from typing import BinaryIO, Optional, Sequence
+
+from .bst import BinarySearchTree
+from .node import TreapNode
+
+
+class Treap(BinarySearchTree):
+    """The randomized Treap.
+    Balanced Binary Search Tree, in expectation.
+
+    A BST on the values and a max-heap on the random priorities of the nodes at
+    the same time, which makes it shaped like a BST built by inserting the values
+    in a random order: expected height O(log N) whatever the order of the updates.
+
+    No balance information is maintained, an update makes less than 2 rotations
+    on average.
+    """
+
+    node_class = TreapNode
+
+    def __init__(self, root: Optional[TreapNode] = None):
+        super().__init__(root=root)
+
+    def __repr__(self) -> str:
+        return f'Treap({self.inorder_traversal()})'
+
+    def _check_node(self, node: TreapNode) -> None:
+        super()._check_node(node)
+        parent = node._parent
+        if parent is not None and parent._priority < node._priority:
+            raise AssertionError(f'{node} outranks its parent {parent}')
+
+    # ========== Update operations ==========
+
+    def insert(self, node: TreapNode, start: Optional[TreapNode] = None) -> None:
+        """Runs in expected O(log N), links `node` as a leaf, then rotates it up while
+        it outranks its parent.
+        """
+        assert isinstance(node, TreapNode)
+        super().insert(node=node, start=start)
+
+        parent = node._parent
+        while parent is not None and parent._priority < node._priority:
+            if node is parent._left:
+                self.rotate_right(node=parent)
+            else:
+                self.rotate_left(node=parent)
+            parent = node._parent
+
+    def remove(self, node: TreapNode) -> None:
+        """Runs in expected O(log N)."""
+        assert isinstance(node, TreapNode)
+        super().remove(node=node)
+
+    def _unlink(self, node: TreapNode, successor: Optional[TreapNode] = None) -> Optional[TreapNode]:
+        """Rotates `node` down below its higher-ranked child until it has at most one
+        child, where splicing it out keeps the heap order. No successor is spliced,
+        so `successor` goes unused.
+        """
+        left, right = node._left, node._right
+        while left is not None and right is not None:
+            if left._priority > right._priority:
+                self.rotate_right(node=node)
+            else:
+                self.rotate_left(node=node)
+            left, right = node._left, node._right
+        return super()._unlink(node)
+
+    # ========== Bulk building ==========
+
+    @classmethod
+    def load(cls, fileobj: BinaryIO) -> 'Treap':
+        """Runs in O(N log N), keeps the dumped shape and draws fresh priorities for
+        it, the priorities are not part of the format.
+        """
+        tree = super(Treap, cls).load(fileobj)
+        cls._prioritize(tree._root)
+        return tree
+
+    @staticmethod
+    def _link_balanced(nodes: Sequence[TreapNode]) -> Optional[TreapNode]:
+        """Runs in O(N log N), links a perfectly height-balanced tree and redraws the
+        priorities to fit its shape.
+        """
+        root = BinarySearchTree._link_balanced(nodes)
+        Treap._prioritize(root)
+        return root
+
+    @staticmethod
+    def _prioritize(root: Optional[TreapNode]) -> None:
+        """Hands out fresh random priorities in decreasing order level by level, so
+        every parent outranks its children whatever the shape below `root`.
+        """
+        level = [] if root is None else [root]
+        nodes = []
+        while level:
+            nodes.extend(level)
+            level = [child for node in level for child in (node._left, node._right) if child is not None]
+        priorities = sorted((random() for _ in nodes), reverse=True)
+        for node, priority in zip(nodes, priorities):
+            node._priority = priority